@@ -1,38 +1,211 @@
+import codecs
+import json
+from decimal import Decimal
+
 import requests
 
+from api.cache import ResponseCache
+from api.schemas import ACCOUNT, CUSTOMER, TRANSACTION, Schema
+from api.transport import build_session
+
+
+def _iter_json_array(response: requests.Response, read_size: int = 1 << 16):
+    """Yield the items of a streamed top-level JSON array as they arrive.
+
+    Floats are parsed as Decimal, so amounts stay exact.
+    """
+    decoder = json.JSONDecoder(parse_float=Decimal)
+    text = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    buffer, pos, started = "", 0, False
+    for data in response.iter_content(read_size):
+        buffer = buffer[pos:] + text.decode(data)
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array")
+                started, pos = True, pos + 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                item, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # incomplete item: read more
+            yield item
+    # Only the closing "]" ends the array
+    raise ValueError("Truncated JSON array")
+
+
 class ParaBankAPIClient:
     """API client wrapper for ParaBank REST API calls"""
 
-    def __init__(self, api_base_url):
-        """Initialize the API client with base URL"""
+    def __init__(self, api_base_url, session: requests.Session = None,
+                 timeout=None, cache: ResponseCache = None,
+                 strict: bool = False):
+        """Initialize the API client with base URL.
+
+        Pass a shared session from api.transport.build_session to reuse its
+        connection pool; timeout overrides the transport default per client.
+        Pass a ResponseCache to serve repeated GET lookups from memory; writes
+        through this client invalidate the entries they affect.
+        With strict=True every successful JSON response is validated against
+        its api.schemas contract and a SchemaViolation is raised listing all
+        violations.
+        """
         self.api_base_url = api_base_url
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = session or build_session()
+        self.timeout = timeout
+        self.cache = cache
+        self.strict = strict
+        # Sent per request so a shared session is not altered
+        self.headers = {
             "Accept": "application/json",
             "Content-Type": "application/json"
-        })
-    
-    def get_customer_accounts(self, customer_id):
-        return self.session.get(f"{self.api_base_url}/customers/{customer_id}/accounts")
-
-    def get_account_details(self, account_id):
-        return self.session.get(f"{self.api_base_url}/accounts/{account_id}")
-
-    def create_account(self, customer_id, account_type, from_account_id):
-        return self.session.post(
-        f"{self.api_base_url}/createAccount",
-        params={
-            "customerId": customer_id,
-            "newAccountType": account_type,
-            "fromAccountId": from_account_id
         }
-    )    
-    def transfer_funds(self, amount, from_account, to_account):
-        return self.session.post(
-        f"{self.api_base_url}/transfer",
-        params={
-            "amount": amount,
-            "fromAccountId": from_account,
-            "toAccountId": to_account
-        }
-    )
+
+    def _request(self, method, path, timeout=None, headers=None, **kwargs):
+        return self.session.request(
+            method, f"{self.api_base_url}{path}",
+            headers={**self.headers, **(headers or {})},
+            timeout=timeout or self.timeout,
+            **kwargs)
+
+    def _checked(self, response, schema: Schema, many: bool = False):
+        """Validate a 200 response against its schema in strict mode"""
+        if self.strict and response.status_code == 200:
+            if many:
+                schema.check_many(response.json())
+            else:
+                schema.check(response.json())
+        return response
+
+    def _get(self, path, timeout=None):
+        """GET through the cache when one is configured"""
+        if self.cache is None:
+            return self._request("GET", path, timeout=timeout)
+
+        entry = self.cache.lookup(path)
+        if entry is not None and entry.fresh:
+            return entry.response
+
+        headers = {}
+        if entry is not None and entry.etag:
+            headers["If-None-Match"] = entry.etag
+        generation = self.cache.generation()
+        response = self._request("GET", path, timeout=timeout, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            # None if a concurrent write invalidated the entry meanwhile; the
+            # server still confirmed the stale copy is current
+            refreshed = self.cache.refresh(path)
+            return (refreshed or entry).response
+        if response.status_code == 200:
+            self.cache.put(path, response, generation)
+        return response
+
+    def login(self, username, password, timeout=None):
+        return self._checked(self._request(
+            "GET", f"/login/{username}/{password}", timeout=timeout), CUSTOMER)
+
+    def get_customer_accounts(self, customer_id, timeout=None):
+        return self._checked(self._get(
+            f"/customers/{customer_id}/accounts", timeout=timeout),
+            ACCOUNT, many=True)
+
+    def get_account_details(self, account_id, timeout=None):
+        return self._checked(
+            self._get(f"/accounts/{account_id}", timeout=timeout), ACCOUNT)
+
+    @staticmethod
+    def _transactions_path(account_id, month=None, transaction_type=None):
+        path = f"/accounts/{account_id}/transactions"
+        if month or transaction_type:
+            path += f"/month/{month or 'All'}/type/{transaction_type or 'All'}"
+        return path
+
+    def get_account_transactions(self, account_id, month=None,
+                                 transaction_type=None, timeout=None):
+        """Transactions of an account, optionally filtered like the UI
+        (month name or "All", "Credit"/"Debit"/"All")"""
+        return self._checked(self._get(
+            self._transactions_path(account_id, month, transaction_type),
+            timeout=timeout), TRANSACTION, many=True)
+
+    def iter_account_transactions(self, account_id, month=None,
+                                  transaction_type=None, chunk_size=500,
+                                  timeout=None):
+        """Yield transactions while the response streams in.
+
+        The body is never held as one list; amounts are Decimal. In strict
+        mode each chunk of chunk_size transactions is validated in bulk.
+        Bypasses the response cache.
+        """
+        response = self._request(
+            "GET", self._transactions_path(account_id, month, transaction_type),
+            timeout=timeout, stream=True)
+        with response:
+            response.raise_for_status()
+            chunk = []
+            for item in _iter_json_array(response):
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    yield from self._checked_chunk(chunk)
+                    chunk = []
+            yield from self._checked_chunk(chunk)
+
+    def _checked_chunk(self, chunk: list) -> list:
+        if self.strict:
+            TRANSACTION.check_many(chunk)
+        return chunk
+
+    def _invalidate_after_create(self, customer_id, from_account_id):
+        if self.cache is not None:
+            # New account shows up in the list; the deposit leaves from_account
+            self.cache.invalidate(f"/customers/{customer_id}/accounts",
+                                  f"/accounts/{from_account_id}")
+            self.cache.invalidate_prefix(f"/accounts/{from_account_id}/")
+
+    def _invalidate_after_transfer(self, from_account, to_account):
+        if self.cache is not None:
+            # The owning customers are unknown here, so drop every account list
+            self.cache.invalidate(f"/accounts/{from_account}",
+                                  f"/accounts/{to_account}")
+            self.cache.invalidate_prefix("/customers/")
+            self.cache.invalidate_prefix(f"/accounts/{from_account}/")
+            self.cache.invalidate_prefix(f"/accounts/{to_account}/")
+
+    def create_account(self, customer_id, account_type, from_account_id,
+                       timeout=None):
+        self._invalidate_after_create(customer_id, from_account_id)
+        try:
+            return self._checked(self._request(
+                "POST", "/createAccount",
+                params={
+                    "customerId": customer_id,
+                    "newAccountType": account_type,
+                    "fromAccountId": from_account_id
+                },
+                timeout=timeout), ACCOUNT)
+        finally:
+            # Again once the POST returns: a concurrent GET made while it was
+            # in flight may have cached the old state
+            self._invalidate_after_create(customer_id, from_account_id)
+
+    def transfer_funds(self, amount, from_account, to_account, timeout=None):
+        # Before and after the POST, as in create_account
+        self._invalidate_after_transfer(from_account, to_account)
+        try:
+            return self._request(
+                "POST", "/transfer",
+                params={
+                    "amount": amount,
+                    "fromAccountId": from_account,
+                    "toAccountId": to_account
+                },
+                timeout=timeout)
+        finally:
+            self._invalidate_after_transfer(from_account, to_account)
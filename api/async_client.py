@@ -0,0 +1,126 @@
+"""Asyncio sibling of ParaBankAPIClient with bulk helpers.
+
+Calls run on a bounded thread pool over the wrapped client's pooled session,
+so they share its timeouts, retries and connections. Bulk helpers fan out
+under a semaphore and return one BulkResult per input, in input order.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Iterable, NamedTuple
+
+import requests
+
+from api.api_client import ParaBankAPIClient
+
+
+class TransferSpec(NamedTuple):
+    """One transfer for transfer_funds_many"""
+    amount: float
+    from_account: int
+    to_account: int
+
+
+@dataclass
+class BulkResult:
+    """Outcome of one item of a bulk call"""
+    item: Any
+    response: requests.Response = None
+    error: Exception = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.response is not None \
+            and self.response.ok
+
+
+class AsyncParaBankAPIClient:
+    """Async API client with the same method surface as ParaBankAPIClient"""
+
+    def __init__(self, client: ParaBankAPIClient, max_concurrency: int = 10):
+        """Wrap a sync client.
+
+        Keep max_concurrency at or below the session's pool_maxsize, or
+        urllib3 will open and discard extra connections.
+        """
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="parabank-api")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    async def _call(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs))
+
+    async def get_customer_accounts(self, customer_id, timeout=None):
+        return await self._call(
+            self.client.get_customer_accounts, customer_id, timeout=timeout)
+
+    async def get_account_details(self, account_id, timeout=None):
+        return await self._call(
+            self.client.get_account_details, account_id, timeout=timeout)
+
+    async def get_account_transactions(self, account_id, month=None,
+                                       transaction_type=None, timeout=None):
+        return await self._call(self.client.get_account_transactions,
+                                account_id, month, transaction_type,
+                                timeout=timeout)
+
+    async def create_account(self, customer_id, account_type, from_account_id,
+                             timeout=None):
+        return await self._call(
+            self.client.create_account, customer_id, account_type,
+            from_account_id, timeout=timeout)
+
+    async def transfer_funds(self, amount, from_account, to_account,
+                             timeout=None):
+        return await self._call(
+            self.client.transfer_funds, amount, from_account, to_account,
+            timeout=timeout)
+
+    async def get_account_details_many(self, account_ids: Iterable,
+                                       timeout=None) -> list:
+        """Fetch details for many accounts concurrently"""
+        return await self._fan_out(
+            account_ids,
+            lambda account_id: self.client.get_account_details(
+                account_id, timeout=timeout))
+
+    async def transfer_funds_many(self, specs: Iterable, timeout=None) -> list:
+        """Run many transfers concurrently.
+
+        Each spec is a TransferSpec or an (amount, from, to) tuple. Transfers
+        are not ordered relative to each other.
+        """
+        specs = [TransferSpec(*spec) for spec in specs]
+        return await self._fan_out(
+            specs,
+            lambda spec: self.client.transfer_funds(
+                spec.amount, spec.from_account, spec.to_account,
+                timeout=timeout))
+
+    async def _fan_out(self, items: Iterable, call) -> list:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(item):
+            async with semaphore:
+                try:
+                    return BulkResult(item, response=await self._call(call, item))
+                except Exception as e:
+                    return BulkResult(item, error=e)
+
+        return await asyncio.gather(*(run_one(item) for item in items))
+
+
+__all__ = ["AsyncParaBankAPIClient", "BulkResult", "TransferSpec"]
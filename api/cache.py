@@ -0,0 +1,134 @@
+"""Read-through cache for idempotent ParaBank API lookups.
+
+Entries expire after a TTL and the least recently used entry is evicted once
+the cache is full. Expired entries that carry an ETag are kept so the client
+can revalidate them with If-None-Match instead of downloading them again;
+expired entries without one are dropped when looked up.
+
+Invalidation bumps a generation counter. A GET takes the generation before
+it is sent and passes it to put(); a response whose key was invalidated in
+the meantime (a write ran while the GET was in flight) is not stored, as it
+may show the state from before the write.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import requests
+
+
+@dataclass
+class CacheEntry:
+    response: requests.Response
+    expires_at: float
+    etag: str = None
+
+    @property
+    def fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+
+class ResponseCache:
+    """TTL + LRU cache of GET responses keyed by request path"""
+
+    def __init__(self, ttl: float = 60, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        # Generation of the last invalidation of each key / prefix
+        self._invalidated = {}
+        self._invalidated_prefixes = {}
+
+    def lookup(self, key: str):
+        """Return the entry for key (fresh, or stale with an ETag), or None.
+
+        Counts a hit only for fresh entries; stale ones need a round-trip.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.fresh:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            if entry.etag is None:
+                # Nothing to revalidate with: free the slot now
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def generation(self) -> int:
+        """Take before sending a GET; pass to put() with its response"""
+        with self._lock:
+            return self._generation
+
+    def _invalidated_since(self, key: str, generation: int) -> bool:
+        if self._invalidated.get(key, -1) >= generation:
+            return True
+        return any(g >= generation and key.startswith(prefix)
+                   for prefix, g in self._invalidated_prefixes.items())
+
+    def put(self, key: str, response: requests.Response,
+            generation: int = None):
+        """Store a successful response.
+
+        Dropped if key was invalidated after generation was taken.
+        """
+        entry = CacheEntry(response, time.monotonic() + self.ttl,
+                           response.headers.get("ETag"))
+        with self._lock:
+            if generation is not None and \
+                    self._invalidated_since(key, generation):
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def refresh(self, key: str):
+        """Extend a stale entry after the server answered 304 Not Modified"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.expires_at = time.monotonic() + self.ttl
+                self.revalidated += 1
+        return entry
+
+    def invalidate(self, *keys: str):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._invalidated[key] = self._generation
+            self._generation += 1
+
+    def invalidate_prefix(self, prefix: str):
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+            self._invalidated_prefixes[prefix] = self._generation
+            self._generation += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._invalidated_prefixes[""] = self._generation
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "revalidated": self.revalidated,
+                    "entries": len(self._entries)}
+
+
+__all__ = ["CacheEntry", "ResponseCache"]
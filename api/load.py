@@ -0,0 +1,375 @@
+"""Load generator reusing the ParaBankAPIClient scenarios.
+
+Runs a weighted mix of get_customer_accounts, get_account_details,
+create_account and transfer_funds for a fixed duration, either closed-loop
+at a fixed concurrency or open-loop at a target request rate, and reports
+throughput, error rate and latency histograms:
+
+    python -m api.load --profile local --duration 30 --concurrency 8
+    python -m api.load --rate 50 --mix get_account_details=8,transfer_funds=2
+
+In rate mode latency is measured from each request's scheduled start, so a
+saturated server shows up as latency instead of silently lowering the rate.
+
+--seed makes the random streams deterministic: the rate-mode schedule of
+scenarios and each thread's stream of scenario picks and arguments. The run
+itself is not reproducible, because thread scheduling and server timing
+still decide which request reaches the server when.
+The same runner backs the opt-in `--load-test` pytest check in
+api/test_load_api.py.
+"""
+import argparse
+import itertools
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+
+from api.api_client import ParaBankAPIClient
+from api.transport import TransportConfig, build_session
+from helpers.data_pool import AccountPool
+from helpers.settings import SETTINGS_FILE, Settings, SettingsError, load_settings
+
+DEFAULT_MIX = {"get_customer_accounts": 4, "get_account_details": 4,
+               "create_account": 1, "transfer_funds": 1}
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of latencies in microseconds.
+
+    Each power of two is split into linear sub-buckets, so every value is
+    kept to within 1/2**(sub_bucket_bits - 1) relative error (under 2% by
+    default) whatever its magnitude, in memory bounded by the value range.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _bucket(self, us: int) -> tuple:
+        shift = max(0, us.bit_length() - self.sub_bucket_bits)
+        return shift, us >> shift
+
+    def record(self, seconds: float):
+        us = max(0, int(seconds * 1_000_000))
+        key = self._bucket(us)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.total_us += us
+        self.min_us = us if self.min_us is None else min(self.min_us, us)
+        self.max_us = max(self.max_us, us)
+
+    def merge(self, other: "LatencyHistogram"):
+        for key, n in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + n
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None \
+                else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+        return self
+
+    def percentile_ms(self, pct: float) -> float:
+        """Upper bound of the bucket holding the pct-th percentile"""
+        if not self.count:
+            return 0.0
+        rank = max(1, -(-self.count * pct // 100))
+        seen = 0
+        for (shift, sub), n in sorted(self.counts.items(),
+                                      key=lambda kv: kv[0][1] << kv[0][0]):
+            seen += n
+            if seen >= rank:
+                return min(((sub + 1) << shift) - 1, self.max_us) / 1000
+        return self.max_us / 1000
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_us / self.count / 1000 if self.count else 0.0
+
+    def summary(self) -> dict:
+        return {"count": self.count,
+                "min_ms": (self.min_us or 0) / 1000,
+                "mean_ms": round(self.mean_ms, 3),
+                **{f"p{p:g}_ms": self.percentile_ms(p)
+                   for p in (50, 90, 99, 99.9)},
+                "max_ms": self.max_us / 1000}
+
+    def distribution(self, steps=(50, 75, 90, 95, 99, 99.9, 99.99, 100)) -> str:
+        """Percentile distribution table, as HdrHistogram prints it"""
+        lines = [f"{'value ms':>12} {'percentile':>11} {'count':>9}"]
+        for p in steps:
+            value = self.percentile_ms(p)
+            below = sum(n for (shift, sub), n in self.counts.items()
+                        if (sub << shift) / 1000 <= value)
+            lines.append(f"{value:>12.3f} {p / 100:>11.6f} {below:>9}")
+        return "\n".join(lines)
+
+
+@dataclass
+class ScenarioStats:
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+
+    def merge(self, other: "ScenarioStats"):
+        self.latency.merge(other.latency)
+        self.errors += other.errors
+        return self
+
+
+@dataclass
+class LoadReport:
+    elapsed: float
+    scenarios: dict
+    mode: str
+
+    @property
+    def total(self) -> ScenarioStats:
+        total = ScenarioStats()
+        for stats in self.scenarios.values():
+            total.merge(stats)
+        return total
+
+    @property
+    def throughput(self) -> float:
+        return self.total.latency.count / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        total = self.total
+        return total.errors / total.latency.count if total.latency.count else 0.0
+
+    def to_dict(self) -> dict:
+        return {"mode": self.mode, "elapsed_s": round(self.elapsed, 3),
+                "throughput_rps": round(self.throughput, 2),
+                "error_rate": round(self.error_rate, 5),
+                "total": self.total.latency.summary(),
+                "scenarios": {name: {**s.latency.summary(), "errors": s.errors}
+                              for name, s in self.scenarios.items()}}
+
+    def format(self) -> str:
+        total = self.total
+        lines = [f"{self.mode}: {total.latency.count} requests in "
+                 f"{self.elapsed:.1f} s = {self.throughput:.1f} req/s, "
+                 f"errors {total.errors} ({self.error_rate:.2%})",
+                 f"{'scenario':<22} {'count':>7} {'err':>5} {'p50 ms':>8} "
+                 f"{'p90 ms':>8} {'p99 ms':>8} {'p99.9 ms':>9} {'max ms':>8}"]
+        for name, stats in sorted(self.scenarios.items()) + [("total", total)]:
+            h = stats.latency
+            lines.append(
+                f"{name:<22} {h.count:>7} {stats.errors:>5} "
+                f"{h.percentile_ms(50):>8.1f} {h.percentile_ms(90):>8.1f} "
+                f"{h.percentile_ms(99):>8.1f} {h.percentile_ms(99.9):>9.1f} "
+                f"{h.max_us / 1000:>8.1f}")
+        lines.append("")
+        lines.append(total.latency.distribution())
+        return "\n".join(lines)
+
+
+class Scenarios:
+    """The functional API calls as load scenarios.
+
+    Each scenario returns the response; 200/201 counts as success.
+    """
+
+    def __init__(self, client: ParaBankAPIClient, customer_id: int,
+                 account_ids: list, account_type: int = 0):
+        self.client = client
+        self.customer_id = customer_id
+        self.account_ids = account_ids
+        self.account_type = account_type
+
+    def get_customer_accounts(self, rng):
+        return self.client.get_customer_accounts(self.customer_id)
+
+    def get_account_details(self, rng):
+        return self.client.get_account_details(rng.choice(self.account_ids))
+
+    def create_account(self, rng):
+        return self.client.create_account(
+            self.customer_id, self.account_type, self.account_ids[0])
+
+    def transfer_funds(self, rng):
+        # Small amounts both ways keep the pool balances roughly steady
+        source, target = rng.sample(self.account_ids, 2)
+        return self.client.transfer_funds(1, source, target)
+
+
+def parse_mix(text: str) -> dict:
+    """'get_account_details=8,transfer_funds=2' -> {name: weight}"""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        if not hasattr(Scenarios, name) or name.startswith("_"):
+            raise ValueError(f"Unknown scenario {name!r}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class LoadRunner:
+    """Drives a weighted scenario mix from a thread pool"""
+
+    def __init__(self, scenarios: Scenarios, mix: dict = None, seed: int = None):
+        self.scenarios = scenarios
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.names = list(self.mix)
+        self.weights = [self.mix[name] for name in self.names]
+        self.seed = seed
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._all = []
+        self._indexes = itertools.count()
+
+    def _stats(self) -> dict:
+        # One set per thread, merged at the end: no locking on the hot path
+        stats = getattr(self._local, "stats", None)
+        if stats is None:
+            # A fixed index per thread: with --seed, the per-thread
+            # streams are deterministic (their interleaving is not)
+            with self._lock:
+                index = next(self._indexes)
+                stats = {name: ScenarioStats() for name in self.names}
+                self._all.append(stats)
+            self._local.stats = stats
+            self._local.rng = random.Random(
+                None if self.seed is None else self.seed + index)
+        return stats
+
+    def _call(self, name: str, started: float):
+        stats = self._stats()[name]
+        try:
+            ok = getattr(self.scenarios, name)(self._local.rng).status_code \
+                in (200, 201)
+        except Exception:
+            ok = False
+        stats.latency.record(time.perf_counter() - started)
+        stats.errors += not ok
+
+    def _pick(self) -> str:
+        self._stats()
+        return self._local.rng.choices(self.names, self.weights)[0]
+
+    def run_concurrency(self, concurrency: int, duration: float) -> LoadReport:
+        """Closed loop: each thread sends its next request when one returns"""
+        self._reset()
+        deadline = time.perf_counter() + duration
+
+        def loop():
+            while time.perf_counter() < deadline:
+                self._call(self._pick(), time.perf_counter())
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency, "load") as pool:
+            for _ in range(concurrency):
+                pool.submit(loop)
+        return self._report(time.perf_counter() - start,
+                            f"concurrency {concurrency}")
+
+    def run_rate(self, rate: float, duration: float,
+                 max_workers: int = 64) -> LoadReport:
+        """Open loop: requests start on a fixed schedule"""
+        self._reset()
+        interval = 1 / rate
+        rng = random.Random(self.seed)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers, "load") as pool:
+            for i in range(int(rate * duration)):
+                scheduled = start + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                name = rng.choices(self.names, self.weights)[0]
+                pool.submit(self._call, name, scheduled)
+        return self._report(time.perf_counter() - start, f"rate {rate:g}/s")
+
+    def _report(self, elapsed: float, mode: str) -> LoadReport:
+        merged = {name: ScenarioStats() for name in self.names}
+        for stats in self._all:
+            for name, s in stats.items():
+                merged[name].merge(s)
+        return LoadReport(elapsed, merged, mode)
+
+
+def prepare(settings: Settings, pool_size: int, accounts: int = 4) -> Scenarios:
+    """Client with a connection per thread and freshly provisioned accounts"""
+    transport = replace(TransportConfig.from_settings(settings),
+                        pool_maxsize=max(pool_size, 1),
+                        # A retried request would hide the error it hit
+                        retries=0)
+    client = ParaBankAPIClient(settings.api_base_url,
+                               session=build_session(transport))
+    data_pool = settings.data_pool
+    pool = AccountPool(client, settings.customer_id, "load", size=accounts,
+                       account_type=data_pool.account_type,
+                       funding_account_id=data_pool.funding_accounts.get(
+                           str(settings.customer_id))).provision()
+    return Scenarios(client, settings.customer_id, pool.account_ids,
+                     data_pool.account_type)
+
+
+def main(argv=None):
+    from helpers.stand_in_server import ParaBankStandIn
+
+    parser = argparse.ArgumentParser(
+        prog="python -m api.load", description=__doc__.splitlines()[0])
+    parser.add_argument("--settings", default=SETTINGS_FILE)
+    parser.add_argument("--profile", help="settings profile, e.g. 'local'")
+    # Defaults come from the load_test block of the settings file
+    parser.add_argument("--duration", type=float, help="seconds")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--concurrency", type=int, help="closed-loop threads")
+    mode.add_argument("--rate", type=float, help="open-loop requests/second")
+    parser.add_argument("--max-workers", type=int, default=64,
+                        help="thread cap in --rate mode")
+    parser.add_argument("--mix", type=parse_mix,
+                        help="weighted scenarios, e.g. "
+                             "get_account_details=8,transfer_funds=2")
+    parser.add_argument("--seed", type=int,
+                        help="seed the per-thread random streams")
+    parser.add_argument("--json", metavar="FILE",
+                        help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        settings = load_settings(args.profile, args.settings)
+    except SettingsError as e:
+        parser.error(str(e))
+    load = settings.load_test
+    duration = args.duration or load.duration_seconds
+    mix = args.mix or load.mix or DEFAULT_MIX
+    rate = args.rate or (None if args.concurrency else load.rate)
+    concurrency = args.concurrency or load.concurrency
+
+    stand_in = None
+    if settings.stand_in:
+        stand_in = ParaBankStandIn.from_settings(settings).start()
+        settings = settings.replace(**stand_in.settings_overrides())
+    try:
+        threads = args.max_workers if rate else concurrency
+        runner = LoadRunner(prepare(settings, threads), mix, args.seed)
+        if rate:
+            report = runner.run_rate(rate, duration, args.max_workers)
+        else:
+            report = runner.run_concurrency(concurrency, duration)
+    finally:
+        if stand_in is not None:
+            stand_in.stop()
+
+    print(f"target: {settings.api_base_url}")
+    print(report.format())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
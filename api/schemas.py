@@ -0,0 +1,211 @@
+"""Contract schemas for ParaBank API payloads, compiled into validators.
+
+A schema is declared once as a mapping of field name -> Field. On first
+use it is compiled into plain Python source (one `type(x) is ...` check per
+field, nested schemas as direct calls) and exec'd, so validating a payload
+does no per-call reflection over the declaration. A list validator loops
+over the compiled item validator, which keeps checking a long account list
+cheap.
+
+Validation collects every violation in one pass, with JSONPath-like
+locations:
+
+    ACCOUNT.violations({"id": "1", "type": "GOLD"})
+    -> ['$.id: expected int, got str', '$.customerId: missing',
+        "$.type: 'GOLD' not in (...)", '$.balance: missing']
+
+check()/check_many() raise SchemaViolation (an AssertionError, so pytest
+reports it as a test failure) listing all of them.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+
+NUMBER = "number"  # int, float or Decimal, never bool
+
+_TYPE_NAMES = {int: "int", str: "str", bool: "bool", dict: "object",
+               list: "list", NUMBER: "number"}
+
+
+class SchemaViolation(AssertionError):
+    """A payload broke its contract; .violations lists every problem"""
+
+    def __init__(self, schema_name: str, violations: list):
+        self.violations = violations
+        shown = violations[:20]
+        more = len(violations) - len(shown)
+        super().__init__(
+            f"{schema_name}: {len(violations)} schema violation(s)\n"
+            + "\n".join(f"  {v}" for v in shown)
+            + (f"\n  ... and {more} more" if more else ""))
+
+
+@dataclass(frozen=True)
+class Field:
+    """One field: a type (int, str, bool, NUMBER or a Schema) plus rules"""
+    type: object
+    required: bool = True
+    nullable: bool = False
+    choices: tuple = ()
+
+
+class Schema:
+    """Declarative object schema; validators are compiled on first use"""
+
+    def __init__(self, name: str, fields: dict):
+        self.name = name
+        self.fields = {key: f if isinstance(f, Field) else Field(f)
+                       for key, f in fields.items()}
+        self._one = None
+        self._many = None
+
+    def __repr__(self):
+        return f"Schema({self.name!r})"
+
+    def _compile(self):
+        namespace = {}
+        _Compiler(namespace).schema(self)
+        self._one = namespace[_function_name(self, "one")]
+        self._many = namespace[_function_name(self, "many")]
+
+    def violations(self, value) -> list:
+        """Every violation in value, [] when it conforms"""
+        if self._one is None:
+            self._compile()
+        errors = []
+        self._one(value, errors)
+        return ["$" + e for e in errors]
+
+    def violations_many(self, values) -> list:
+        """Every violation in a list of values"""
+        if self._many is None:
+            self._compile()
+        errors = []
+        self._many(values, errors)
+        return ["$" + e for e in errors]
+
+    def check(self, value):
+        """Raise SchemaViolation unless value conforms; returns value"""
+        errors = self.violations(value)
+        if errors:
+            raise SchemaViolation(self.name, errors)
+        return value
+
+    def check_many(self, values):
+        """Raise SchemaViolation unless every item conforms; returns values"""
+        errors = self.violations_many(values)
+        if errors:
+            raise SchemaViolation(f"list of {self.name}", errors)
+        return values
+
+
+def _function_name(schema: Schema, kind: str) -> str:
+    return f"_{kind}_{schema.name}_{id(schema):x}"
+
+
+class _Compiler:
+    """Generates validator source for a schema and its nested schemas"""
+
+    def __init__(self, namespace: dict):
+        self.namespace = namespace
+        self.namespace.update(_NUMBER_TYPES=_NUMBER_TYPES, _MISSING=_MISSING)
+        self._constants = 0
+
+    def _constant(self, value) -> str:
+        name = f"_c{self._constants}"
+        self._constants += 1
+        self.namespace[name] = value
+        return name
+
+    def schema(self, schema: Schema):
+        one, many = _function_name(schema, "one"), _function_name(schema, "many")
+        if one in self.namespace:
+            return one
+        self.namespace[one] = None  # placeholder against recursion
+        lines = [f"def {one}(v, e):",
+                 "    if type(v) is not dict:",
+                 "        e.append(f': expected object, got {type(v).__name__}')",
+                 "        return"]
+        for key, field in schema.fields.items():
+            lines += self._field(key, field)
+        lines += [f"def {many}(vs, e):",
+                  "    if type(vs) is not list:",
+                  "        e.append(f': expected list, got {type(vs).__name__}')",
+                  "        return",
+                  "    for i, v in enumerate(vs):",
+                  "        n = len(e)",
+                  f"        {one}(v, e)",
+                  "        if len(e) > n:",
+                  "            e[n:] = [f'[{i}]{m}' for m in e[n:]]"]
+        exec(compile("\n".join(lines), f"<schema {schema.name}>", "exec"),
+             self.namespace)
+        return one
+
+    def _field(self, key: str, field: Field) -> list:
+        path = "." + key
+        lines = [f"    x = v.get({key!r}, _MISSING)"]
+        missing = (f"        e.append({path + ': missing'!r})" if field.required
+                   else "        pass")
+        lines += ["    if x is _MISSING:", missing]
+        if field.nullable:
+            lines += ["    elif x is None:", "        pass"]
+        if isinstance(field.type, Schema):
+            nested = self.schema(field.type)
+            lines += ["    else:",
+                      "        n = len(e)",
+                      f"        {nested}(x, e)",
+                      "        if len(e) > n:",
+                      f"            e[n:] = [{path!r} + m for m in e[n:]]"]
+            return lines
+        if field.type is NUMBER:
+            test = "type(x) not in _NUMBER_TYPES"
+        else:
+            test = f"type(x) is not {self._constant(field.type)}"
+        wrong_type = f"{path}: expected {_TYPE_NAMES[field.type]}, got "
+        lines += [f"    elif {test}:",
+                  f"        e.append({wrong_type!r} + type(x).__name__)"]
+        if field.choices:
+            choices = self._constant(frozenset(field.choices))
+            allowed = f" not in ({', '.join(map(repr, field.choices))})"
+            lines += [f"    elif x not in {choices}:",
+                      f"        e.append({path + ': '!r} + repr(x) + {allowed!r})"]
+        return lines
+
+
+_NUMBER_TYPES = frozenset({int, float, Decimal})
+_MISSING = object()
+
+ADDRESS = Schema("Address", {
+    "street": Field(str, required=False),
+    "city": Field(str, required=False),
+    "state": Field(str, required=False),
+    "zipCode": Field(str, required=False),
+})
+
+CUSTOMER = Schema("Customer", {
+    "id": int,
+    "firstName": str,
+    "lastName": str,
+    "address": Field(ADDRESS, required=False),
+    "phoneNumber": Field(str, required=False, nullable=True),
+    "ssn": Field(str, required=False, nullable=True),
+})
+
+ACCOUNT = Schema("Account", {
+    "id": int,
+    "customerId": int,
+    "type": Field(str, choices=("CHECKING", "SAVINGS", "LOAN")),
+    "balance": NUMBER,
+})
+
+TRANSACTION = Schema("Transaction", {
+    "id": int,
+    "accountId": int,
+    "type": Field(str, choices=("Credit", "Debit")),
+    "date": int,  # epoch milliseconds
+    "amount": NUMBER,
+    "description": Field(str, nullable=True),
+})
+
+
+__all__ = ["Schema", "Field", "NUMBER", "SchemaViolation", "ADDRESS",
+           "CUSTOMER", "ACCOUNT", "TRANSACTION"]
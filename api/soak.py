@@ -0,0 +1,254 @@
+"""Transfer soak: randomized concurrent transfers checked against a ledger.
+
+Runs thousands of transfer_funds calls between a leased set of accounts
+through AsyncParaBankAPIClient, batch by batch. The plan (source, target,
+cents) and the expected per-account deltas live in flat `array`s, so a
+long run costs a few bytes per transfer. Balances are read before and after
+in one get_customer_accounts call each, and the run checks
+
+- conservation: the set's total balance is unchanged (all transfers are
+  internal), and
+- per-account deltas: after == before + ledger delta for every account,
+
+reporting throughput and every divergence:
+
+    python -m api.soak --profile local --transfers 5000 --accounts 8 --concurrency 16
+
+The opt-in `--soak-test` pytest check in api/test_soak_api.py uses the same
+engine.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from api.api_client import ParaBankAPIClient
+from api.async_client import AsyncParaBankAPIClient, TransferSpec
+from helpers.money import to_cents, to_decimal
+from helpers.settings import SETTINGS_FILE, SettingsError, load_settings
+
+
+class TransferPlan:
+    """Random transfers as parallel arrays of account index, index, cents"""
+
+    def __init__(self, accounts: int, transfers: int, max_cents: int,
+                 seed: int = None):
+        if accounts < 2:
+            raise ValueError("A transfer soak needs at least two accounts")
+        rng = random.Random(seed)
+        self.sources = array("H")
+        self.targets = array("H")
+        self.cents = array("q")
+        for _ in range(transfers):
+            source, target = rng.sample(range(accounts), 2)
+            self.sources.append(source)
+            self.targets.append(target)
+            self.cents.append(rng.randint(1, max_cents))
+
+    def __len__(self):
+        return len(self.cents)
+
+
+class Ledger:
+    """Expected balance deltas in integer cents, one array slot per account"""
+
+    def __init__(self, account_ids: list):
+        self.account_ids = list(account_ids)
+        self.deltas = array("q", [0]) * len(self.account_ids)
+        self.applied = 0
+
+    def apply(self, source: int, target: int, cents: int):
+        self.deltas[source] -= cents
+        self.deltas[target] += cents
+        self.applied += 1
+
+    @property
+    def total(self) -> int:
+        """Net change of the whole set; 0 unless the ledger is broken"""
+        return sum(self.deltas)
+
+
+@dataclass
+class Divergence:
+    account_id: int
+    expected: Decimal
+    actual: Decimal
+
+    def __str__(self):
+        return (f"account {self.account_id}: expected {self.expected}, "
+                f"got {self.actual} ({self.actual - self.expected:+})")
+
+
+@dataclass
+class SoakReport:
+    transfers: int
+    succeeded: int
+    elapsed: float
+    total_before: Decimal
+    total_after: Decimal
+    divergences: list = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def failed(self) -> int:
+        return self.transfers - self.succeeded
+
+    @property
+    def throughput(self) -> float:
+        return self.succeeded / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def conserved(self) -> bool:
+        return self.total_before == self.total_after
+
+    @property
+    def consistent(self) -> bool:
+        return self.conserved and not self.divergences
+
+    def to_dict(self) -> dict:
+        return {"transfers": self.transfers, "succeeded": self.succeeded,
+                "failed": self.failed, "elapsed_s": round(self.elapsed, 3),
+                "throughput_tps": round(self.throughput, 2),
+                "total_before": str(self.total_before),
+                "total_after": str(self.total_after),
+                "conserved": self.conserved,
+                "divergences": [str(d) for d in self.divergences],
+                "errors": dict(self.errors)}
+
+    def format(self) -> str:
+        lines = [f"{self.succeeded}/{self.transfers} transfers in "
+                 f"{self.elapsed:.1f} s = {self.throughput:.1f} transfers/s, "
+                 f"{self.failed} failed",
+                 f"total balance: {self.total_before} -> {self.total_after} "
+                 f"({'conserved' if self.conserved else 'NOT conserved'})"]
+        lines += [f"  error {kind}: {count}"
+                  for kind, count in self.errors.most_common()]
+        lines.append(f"divergent accounts: {len(self.divergences)}")
+        lines += [f"  {d}" for d in self.divergences]
+        return "\n".join(lines)
+
+
+class TransferSoak:
+    """Runs a TransferPlan concurrently and reconciles the balances"""
+
+    def __init__(self, client: ParaBankAPIClient, customer_id: int,
+                 account_ids: list, concurrency: int = 8,
+                 batch_size: int = 500):
+        self.client = client
+        self.customer_id = customer_id
+        self.account_ids = [int(a) for a in account_ids]
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+
+    def balances(self) -> dict:
+        """Balances of the account set in one batched read"""
+        response = self.client.get_customer_accounts(self.customer_id)
+        assert response.status_code == 200, \
+            f"Accounts lookup failed: HTTP {response.status_code}"
+        balances = {int(a["id"]): to_decimal(a["balance"])
+                    for a in response.json(parse_float=Decimal)}
+        missing = set(self.account_ids) - balances.keys()
+        assert not missing, f"Accounts not found for customer: {sorted(missing)}"
+        return {a: balances[a] for a in self.account_ids}
+
+    def plan(self, transfers: int, max_amount, seed: int = None) -> TransferPlan:
+        return TransferPlan(len(self.account_ids), transfers,
+                            to_cents(max_amount), seed)
+
+    def run(self, plan: TransferPlan) -> SoakReport:
+        before = self.balances()
+        ledger = Ledger(self.account_ids)
+        errors = Counter()
+        start = time.perf_counter()
+        asyncio.run(self._transfer(plan, ledger, errors))
+        elapsed = time.perf_counter() - start
+        after = self.balances()
+
+        divergences = []
+        for index, account_id in enumerate(self.account_ids):
+            expected = before[account_id] + Decimal(ledger.deltas[index]) / 100
+            if after[account_id] != expected:
+                divergences.append(
+                    Divergence(account_id, expected, after[account_id]))
+        return SoakReport(len(plan), ledger.applied, elapsed,
+                          sum(before.values()), sum(after.values()),
+                          divergences, errors)
+
+    async def _transfer(self, plan: TransferPlan, ledger: Ledger,
+                        errors: Counter):
+        ids = self.account_ids
+        async with AsyncParaBankAPIClient(self.client,
+                                          self.concurrency) as bulk:
+            for start in range(0, len(plan), self.batch_size):
+                batch = range(start, min(start + self.batch_size, len(plan)))
+                results = await bulk.transfer_funds_many(
+                    TransferSpec(Decimal(plan.cents[i]).scaleb(-2),
+                                 ids[plan.sources[i]], ids[plan.targets[i]])
+                    for i in batch)
+                for i, result in zip(batch, results):
+                    if result.ok:
+                        ledger.apply(plan.sources[i], plan.targets[i],
+                                     plan.cents[i])
+                    elif result.error is not None:
+                        errors[type(result.error).__name__] += 1
+                    else:
+                        errors[f"HTTP {result.response.status_code}"] += 1
+
+
+def main(argv=None):
+    from api.load import prepare
+    from helpers.stand_in_server import ParaBankStandIn
+
+    parser = argparse.ArgumentParser(
+        prog="python -m api.soak", description=__doc__.splitlines()[0])
+    parser.add_argument("--settings", default=SETTINGS_FILE)
+    parser.add_argument("--profile", help="settings profile, e.g. 'local'")
+    # Defaults come from the soak_test block of the settings file
+    parser.add_argument("--transfers", type=int)
+    parser.add_argument("--accounts", type=int)
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--max-amount", type=Decimal)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", metavar="FILE",
+                        help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        settings = load_settings(args.profile, args.settings)
+    except SettingsError as e:
+        parser.error(str(e))
+    soak = settings.soak_test
+    concurrency = args.concurrency or soak.concurrency
+
+    stand_in = None
+    if settings.stand_in:
+        stand_in = ParaBankStandIn.from_settings(settings).start()
+        settings = settings.replace(**stand_in.settings_overrides())
+    try:
+        scenarios = prepare(settings, concurrency,
+                            accounts=args.accounts or soak.accounts)
+        engine = TransferSoak(scenarios.client, scenarios.customer_id,
+                              scenarios.account_ids, concurrency)
+        report = engine.run(engine.plan(
+            args.transfers or soak.transfers,
+            args.max_amount or soak.max_amount,
+            args.seed if args.seed is not None else soak.seed))
+    finally:
+        if stand_in is not None:
+            stand_in.stop()
+
+    print(f"target: {settings.api_base_url}")
+    print(report.format())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 0 if report.consistent and not report.failed else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,5 +1,10 @@
+from decimal import Decimal
+
 import allure
 
+from api.schemas import ACCOUNT, TRANSACTION
+
+
 class TestAccountsAPI:
     """Test class for Accounts API endpoints (validations using API wrapper)"""
     
@@ -16,18 +21,13 @@ class TestAccountsAPI:
         with allure.step("Verify status code is 200"):
             assert response.status_code == 200
 
-        with allure.step("Verify response body is a JSON list"):
-            accounts = response.json()
-            assert isinstance(accounts, list), "Expected response to be a JSON list"
+        with allure.step("Verify response body is a list of accounts"):
+            # Every violation of every account is reported in one go
+            accounts = ACCOUNT.check_many(response.json())
 
         with allure.step("Verify accounts list is not empty"):
             assert accounts, "Accounts list should not be empty"
 
-        with allure.step("Verify each account has required fields and balance is numeric"):
-            for account in accounts:
-                assert {"id", "type", "balance"} <= account.keys()
-                assert isinstance(account["balance"], (int, float))
-
     @allure.feature("API - Accounts")
     @allure.story("TC_API_02")
     @allure.title("Get account details for a valid account ID")
@@ -41,20 +41,11 @@ class TestAccountsAPI:
         with allure.step("Verify status code is 200"):
             assert response.status_code == 200
 
-        with allure.step("Verify response body is a JSON object"):
-            body = response.json()
-            assert isinstance(body, dict),  "Expected response to be a JSON object"
+        with allure.step("Verify response body matches the Account schema"):
+            body = ACCOUNT.check(response.json())
 
         with allure.step("Verify account ID matches the requested ID"):
-            assert int(body.get("id")) == int(valid_account_id)
-
-        with allure.step("Verify balance field exists and is numeric"):
-            assert "balance" in body, "Missing 'balance' field"
-            assert isinstance(body["balance"], (int, float)), "Balance must be numeric"
-
-        with allure.step("Validate key fields and types"):
-            assert isinstance(body.get("customerId"), int)
-            assert isinstance(body.get("type"), str)
+            assert body["id"] == int(valid_account_id)
 
     @allure.feature("API - Accounts")
     @allure.story("TC_API_03")
@@ -63,7 +54,7 @@ class TestAccountsAPI:
     def test_create_new_account(self, api_client, customer_id, valid_account_id, settings):
         """TC_API_03: Create new account via POST /createAccount"""
         with allure.step("Prepare account creation parameters"):
-            new_account_type = settings["new_account_type"]
+            new_account_type = settings.new_account_type
             from_account_id = valid_account_id
             allure.attach(f"Customer ID: {customer_id}\nAccount Type: {new_account_type}\nFrom Account: {from_account_id}",
                          name="Request Parameters", attachment_type=allure.attachment_type.TEXT)
@@ -74,22 +65,20 @@ class TestAccountsAPI:
         with allure.step("Verify status code is 200 or 201"):
             assert response.status_code in (200, 201), f"Unexpected status code: {response.status_code}"
 
-        with allure.step("Verify response body is a JSON object with new account id"):
-            body = response.json()
-            assert isinstance(body, dict), "Expected response to be a JSON object"
-            assert "id" in body
+        with allure.step("Verify response body is the new account"):
+            body = ACCOUNT.check(response.json())
+            assert body["customerId"] == customer_id
 
         with allure.step("Verify the created account can be retrieved"):
-            created_id = int(body["id"])
+            created_id = body["id"]
             # compare the Created account with the when created from the POST call
             allure.attach(f"Created Account ID: {created_id}", 
                          name="New Account", attachment_type=allure.attachment_type.TEXT)
             details = api_client.get_account_details(created_id)
             assert details.status_code == 200
             # Ensure created account is exist
-            details_body = details.json()
-            assert isinstance(details_body, dict), "Expected account details to be a JSON object"
-            assert int(details_body.get("id")) == created_id
+            details_body = ACCOUNT.check(details.json())
+            assert details_body["id"] == created_id
 
     @allure.feature("API - Accounts")
     @allure.story("TC_API_04")
@@ -99,7 +88,7 @@ class TestAccountsAPI:
         """TC_API_04: Request account details with invalid account ID"""
 
         with allure.step("Get invalid account ID from settings"):
-            invalid_id = int(settings["invalid_account_id"])
+            invalid_id = settings.invalid_account_id
             # to validate if the fetched ID is indeed invalid --> should be 999999999 from the seetings file
             allure.attach(f"Invalid Account ID: {invalid_id}", 
                          name="Test Data", attachment_type=allure.attachment_type.TEXT)
@@ -117,3 +106,30 @@ class TestAccountsAPI:
                 assert body, "Expected non-empty JSON error body"
             else:
                 assert response.text, "Expected non-empty error message in response body"
+
+    @allure.feature("API - Accounts")
+    @allure.story("TC_API_05")
+    @allure.title("Transaction history reflects a transfer")
+    @allure.severity(allure.severity_level.NORMAL)
+    def test_get_account_transactions(self, api_client, api_account_pool):
+        """TC_API_05: Transaction history of both accounts after a transfer"""
+        source, target = api_account_pool.lease(2)
+
+        with allure.step(f"Transfer $5 from {source} to {target}"):
+            response = api_client.transfer_funds(5, source, target)
+            assert response.status_code == 200, f"Transfer failed: {response.status_code}"
+
+        with allure.step("Verify the debit appears in the source history"):
+            response = api_client.get_account_transactions(source, transaction_type="Debit")
+            assert response.status_code == 200
+            debits = TRANSACTION.check_many(response.json(parse_float=Decimal))
+            assert any(t["amount"] == 5 and t["accountId"] == source for t in debits)
+            assert all(t["type"] == "Debit" for t in debits)
+
+        with allure.step("Verify the streamed history matches the full response"):
+            response = api_client.get_account_transactions(target)
+            assert response.status_code == 200
+            full = response.json(parse_float=Decimal)
+            streamed = list(api_client.iter_account_transactions(target, chunk_size=2))
+            assert streamed == full
+            assert any(t["type"] == "Credit" and t["amount"] == 5 for t in streamed)
@@ -0,0 +1,36 @@
+import allure
+import pytest
+
+from api.load import LoadRunner, prepare
+
+
+@pytest.mark.load
+@allure.feature("API - Load")
+@allure.title("Weighted API mix stays within error rate and p99 budget")
+def test_api_load(request, settings):
+    """Load check: the functional API scenarios as a weighted load mix"""
+    if not request.config.getoption("load_test"):
+        pytest.skip("load check runs only with --load-test")
+    load = settings.load_test
+    rate = load.rate
+    concurrency = load.concurrency
+    duration = load.duration_seconds
+
+    with allure.step("Provision accounts for the load scenarios"):
+        runner = LoadRunner(prepare(settings, concurrency if not rate else 64),
+                            load.mix)
+
+    with allure.step(f"Run the mix for {duration} s"):
+        if rate:
+            report = runner.run_rate(rate, duration)
+        else:
+            report = runner.run_concurrency(concurrency, duration)
+        allure.attach(report.format(), name="Load report",
+                      attachment_type=allure.attachment_type.TEXT)
+
+    with allure.step("Verify error rate and p99 latency"):
+        assert report.error_rate <= load.max_error_rate, \
+            f"Error rate {report.error_rate:.2%} over budget"
+        p99 = report.total.latency.percentile_ms(99)
+        assert p99 <= load.max_p99_ms, \
+            f"p99 latency {p99:.0f} ms over budget"
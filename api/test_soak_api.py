@@ -0,0 +1,37 @@
+import allure
+import pytest
+
+from api.load import prepare
+from api.soak import TransferSoak
+
+
+@pytest.mark.soak
+@allure.feature("API - Soak")
+@allure.title("Randomized concurrent transfers conserve every balance")
+def test_transfer_soak(request, settings):
+    """Soak check: thousands of transfers reconciled against a ledger"""
+    if not request.config.getoption("soak_test"):
+        pytest.skip("soak check runs only with --soak-test")
+    soak = settings.soak_test
+
+    with allure.step(f"Provision {soak.accounts} accounts"):
+        scenarios = prepare(settings, soak.concurrency, accounts=soak.accounts)
+        engine = TransferSoak(scenarios.client, scenarios.customer_id,
+                              scenarios.account_ids, soak.concurrency)
+
+    with allure.step(f"Run {soak.transfers} random transfers"):
+        report = engine.run(engine.plan(soak.transfers, soak.max_amount,
+                                        soak.seed))
+        allure.attach(report.format(), name="Soak report",
+                      attachment_type=allure.attachment_type.TEXT)
+
+    with allure.step("Verify conservation and per-account deltas"):
+        assert report.failed == 0, f"{report.failed} transfers failed: {dict(report.errors)}"
+        assert report.conserved, \
+            f"Total balance changed: {report.total_before} -> {report.total_after}"
+        assert not report.divergences, \
+            "Balances diverged from the ledger:\n" + "\n".join(map(str, report.divergences))
+
+    with allure.step("Verify throughput"):
+        assert report.throughput >= soak.min_throughput, \
+            f"{report.throughput:.1f} transfers/s under {soak.min_throughput}"
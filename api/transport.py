@@ -0,0 +1,83 @@
+"""HTTP transport shared by the API client and the SUT health check.
+
+Builds one pooled requests.Session with sized connection pools, default
+connect/read timeouts and retries that only replay idempotent requests.
+"""
+from dataclasses import asdict, dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@dataclass
+class TransportConfig:
+    """Tuning knobs for the shared HTTP session"""
+    pool_connections: int = 4
+    pool_maxsize: int = 16
+    pool_block: bool = False
+    connect_timeout: float = 3.05
+    read_timeout: float = 15
+    retries: int = 2
+    backoff_factor: float = 0.3
+    retry_statuses: tuple = (502, 503, 504)
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Build a config from the 'http' block of the settings"""
+        return cls(**asdict(settings.http))
+
+    @property
+    def timeout(self) -> tuple:
+        return (self.connect_timeout, self.read_timeout)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies a default timeout to every request"""
+
+    def __init__(self, *args, timeout=None, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def build_session(config: TransportConfig = None) -> requests.Session:
+    """Create a pooled, retrying session for talking to ParaBank"""
+    config = config or TransportConfig()
+    retry = Retry(
+        total=config.retries,
+        connect=config.retries,
+        read=config.retries,
+        status=config.retries,
+        backoff_factor=config.backoff_factor,
+        status_forcelist=config.retry_statuses,
+        # POST /transfer and /createAccount must never be replayed
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,
+        respect_retry_after_header=True,
+    )
+    adapter = TimeoutHTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=retry,
+        timeout=config.timeout,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+__all__ = ["TransportConfig", "TimeoutHTTPAdapter", "build_session"]
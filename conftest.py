@@ -1,109 +1,191 @@
-import yaml
-import pytest
-import requests
-from ui.pages import (LoginPage, AccountsOverviewPage,
-                      AccountDetailsPage, TransferFundsPage)
-from api.api_client import ParaBankAPIClient
+"""Shared fixtures: settings, HTTP transport and API data setup.
 
+Kept import-light so `pytest api/` collects fast: UI fixtures and
+everything that imports Playwright live in ui/conftest.py, and the stand-in
+server is imported inside the settings fixture.
 
-@pytest.fixture(scope="session")
-def settings():
-    """Load settings from YAML file"""
-    with open("config/settings.yaml") as f:
-        # converts yaml file to python dictionary
-        return yaml.safe_load(f)
+Settings are parsed and validated once, in the controller's
+pytest_configure, and handed to xdist workers in serialized form.
+"""
+import os
 
+import pytest
 
-@pytest.fixture
-def login_page(page):
-    """Fixture for LoginPage"""
-    return LoginPage(page)
+from api.api_client import ParaBankAPIClient
+from api.async_client import AsyncParaBankAPIClient
+from api.cache import ResponseCache
+from api.transport import TransportConfig, build_session
+from helpers.data_pool import AccountPool
+from helpers.settings import PROFILE_ENV, Settings, SettingsError, load_settings
+
+pytest_plugins = ["plugins.step_timing", "plugins.impact",
+                  "plugins.duration_schedule", "plugins.allure_segments",
+                  "plugins.run_history"]
+
+api_cache_key = pytest.StashKey[ResponseCache]()
+settings_key = pytest.StashKey[Settings]()
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--profile", default=os.environ.get(PROFILE_ENV),
+        help="settings profile from config/settings.yaml: 'demo', 'local' "
+             "(in-process ParaBank stand-in) or 'staging' "
+             f"(env: {PROFILE_ENV})")
+    parser.addoption(
+        "--load-test", action="store_true", default=False,
+        help="run the load check in api/test_load_api.py "
+             "(load_test block in config/settings.yaml)")
+    parser.addoption(
+        "--soak-test", action="store_true", default=False,
+        help="run the transfer soak check in api/test_soak_api.py "
+             "(soak_test block in config/settings.yaml)")
+    parser.addoption(
+        "--har", choices=("record", "replay"),
+        help="record: save each UI test's browser traffic as HAR files; "
+             "replay: serve UI tests from those files instead of the SUT")
+    parser.addoption(
+        "--har-dir", default="ui/har",
+        help="directory of the per-test HAR recordings (default: ui/har)")
+
+
+def pytest_configure(config):
+    """Validate settings before collection; workers reuse the controller's"""
+    serialized = getattr(config, "workerinput", {}).get("parabank_settings")
+    if serialized is not None:
+        config.stash[settings_key] = Settings.from_json(serialized)
+        return
+    try:
+        config.stash[settings_key] = load_settings(config.getoption("profile"))
+    except (SettingsError, OSError) as e:
+        raise pytest.UsageError(str(e)) from None
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Ship the validated settings to an xdist worker"""
+    node.workerinput["parabank_settings"] = \
+        node.config.stash[settings_key].to_json()
 
-@pytest.fixture
-def accounts_page(page):
-    """Fixture for AccountsOverviewPage"""
-    return AccountsOverviewPage(page)
 
+@pytest.fixture(scope="session")
+def settings(pytestconfig) -> Settings:
+    """Validated settings of the selected profile"""
+    settings = pytestconfig.stash[settings_key]
+    if settings.stand_in is None:
+        yield settings
+        return
 
-@pytest.fixture
-def account_details_page(page):
-    """Fixture for AccountDetailsPage"""
-    return AccountDetailsPage(page)
+    from helpers.stand_in_server import ParaBankStandIn
 
+    # Each xdist worker gets its own server and its own copy of the data
+    with ParaBankStandIn.from_settings(settings) as server:
+        yield settings.replace(**server.settings_overrides())
 
-@pytest.fixture
-def transfer_page(page):
-    """Fixture for TransferFundsPage"""
-    return TransferFundsPage(page)
 
+@pytest.fixture(scope="session")
+def http_session(settings):
+    """One pooled HTTP session shared by API fixtures and the health check"""
+    session = build_session(TransportConfig.from_settings(settings))
+    yield session
+    session.close()
 
-@pytest.fixture
-def config(settings):
-    """Fixture to provide configuration settings for UI tests"""
-    class Config:
-        def __init__(self, settings):
-            self.base_url = settings['ui_base_url']
-            self.overview_url = settings['overview_url']
-            self.username = settings['username']
-            self.password = settings['password']
-            self.invalid_password = settings['invalid_password']
-            self.first_name = settings['first_name']
 
-    return Config(settings)
+def pytest_terminal_summary(terminalreporter, config):
+    cache = config.stash.get(api_cache_key, None)
+    if cache is not None:
+        stats = cache.stats()
+        terminalreporter.write_line(
+            f"API setup cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['revalidated']} revalidated")
 
 
-@pytest.fixture(autouse=True)
-def check_sut_health(request, config):
-    """Automatically check if SUT is accessible and login works before running UI tests.    
-    Skips test if either check fails.
-    """
-    # Only run health check for UI tests
-    if "ui" not in str(request.fspath):
-        return
-    
-    try:
-        # Check 1: Verify ParaBank site is accessible
-        site_response = requests.get(
-            config.base_url,
-            timeout=10
-        )
-        
-        if site_response.status_code >= 500:
-            pytest.skip(f"ParaBank site down: HTTP {site_response.status_code}")
-        
-        # Check 2: Verify login endpoint accepts credentials
-        login_response = requests.get(
-            f"{config.base_url}/services/bank/login/{config.username}/{config.password}",
-            timeout=10
-        )
-        
-        # Skip if login API returns error
-        if login_response.status_code >= 400:
-            pytest.skip(f"Login validation failed: HTTP {login_response.status_code} - credentials may be invalid or DB unavailable")
-            
-    except Exception as e:
-        pytest.skip(f"ParaBank unreachable: {e}")
 # -------- API fixtures (data setup) --------
 
 @pytest.fixture(scope="session")
-def api_client(settings):
+def api_client(settings, http_session):
     """Fixture to provide API client instance"""
-    return ParaBankAPIClient(settings["api_base_url"])
+    return ParaBankAPIClient(settings.api_base_url, session=http_session,
+                             strict=settings.api_schemas.strict)
+
+@pytest.fixture(scope="session")
+def setup_api_client(request, settings, http_session):
+    """Caching API client for fixture data setup.
+
+    Tests keep using the uncached api_client so the calls they verify always
+    reach the server.
+    """
+    cache_settings = settings.api_cache
+    strict = settings.api_schemas.strict
+    if not cache_settings.enabled:
+        return ParaBankAPIClient(settings.api_base_url, session=http_session,
+                                 strict=strict)
+
+    cache = ResponseCache(ttl=cache_settings.ttl_seconds,
+                          max_entries=cache_settings.max_entries)
+    request.config.stash[api_cache_key] = cache
+    return ParaBankAPIClient(settings.api_base_url, session=http_session,
+                             cache=cache, strict=strict)
+
+
+@pytest.fixture(scope="session")
+def async_api_client(api_client, settings):
+    """Async API client for bulk data setup and verification"""
+    pool_size = TransportConfig.from_settings(settings).pool_maxsize
+    client = AsyncParaBankAPIClient(api_client, max_concurrency=pool_size)
+    yield client
+    client.close()
+
 
 @pytest.fixture(scope="session")
 def customer_id(settings) -> int:
-    return int(settings["customer_id"])  # from config/settings.yaml
+    return settings.customer_id  # from config/settings.yaml
+
+
+@pytest.fixture(scope="session")
+def ui_customer_id(setup_api_client, settings) -> int:
+    """Customer id of the UI login user, resolved through the login API"""
+    resp = setup_api_client.login(settings.username, settings.password)
+    assert resp.status_code == 200, f"Precondition failed: login status {resp.status_code}"
+    return int(resp.json()["id"])
+
+
+def _account_pool(request, client, customer_id, worker_id, settings):
+    # The stand-in's data resets every run, so there is nothing to recycle
+    cache = None if settings.stand_in else request.config.cache
+    return AccountPool(
+        client, customer_id, worker_id,
+        size=settings.data_pool.accounts_per_worker,
+        account_type=settings.data_pool.account_type,
+        cache=cache,
+        funding_account_id=settings.data_pool.funding_accounts.get(
+            str(customer_id))).provision()
+
+
+@pytest.fixture(scope="session")
+def api_account_pool(request, setup_api_client, customer_id, worker_id,
+                     settings) -> AccountPool:
+    """Accounts of the API test customer owned by this xdist worker"""
+    return _account_pool(request, setup_api_client, customer_id, worker_id,
+                         settings)
+
+
+@pytest.fixture(scope="session")
+def ui_account_pool(request, setup_api_client, ui_customer_id, worker_id,
+                    settings) -> AccountPool:
+    """Accounts of the UI login user owned by this xdist worker"""
+    return _account_pool(request, setup_api_client, ui_customer_id,
+                         worker_id, settings)
+
+
+@pytest.fixture()
+def valid_account_id(api_account_pool: AccountPool) -> int:
+    """Obtain a valid account id for the test customer (worker-private)."""
+    return api_account_pool.lease(1)[0]
 
 
 @pytest.fixture()
-def valid_account_id(api_client: ParaBankAPIClient, customer_id: int) -> int:
-    """Obtain a valid account id for the test customer (independent setup)."""
-    resp = api_client.get_customer_accounts(customer_id)
-    assert resp.status_code == 200, f"Precondition failed: accounts list status {resp.status_code}"
-    data = resp.json()
-    assert isinstance(data, list) and len(data) > 0, "Precondition failed: no accounts returned for customer"
-    first = data[0]
-    assert "id" in first, "Precondition failed: account missing 'id'"
-    return int(first["id"])
+def ui_account_pair(ui_account_pool: AccountPool) -> tuple:
+    """Two worker-private account numbers of the UI user, as shown in the UI"""
+    source, target = ui_account_pool.lease(2)
+    return str(source), str(target)
@@ -0,0 +1,75 @@
+"""Account preconditions/postconditions for UI tests.
+
+UiAccountState scrapes balances from the Accounts Overview page.
+ApiAccountState reads them with one ParaBankAPIClient call and opens the
+browser only for the action under test. UI tests pick ApiAccountState with
+the api_setup marker (see the account_state fixture in conftest.py).
+"""
+from decimal import Decimal
+
+from api.api_client import ParaBankAPIClient
+from helpers.money import to_decimal
+from helpers.auth_state import AuthenticatedSession
+from ui.pages import AccountsOverviewPage, TransferFundsPage
+
+
+class UiAccountState:
+    """Read balances from the Accounts Overview page"""
+
+    def __init__(self, session: AuthenticatedSession, overview_url: str):
+        self.session = session
+        self.overview_url = overview_url
+        self.page = None
+
+    def balances(self) -> dict:
+        """Map account number -> Decimal balance, in table order"""
+        if self.page is None:
+            # Logged-in pages already start on the overview
+            self.page = self.session.new_page()
+        accounts_page = AccountsOverviewPage(self.page)
+        if self.page.url != self.overview_url:
+            accounts_page.navigate(self.overview_url)
+        return {row.account_id: row.balance
+                for row in accounts_page.read_accounts_table()}
+
+    def open_transfer_page(self) -> TransferFundsPage:
+        if self.page is None:
+            self.page = self.session.new_page()
+        return AccountsOverviewPage(self.page).navigate_to_transfer_funds()
+
+    def close(self):
+        if self.page is not None:
+            self.session.release(self.page)
+
+
+class ApiAccountState:
+    """Read balances through the API; the browser only performs the action"""
+
+    def __init__(self, api_client: ParaBankAPIClient, customer_id: int,
+                 session: AuthenticatedSession, transfer_url: str):
+        self.api_client = api_client
+        self.customer_id = customer_id
+        self.session = session
+        self.transfer_url = transfer_url
+        self.page = None
+
+    def balances(self) -> dict:
+        """Map account number -> Decimal balance, in one API call"""
+        response = self.api_client.get_customer_accounts(self.customer_id)
+        assert response.status_code == 200, \
+            f"Accounts lookup failed: HTTP {response.status_code}"
+        # parse_float keeps the JSON balances exact
+        return {str(account["id"]): to_decimal(account["balance"])
+                for account in response.json(parse_float=Decimal)}
+
+    def open_transfer_page(self) -> TransferFundsPage:
+        """Open a logged-in page straight on Transfer Funds"""
+        self.page = self.session.new_page(self.transfer_url)
+        return TransferFundsPage(self.page)
+
+    def close(self):
+        if self.page is not None:
+            self.session.release(self.page)
+
+
+__all__ = ["ApiAccountState", "UiAccountState"]
@@ -0,0 +1,95 @@
+"""Reusable logged-in browser state for UI tests.
+
+Logs in through the real form once, saves the Playwright storage state
+(JSESSIONID cookie) to disk and opens later contexts from that file, so
+only the login tests themselves have to drive the login form.
+"""
+from pathlib import Path
+
+from playwright.sync_api import Browser, Page
+
+from helpers.context_pool import ContextPool
+from ui.pages import LoginPage
+
+
+class AuthenticatedSession:
+    """Hands out pages that are already logged in to ParaBank"""
+
+    def __init__(self, browser: Browser, context_args: dict, state_file: Path,
+                 base_url: str, overview_url: str, username: str,
+                 password: str, context_setup=None, pool: ContextPool = None):
+        """context_setup is called with every new context, e.g. to add routes.
+
+        With a pool, logged-in pages come from warm pooled contexts; hand
+        them back with release() instead of closing their context.
+        """
+        self.browser = browser
+        self.context_args = context_args
+        self.context_setup = context_setup
+        self.pool = pool
+        self.state_file = Path(state_file)
+        self.base_url = base_url
+        self.overview_url = overview_url
+        self.username = username
+        self.password = password
+        self.login_count = 0
+
+    def login(self):
+        """Log in through the form and save the storage state to disk"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        context = self._new_context()
+        try:
+            page = context.new_page()
+            LoginPage(page).navigate(self.base_url).login(
+                self.username, self.password)
+            page.wait_for_url(self.overview_url)
+            context.storage_state(path=str(self.state_file))
+            self.login_count += 1
+        finally:
+            context.close()
+        return self
+
+    def logout(self):
+        """Forget the saved state; the next new_page() logs in again"""
+        self.state_file.unlink(missing_ok=True)
+
+    def new_page(self, url: str = None) -> Page:
+        """Open a logged-in page on url (the accounts overview by default).
+
+        Logs in again once if the saved session cookie has expired.
+        """
+        url = url or self.overview_url
+        if not self.state_file.exists():
+            self.login()
+
+        page = self._open(url)
+        if LoginPage(page).is_login_form_visible():
+            # Server dropped the session: refresh the saved state and retry
+            self.release(page)
+            page = self.login()._open(url)
+        return page
+
+    def release(self, page: Page):
+        """Done with a page from new_page()"""
+        if self.pool is not None:
+            self.pool.release(page)
+        else:
+            page.context.close()
+
+    def _open(self, url: str) -> Page:
+        if self.pool is not None:
+            page = self.pool.acquire(storage_state=self.state_file)
+        else:
+            page = self._new_context(
+                storage_state=str(self.state_file)).new_page()
+        page.goto(url)
+        return page
+
+    def _new_context(self, **kwargs):
+        context = self.browser.new_context(**self.context_args, **kwargs)
+        if self.context_setup:
+            self.context_setup(context)
+        return context
+
+
+__all__ = ["AuthenticatedSession"]
@@ -0,0 +1,112 @@
+"""Startup-time benchmark: pytest collection of api/ alone vs the full suite.
+
+Each target is collected (`pytest --co -q`) in fresh interpreters several
+times; the median wall time, the in-process collection time and whether
+Playwright got imported are reported:
+
+    python -m helpers.collection_benchmark --repeat 5
+
+Fails (exit 1) when
+- the API-only run imports playwright.sync_api,
+- API-only startup exceeds --max-ratio of the full suite's, or
+- with --baseline FILE, a target got slower than the stored median by more
+  than --tolerance (use --save-baseline to record one).
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+TARGETS = {
+    # API-only runs drop the pytest-playwright plugin, as CI does
+    "api": ["api", "-p", "no:playwright"],
+    "full": [],
+}
+
+# Runs in the child: collect, then report timings and what got imported
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import pytest
+code = pytest.main(sys.argv[1:] + ["--co", "-q", "-p", "no:cacheprovider"])
+print(json.dumps({"collect_s": time.perf_counter() - start, "exit": int(code),
+                  "playwright": "playwright.sync_api" in sys.modules}))
+"""
+
+
+def measure(args: list, repeat: int) -> dict:
+    walls, collects, playwright = [], [], False
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", _CHILD, *args],
+                              capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if result["exit"] != 0:
+            raise SystemExit(f"pytest --co {' '.join(args)} failed:\n"
+                             f"{proc.stdout}{proc.stderr}")
+        collects.append(result["collect_s"])
+        playwright |= result["playwright"]
+    return {"wall_s": statistics.median(walls),
+            "collect_s": statistics.median(collects),
+            "playwright": playwright}
+
+
+def check(results: dict, max_ratio: float, baseline: dict = None,
+          tolerance: float = 0.25) -> list:
+    """Problems found in the results; empty when everything is in budget"""
+    problems = []
+    if results["api"]["playwright"]:
+        problems.append("API-only collection imported playwright.sync_api")
+    ratio = results["api"]["wall_s"] / results["full"]["wall_s"]
+    if ratio > max_ratio:
+        problems.append(f"API-only startup is {ratio:.0%} of the full suite's "
+                        f"(budget {max_ratio:.0%})")
+    for name, base in (baseline or {}).items():
+        now = results.get(name)
+        # 50 ms of slack keeps tiny timings from flapping
+        if now and now["wall_s"] > base["wall_s"] * (1 + tolerance) + 0.05:
+            problems.append(f"{name}: {now['wall_s']:.2f} s vs baseline "
+                            f"{base['wall_s']:.2f} s")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m helpers.collection_benchmark",
+        description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-ratio", type=float, default=0.95,
+                        help="API-only wall time budget as a fraction of "
+                             "the full suite's (default 0.95)")
+    parser.add_argument("--baseline", type=Path,
+                        help="JSON file with medians from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="write this run's medians to --baseline")
+    args = parser.parse_args(argv)
+
+    results = {name: measure(target_args, args.repeat)
+               for name, target_args in TARGETS.items()}
+    print(f"{'target':<6} {'wall s':>8} {'collect s':>10}  playwright")
+    for name, r in results.items():
+        print(f"{name:<6} {r['wall_s']:>8.3f} {r['collect_s']:>10.3f}  "
+              f"{'imported' if r['playwright'] else 'not imported'}")
+
+    baseline = None
+    if args.baseline and args.baseline.exists() and not args.save_baseline:
+        baseline = json.loads(args.baseline.read_text())
+    problems = check(results, args.max_ratio, baseline, args.tolerance)
+    if args.baseline and args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2))
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
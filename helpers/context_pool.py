@@ -0,0 +1,104 @@
+"""Warm browser contexts reused across the tests of one worker.
+
+Creating a context per test costs startup time and throws away the HTTP
+cache. The pool hands out a context with one open page, and on release
+clears cookies, storage and permissions and parks the page on about:blank
+instead of closing it. Contexts are closed after `recycle_after` tests so
+long runs do not accumulate browser state.
+"""
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from playwright.sync_api import Browser, BrowserContext, Error, Page
+
+_CLEAR_STORAGE_JS = """() => {
+    try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}
+}"""
+
+
+@dataclass
+class PooledContext:
+    context: BrowserContext
+    page: Page
+    uses: int = 0
+
+
+class ContextPool:
+    """Small per-worker pool of reusable browser contexts"""
+
+    def __init__(self, browser: Browser, context_args: dict, size: int = 2,
+                 recycle_after: int = 25, context_setup=None):
+        """context_setup is called once with every new context"""
+        self.browser = browser
+        self.context_args = context_args
+        self.size = size
+        self.recycle_after = recycle_after
+        self.context_setup = context_setup
+        self.created = 0
+        self.reused = 0
+        self._idle = []
+        self._in_use = {}
+
+    def acquire(self, storage_state=None) -> Page:
+        """Get a clean page, optionally logged in via a storage state file"""
+        pooled = self._idle.pop() if self._idle else None
+        if pooled is None:
+            pooled = self._create()
+        else:
+            self.reused += 1
+
+        if storage_state:
+            state = json.loads(Path(storage_state).read_text())
+            pooled.context.add_cookies(state.get("cookies", []))
+        self._in_use[pooled.page] = pooled
+        return pooled.page
+
+    def release(self, page: Page):
+        """Return a page from acquire(); resets or retires its context"""
+        pooled = self._in_use.pop(page)
+        pooled.uses += 1
+        if pooled.uses >= self.recycle_after or len(self._idle) >= self.size \
+                or not self._reset(pooled):
+            self._close(pooled)
+        else:
+            self._idle.append(pooled)
+
+    def close(self):
+        for pooled in self._idle + list(self._in_use.values()):
+            self._close(pooled)
+        self._idle.clear()
+        self._in_use.clear()
+
+    def _create(self) -> PooledContext:
+        context = self.browser.new_context(**self.context_args)
+        if self.context_setup:
+            self.context_setup(context)
+        self.created += 1
+        return PooledContext(context, context.new_page())
+
+    def _reset(self, pooled: PooledContext) -> bool:
+        """Clear state left by the previous test; False if the context is unusable"""
+        try:
+            for page in pooled.context.pages:
+                if page is not pooled.page:
+                    page.close()
+            if pooled.page.is_closed():
+                return False
+            # Storage is per origin, so clear it before leaving the app's page
+            pooled.page.evaluate(_CLEAR_STORAGE_JS)
+            pooled.context.clear_cookies()
+            pooled.context.clear_permissions()
+            pooled.page.goto("about:blank")
+            return True
+        except Error:
+            return False
+
+    def _close(self, pooled: PooledContext):
+        try:
+            pooled.context.close()
+        except Error:
+            pass
+
+
+__all__ = ["ContextPool"]
@@ -1,7 +1,11 @@
+from helpers.money import to_decimal
+
+
 def to_amount(value: str) -> float:
     """Convert a currency string like "$1,234.56" to a float.
-    Strips dollar signs, commas, and surrounding whitespace.
+    Kept for callers that want a float; balance checks should use
+    helpers.money, which keeps amounts exact.
     """
-    return float(value.replace("$", "").replace(",", "").strip())
+    return float(to_decimal(value))
 
 __all__ = ["to_amount"]
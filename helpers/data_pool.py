@@ -0,0 +1,93 @@
+"""Per-worker account pools for parallel-safe test data.
+
+Each xdist worker provisions its own accounts (created with
+ParaBankAPIClient.create_account) so tests that assert on balances never
+share an account with another worker. ParaBank cannot delete accounts, so
+pool ids are remembered in the pytest cache and recycled by the same worker
+on the next run instead of creating new ones every time.
+
+Every new account's opening deposit comes from one funding account per
+customer: data_pool.funding_accounts in settings.yaml, or else the
+customer's first account. Provisioning by any worker (or a load/soak run)
+changes that balance, so the funding account is never leased and no test
+asserts on its balance.
+"""
+from api.api_client import ParaBankAPIClient
+
+
+class AccountPool:
+    """Accounts owned by one worker for one customer"""
+
+    def __init__(self, client: ParaBankAPIClient, customer_id: int,
+                 worker_id: str, size: int = 2, account_type: int = 0,
+                 cache=None, funding_account_id: int = None):
+        """cache is a pytest Cache (request.config.cache) or None to disable
+        recycling, e.g. against the stand-in whose data resets every run.
+        funding_account_id defaults to the customer's first account.
+        """
+        self.client = client
+        self.customer_id = int(customer_id)
+        self.worker_id = worker_id
+        self.size = size
+        self.account_type = account_type
+        self.cache = cache
+        self.funding_account_id = funding_account_id
+        self.account_ids = []
+        self.recycled = 0
+
+    @property
+    def cache_key(self) -> str:
+        return f"parabank/account_pool/{self.customer_id}/{self.worker_id}"
+
+    def provision(self):
+        """Recycle this worker's accounts from the last run, create the rest"""
+        self.account_ids = self._recycle()
+        self.recycled = len(self.account_ids)
+
+        if len(self.account_ids) < self.size:
+            funding_account_id = self._funding_account_id()
+            while len(self.account_ids) < self.size:
+                resp = self.client.create_account(
+                    self.customer_id, self.account_type, funding_account_id)
+                assert resp.status_code in (200, 201), \
+                    f"Precondition failed: createAccount status {resp.status_code}"
+                self.account_ids.append(int(resp.json()["id"]))
+
+        if self.cache is not None:
+            self.cache.set(self.cache_key, self.account_ids)
+        return self
+
+    def lease(self, count: int = 1) -> list:
+        """Account ids for one test; tests in a worker run one at a time"""
+        assert count <= len(self.account_ids), \
+            f"Pool has {len(self.account_ids)} accounts, {count} requested"
+        return self.account_ids[:count]
+
+    def _recycle(self) -> list:
+        if self.cache is None:
+            return []
+        recycled = []
+        for account_id in self.cache.get(self.cache_key, [])[:self.size]:
+            resp = self.client.get_account_details(account_id)
+            # The server may have been reset since the last run
+            if resp.status_code == 200 and \
+                    int(resp.json().get("customerId", -1)) == self.customer_id:
+                recycled.append(int(account_id))
+        return recycled
+
+    def _funding_account_id(self) -> int:
+        resp = self.client.get_customer_accounts(self.customer_id)
+        assert resp.status_code == 200, \
+            f"Precondition failed: accounts list status {resp.status_code}"
+        account_ids = [int(a["id"]) for a in resp.json()]
+        assert account_ids, \
+            "Precondition failed: no accounts returned for customer"
+        if self.funding_account_id is None:
+            return account_ids[0]
+        assert int(self.funding_account_id) in account_ids, \
+            (f"Precondition failed: funding account {self.funding_account_id} "
+             f"does not belong to customer {self.customer_id}")
+        return int(self.funding_account_id)
+
+
+__all__ = ["AccountPool"]
@@ -0,0 +1,159 @@
+"""HAR record/replay of UI test traffic.
+
+`--har record` runs the UI tests against the live SUT and saves every
+browser context's traffic as one HAR per context, under a directory per
+test id:
+
+    ui/har/test_transfer_ui/test_transfer_funds[chromium]/context-0.har
+
+`--har replay` serves the same responses through Playwright's
+route_from_har, so POM and locator changes can be checked without the
+server. Requests missing from the recording are aborted.
+
+route_from_har answers a repeated request with the same recorded response,
+which breaks flows that change server state: after the transfer POST the
+overview has to show the new balances. StatefulReplay therefore splits the
+recording into epochs at every non-GET request and answers GETs whose
+response changed across epochs with the response of the current epoch.
+Fixture values the recording depends on (e.g. the account pair) are kept
+next to the HARs in fixtures.json.
+"""
+import base64
+import json
+import re
+import shutil
+from collections import defaultdict
+from pathlib import Path
+
+from playwright.sync_api import BrowserContext, Route
+
+RECORD = "record"
+REPLAY = "replay"
+MODES = (RECORD, REPLAY)
+
+# Decoded bodies are fulfilled, so the recorded framing no longer applies
+_SKIP_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+def recording_dir(nodeid: str) -> Path:
+    """ui/test_x.py::test_y[chromium] -> test_x/test_y[chromium]"""
+    module, _, name = nodeid.partition("::")
+    parts = [Path(module).stem] + name.split("::")
+    return Path(*(re.sub(r"[^\w.\-\[\]]+", "_", part) for part in parts))
+
+
+def _body(response: dict) -> bytes:
+    content = response.get("content", {})
+    text = content.get("text", "")
+    if content.get("encoding") == "base64":
+        return base64.b64decode(text)
+    return text.encode("utf-8")
+
+
+class StatefulReplay:
+    """Serves state-dependent responses of one HAR in recorded order"""
+
+    def __init__(self, har_path: Path):
+        entries = json.loads(Path(har_path).read_text())["log"]["entries"]
+        entries.sort(key=lambda e: e.get("startedDateTime", ""))
+        self.responses = defaultdict(dict)
+        epoch = 0
+        for entry in entries:
+            key = (entry["request"]["method"], entry["request"]["url"])
+            self.responses[key].setdefault(epoch, entry["response"])
+            if key[0] != "GET":
+                epoch += 1
+        self.epoch = 0
+        # GETs whose response is the same in every epoch are left to route_from_har
+        self.stateful = {
+            key for key, by_epoch in self.responses.items()
+            if key[0] != "GET"
+            or len({_body(r) for r in by_epoch.values()}) > 1}
+
+    def install(self, context: BrowserContext):
+        # Registered after route_from_har, so it sees every request first
+        context.route("**/*", self._handle)
+        return context
+
+    def _response(self, key) -> dict:
+        by_epoch = self.responses[key]
+        earlier = [epoch for epoch in by_epoch if epoch <= self.epoch]
+        return by_epoch[max(earlier) if earlier else min(by_epoch)]
+
+    def _handle(self, route: Route):
+        request = route.request
+        key = (request.method, request.url)
+        if key not in self.stateful:
+            route.fallback()
+            return
+        response = self._response(key)
+        if request.method != "GET":
+            self.epoch += 1
+        headers = {h["name"]: h["value"] for h in response.get("headers", ())
+                   if h["name"].lower() not in _SKIP_HEADERS}
+        route.fulfill(status=response["status"], headers=headers,
+                      body=_body(response))
+
+
+class HarArchive:
+    """Per-test HAR files: recorded from, or replayed into, browser contexts"""
+
+    def __init__(self, root: Path, mode: str):
+        if mode not in MODES:
+            raise ValueError(f"HAR mode must be one of {MODES}, got {mode!r}")
+        self.root = Path(root)
+        self.mode = mode
+        self.test_dir = None
+        self._contexts = 0
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def start(self, nodeid: str) -> bool:
+        """Begin a test; False when replaying a test that was never recorded"""
+        self.test_dir = self.root / recording_dir(nodeid)
+        self._contexts = 0
+        if self.mode == RECORD:
+            # A fresh recording, so stale contexts never get replayed
+            shutil.rmtree(self.test_dir, ignore_errors=True)
+            self.test_dir.mkdir(parents=True)
+            return True
+        return self.test_dir.is_dir()
+
+    def finish(self):
+        self.test_dir = None
+
+    def install(self, context: BrowserContext):
+        """Record or replay the current test's next context"""
+        if self.test_dir is None:
+            return context
+        path = self.test_dir / f"context-{self._contexts}.har"
+        self._contexts += 1
+        if self.mode == RECORD:
+            # Written when the context closes
+            context.route_from_har(path, update=True, update_content="embed")
+            return context
+        if not path.exists():
+            raise FileNotFoundError(
+                f"No HAR recording {path}; the test opened more browser "
+                f"contexts than when it was recorded (re-record with "
+                f"--har record)")
+        context.route_from_har(path, not_found="abort")
+        StatefulReplay(path).install(context)
+        return context
+
+    def fixture_value(self, name: str, produce):
+        """produce() when recording (and save it), the saved value on replay"""
+        path = self.test_dir / "fixtures.json"
+        values = json.loads(path.read_text()) if path.exists() else {}
+        if self.replaying:
+            if name not in values:
+                raise KeyError(f"{name} was not recorded in {path}")
+            return values[name]
+        values[name] = produce()
+        path.write_text(json.dumps(values, indent=2))
+        return values[name]
+
+
+__all__ = ["HarArchive", "StatefulReplay", "RECORD", "REPLAY"]
@@ -0,0 +1,132 @@
+"""SUT health check with a cached, worker-shared verdict.
+
+The verdict is probed once and stored in a JSON file guarded by a file lock,
+so every xdist worker of a run reuses the same probe result until it expires.
+"""
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import requests
+from filelock import FileLock
+
+
+@dataclass
+class HealthVerdict:
+    """Result of one SUT probe"""
+    healthy: bool
+    reason: str = ""
+    checked_at: float = 0.0
+    latency_ms: dict = field(default_factory=dict)
+
+    def is_fresh(self, ttl: float) -> bool:
+        """Check if the verdict is younger than ttl seconds"""
+        return time.time() - self.checked_at < ttl
+
+    def describe_latency(self) -> str:
+        """Format probe latencies as 'site=12ms, login=34ms'"""
+        return ", ".join(f"{name}={ms:.0f}ms"
+                         for name, ms in self.latency_ms.items())
+
+
+class SUTHealthChecker:
+    """Probe ParaBank once and share the verdict through a cache file"""
+
+    def __init__(self, base_url: str, username: str, password: str,
+                 cache_dir: Path, ttl: float = 300, timeout: float = 5,
+                 session: requests.Session = None):
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.ttl = ttl
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.probe_count = 0
+
+        # One cache file per SUT so different profiles never share a verdict
+        key = hashlib.sha1(base_url.encode()).hexdigest()[:12]
+        self.cache_file = Path(cache_dir) / f"sut_health_{key}.json"
+        self._lock = FileLock(str(self.cache_file) + ".lock")
+        self._verdict = None
+
+    @property
+    def last_verdict(self):
+        """Verdict this process acted on last, without probing"""
+        return self._verdict
+
+    def verdict(self) -> HealthVerdict:
+        """Return a fresh verdict, probing only when no cached one is valid"""
+        if self._verdict and self._verdict.is_fresh(self.ttl):
+            return self._verdict
+
+        with self._lock:
+            # Another worker may have probed while we waited for the lock
+            cached = self._read_cache()
+            if cached and cached.is_fresh(self.ttl):
+                self._verdict = cached
+            else:
+                self._verdict = self.probe()
+                self.cache_file.write_text(json.dumps(asdict(self._verdict)))
+        return self._verdict
+
+    def invalidate(self, seen: HealthVerdict = None):
+        """Force a re-probe on the next verdict() call.
+
+        Pass the verdict the caller acted on so that a newer verdict written
+        by another worker in the meantime is kept instead of being dropped.
+        """
+        seen = seen or self._verdict
+        self._verdict = None
+        with self._lock:
+            cached = self._read_cache()
+            if cached and (seen is None
+                           or cached.checked_at <= seen.checked_at):
+                self.cache_file.unlink(missing_ok=True)
+
+    def probe(self) -> HealthVerdict:
+        """Hit the site and the login endpoint and build a verdict"""
+        self.probe_count += 1
+        latency = {}
+        checked_at = time.time()
+        try:
+            # Check 1: Verify ParaBank site is accessible
+            site_response = self._timed_get("site", self.base_url, latency)
+            if site_response.status_code >= 500:
+                return HealthVerdict(
+                    False, f"ParaBank site down: HTTP {site_response.status_code}",
+                    checked_at, latency)
+
+            # Check 2: Verify login endpoint accepts credentials
+            login_response = self._timed_get(
+                "login",
+                f"{self.base_url}/services/bank/login/{self.username}/{self.password}",
+                latency)
+            if login_response.status_code >= 400:
+                return HealthVerdict(
+                    False,
+                    f"Login validation failed: HTTP {login_response.status_code}"
+                    " - credentials may be invalid or DB unavailable",
+                    checked_at, latency)
+        except requests.RequestException as e:
+            return HealthVerdict(False, f"ParaBank unreachable: {e}",
+                                 checked_at, latency)
+
+        return HealthVerdict(True, "", checked_at, latency)
+
+    def _timed_get(self, name: str, url: str, latency: dict):
+        start = time.perf_counter()
+        try:
+            return self.session.get(url, timeout=self.timeout)
+        finally:
+            latency[name] = (time.perf_counter() - start) * 1000
+
+    def _read_cache(self):
+        try:
+            return HealthVerdict(**json.loads(self.cache_file.read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+
+__all__ = ["HealthVerdict", "SUTHealthChecker"]
@@ -0,0 +1,97 @@
+"""Exact money values for balance checks.
+
+ParaBank shows amounts as "$1,234.56", negatives as "-$1,234.56" and some
+browsers/locales render them as "($1,234.56)". Amounts are parsed into
+Decimal (or integer cents) so balance arithmetic never picks up float
+rounding. parse_amounts() handles a whole column at once: one regex
+validates the joined strings and one translate() strips the formatting,
+instead of a parse call per cell.
+"""
+import re
+from decimal import Decimal, InvalidOperation
+
+CENT = Decimal("0.01")
+
+# One amount: "($1,234.56)", or an optional sign before and/or after "$"
+# ".50" (no integer part) and "+5" are accepted, as float() did
+_DIGITS = r"(?:(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|\.\d+)"
+_AMOUNT = (rf"[ \t]*(?:\([ \t]*\$?[ \t]*{_DIGITS}[ \t]*\)"
+           rf"|[-+]?[ \t]*\$?[ \t]*[-+]?{_DIGITS})[ \t]*")
+_ONE = re.compile(_AMOUNT)
+# A whole column joined with newlines; no groups, so matching stays cheap
+_COLUMN = re.compile(rf"(?:{_AMOUNT}\n)*")
+# What is left after validation is a plain decimal literal
+_TO_LITERAL = str.maketrans({"$": None, ",": None, " ": None, "\t": None,
+                             "(": "-", ")": None})
+
+
+def to_decimal(value) -> Decimal:
+    """Parse one amount ("$1,234.56", "-$5.00", "($5.00)", 12.5) exactly"""
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, (int, float)):
+        # str() keeps the shortest repr, so 0.1 stays 0.1
+        return Decimal(str(value))
+    try:
+        # Cell text may carry a newline or a non-breaking space
+        value = value.strip()
+        if _ONE.fullmatch(value) is None:
+            raise ValueError
+        # "-$-5" validates but is not a number
+        return Decimal(value.translate(_TO_LITERAL))
+    except (ValueError, InvalidOperation):
+        raise ValueError(f"Not a money amount: {value!r}") from None
+
+
+def to_cents(value) -> int:
+    """Amount as integer cents, rounded half-even to the cent"""
+    return int(to_decimal(value).quantize(CENT) * 100)
+
+
+def parse_amounts(values) -> list:
+    """Parse a list/column of amount strings in one pass, in order"""
+    values = list(values)
+    if not values:
+        return []
+    if all(isinstance(v, str) for v in values):
+        joined = "\n".join(values) + "\n"
+        if _COLUMN.fullmatch(joined) is not None:
+            literals = joined.translate(_TO_LITERAL).split("\n")[:-1]
+            try:
+                # A value with an embedded newline would shift the column
+                if len(literals) == len(values):
+                    return [Decimal(literal) for literal in literals]
+            except InvalidOperation:
+                pass
+    # Mixed types or a malformed entry: per-value parse names the culprit
+    return [to_decimal(v) for v in values]
+
+
+def parse_cents(values) -> list:
+    return [int(amount.quantize(CENT) * 100) for amount in parse_amounts(values)]
+
+
+def assert_balance_deltas(before: dict, after: dict, expected: dict):
+    """Assert after[id] == before[id] + expected[id] for every id at once.
+
+    Balances and deltas may be Decimal, numbers or amount strings. All
+    mismatches are reported together.
+    """
+    problems = []
+    for account_id, delta in expected.items():
+        key = str(account_id)
+        if key not in before or key not in after:
+            problems.append(f"account {key}: missing "
+                            f"{'before' if key not in before else 'after'}")
+            continue
+        start, end = to_decimal(before[key]), to_decimal(after[key])
+        delta = to_decimal(delta)
+        want = start + delta
+        if end != want:
+            problems.append(f"account {key}: expected {start} {delta:+} = "
+                            f"{want}, got {end}")
+    assert not problems, "Balance deltas do not match:\n" + "\n".join(problems)
+
+
+__all__ = ["to_decimal", "to_cents", "parse_amounts", "parse_cents",
+           "assert_balance_deltas"]
@@ -0,0 +1,143 @@
+"""Request routing that skips resources the UI tests never assert on.
+
+Each Playwright resource type can be aborted or served from a local disk
+cache; URLs matching a block pattern are always aborted. Install the filter
+on a browser context and toggle `enabled` per test to let visual checks
+load everything.
+
+Cached responses are keyed by full URL (so by SUT host) and served without a
+request for cache_ttl seconds. After that the next request revalidates with
+If-None-Match / If-Modified-Since: a 304 keeps the cached body for another
+TTL, anything else replaces it, so a deploy's new CSS is picked up.
+"""
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from playwright.sync_api import BrowserContext, Route
+
+ABORT = "abort"
+CACHE = "cache"
+
+
+@dataclass
+class NetworkFilterStats:
+    """Counters for requests the filter handled instead of the network"""
+    blocked_requests: int = 0
+    cached_requests: int = 0
+    # Only cache hits have a known size; aborted requests are never sized
+    bytes_from_cache: int = 0
+    by_type: Counter = field(default_factory=Counter)
+
+    def describe(self) -> str:
+        types = ", ".join(f"{t}={n}" for t, n in self.by_type.most_common())
+        return (f"{self.blocked_requests} blocked, {self.cached_requests} "
+                f"served from cache ({self.bytes_from_cache / 1024:.0f} KiB)"
+                + (f" [{types}]" if types else ""))
+
+
+class NetworkFilter:
+    """Abort or locally serve unneeded resources for a browser context"""
+
+    def __init__(self, resource_types: dict = None, block_url_patterns=(),
+                 cache_dir: Path = None, cache_ttl: float = 3600):
+        self.resource_types = dict(resource_types or {})
+        self.block_url_patterns = tuple(block_url_patterns)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.cache_ttl = cache_ttl
+        self.enabled = True
+        self.stats = NetworkFilterStats()
+
+        if self.cache_dir is None and CACHE in self.resource_types.values():
+            raise ValueError("A cache_dir is required for 'cache' rules")
+
+    @classmethod
+    def from_settings(cls, settings):
+        """Build a filter from the 'network_filter' block of the settings"""
+        block = settings.network_filter
+        if not block.enabled:
+            return None
+        return cls(block.resource_types, block.block_url_patterns,
+                   block.cache_dir, block.cache_ttl_seconds)
+
+    def install(self, context: BrowserContext):
+        """Route every request of the context through the filter"""
+        context.route("**/*", self._handle)
+        return context
+
+    def _action_for(self, request):
+        if any(pattern in request.url for pattern in self.block_url_patterns):
+            return ABORT
+        return self.resource_types.get(request.resource_type)
+
+    def _handle(self, route: Route):
+        request = route.request
+        action = self._action_for(request) if self.enabled else None
+        if action is None or request.method != "GET":
+            route.fallback()
+        elif action == ABORT:
+            self.stats.blocked_requests += 1
+            self.stats.by_type[request.resource_type] += 1
+            route.abort("blockedbyclient")
+        else:
+            self._serve_from_cache(route)
+
+    def _serve_from_cache(self, route: Route):
+        key = hashlib.sha1(route.request.url.encode()).hexdigest()
+        body_file = self.cache_dir / key
+        meta_file = self.cache_dir / f"{key}.json"
+
+        meta = None
+        if body_file.exists() and meta_file.exists():
+            meta = json.loads(meta_file.read_text())
+            # Entries written before the TTL existed count as stale
+            if time.time() - meta.get("fetched_at", 0) < self.cache_ttl:
+                self._fulfill_cached(route, meta, body_file.read_bytes())
+                return
+
+        request_headers = dict(route.request.headers)
+        if meta is not None:
+            cached = meta["headers"]
+            if "etag" in cached:
+                request_headers["if-none-match"] = cached["etag"]
+            if "last-modified" in cached:
+                request_headers["if-modified-since"] = cached["last-modified"]
+        response = route.fetch(headers=request_headers)
+        if response.status == 304 and meta is not None:
+            meta["fetched_at"] = time.time()
+            _write_atomic(meta_file, json.dumps(meta).encode())
+            self._fulfill_cached(route, meta, body_file.read_bytes())
+            return
+
+        body = response.body()
+        # body() is already decoded, so the original encoding/length no longer apply
+        headers = {name: value for name, value in response.headers.items()
+                   if name.lower() not in ("content-encoding", "content-length")}
+        if response.status == 200:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so parallel workers never read a partial file
+            _write_atomic(body_file, body)
+            _write_atomic(meta_file, json.dumps(
+                {"status": response.status, "headers": headers,
+                 "fetched_at": time.time()}).encode())
+        route.fulfill(status=response.status, headers=headers, body=body)
+
+    def _fulfill_cached(self, route: Route, meta: dict, body: bytes):
+        self.stats.cached_requests += 1
+        self.stats.bytes_from_cache += len(body)
+        self.stats.by_type[route.request.resource_type] += 1
+        route.fulfill(status=meta["status"], headers=meta["headers"],
+                      body=body)
+
+
+def _write_atomic(path: Path, data: bytes):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+__all__ = ["NetworkFilter", "NetworkFilterStats"]
@@ -0,0 +1,408 @@
+"""Typed settings: config/settings.yaml + profile + .env overrides.
+
+The file is read once per process into frozen dataclasses, applying (last
+wins):
+
+1. the top level of config/settings.yaml,
+2. the selected profile under `profiles:` (merged block by block),
+3. `.env`, then `.env.<profile>`, then the process environment.
+
+Environment keys are `PARABANK_<SETTING>` for top-level settings and
+`PARABANK_<BLOCK>__<SETTING>` inside a block, e.g. `PARABANK_PASSWORD` or
+`PARABANK_HTTP__READ_TIMEOUT=30`. Lists are comma-separated and mappings
+`key=value,...`. `PARABANK_PROFILE` selects the profile.
+
+Every problem (missing or unknown key, wrong type, bad value) is collected
+and raised as one SettingsError, so a broken configuration fails at startup
+instead of as a KeyError in the middle of a run. to_json()/from_json() hand
+the validated result to xdist workers without re-reading any file.
+"""
+import collections.abc
+import dataclasses
+import functools
+import json
+import os
+import types
+import typing
+from dataclasses import dataclass, field
+from pathlib import Path
+
+SETTINGS_FILE = "config/settings.yaml"
+ENV_FILE = ".env"
+ENV_PREFIX = "PARABANK_"
+PROFILE_ENV = "PARABANK_PROFILE"
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+
+class SettingsError(ValueError):
+    """Invalid settings; lists every problem found"""
+
+    def __init__(self, problems):
+        self.problems = list(problems)
+        super().__init__("Invalid settings:\n"
+                         + "\n".join(f"  - {p}" for p in self.problems))
+
+
+def _mapping():
+    return field(default_factory=lambda: types.MappingProxyType({}))
+
+
+@dataclass(frozen=True, slots=True)
+class HealthCheckSettings:
+    ttl_seconds: float = 300
+    timeout_seconds: float = 5
+
+
+@dataclass(frozen=True, slots=True)
+class HttpSettings:
+    pool_connections: int = 4
+    pool_maxsize: int = 16
+    pool_block: bool = False
+    connect_timeout: float = 3.05
+    read_timeout: float = 15
+    retries: int = 2
+    backoff_factor: float = 0.3
+    retry_statuses: tuple[int, ...] = (502, 503, 504)
+
+    def _problems(self):
+        if self.pool_maxsize < 1:
+            yield "pool_maxsize must be at least 1"
+        if self.retries < 0:
+            yield "retries must not be negative"
+
+
+@dataclass(frozen=True, slots=True)
+class ApiCacheSettings:
+    enabled: bool = True
+    ttl_seconds: float = 60
+    max_entries: int = 256
+
+
+@dataclass(frozen=True, slots=True)
+class ApiSchemasSettings:
+    strict: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class NetworkFilterSettings:
+    enabled: bool = False
+    resource_types: typing.Mapping[str, str] = _mapping()
+    block_url_patterns: tuple[str, ...] = ()
+    cache_dir: str | None = None
+    cache_ttl_seconds: float = 3600
+
+    def _problems(self):
+        for resource_type, action in self.resource_types.items():
+            if action not in ("abort", "cache"):
+                yield (f"resource_types.{resource_type}: {action!r} is not "
+                       f"'abort' or 'cache'")
+        if "cache" in self.resource_types.values() and not self.cache_dir:
+            yield "cache_dir is required for 'cache' rules"
+        if self.cache_ttl_seconds < 0:
+            yield "cache_ttl_seconds must be >= 0"
+
+
+@dataclass(frozen=True, slots=True)
+class LoadTestSettings:
+    duration_seconds: float = 30
+    concurrency: int = 8
+    rate: float | None = None
+    mix: typing.Mapping[str, int] = _mapping()
+    max_error_rate: float = 0.01
+    max_p99_ms: float = 2000
+
+    def _problems(self):
+        if any(weight < 0 for weight in self.mix.values()):
+            yield "mix weights must not be negative"
+        if self.concurrency < 1:
+            yield "concurrency must be at least 1"
+
+
+@dataclass(frozen=True, slots=True)
+class SoakTestSettings:
+    transfers: int = 2000
+    accounts: int = 6
+    concurrency: int = 8
+    max_amount: float = 25.0
+    seed: int | None = None
+    min_throughput: float = 0
+
+    def _problems(self):
+        if self.accounts < 2:
+            yield "accounts must be at least 2"
+        if self.max_amount < 0.01:
+            yield "max_amount must be at least 0.01"
+
+
+@dataclass(frozen=True, slots=True)
+class StandInSettings:
+    port: int = 0
+    ui_customer_id: int = 14432
+
+
+@dataclass(frozen=True, slots=True)
+class DataPoolSettings:
+    accounts_per_worker: int = 2
+    account_type: int = 0
+    # customer id -> account that funds new pool accounts
+    funding_accounts: typing.Mapping[str, int] = _mapping()
+
+
+@dataclass(frozen=True, slots=True)
+class ContextPoolSettings:
+    enabled: bool = False
+    size: int = 2
+    recycle_after: int = 25
+
+
+@dataclass(frozen=True, slots=True)
+class WaitPolicySettings:
+    history_file: str = ".cache/wait_timings.json"
+    default_ms: float = 5000
+    min_ms: float = 1000
+    max_ms: float = 15000
+    factor: float = 2.0
+    min_samples: int = 20
+
+    def _problems(self):
+        if self.min_ms > self.max_ms:
+            yield "min_ms must not exceed max_ms"
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """The whole configuration of a run"""
+    ui_base_url: str
+    api_base_url: str
+    overview_url: str
+    transfer_url: str
+    username: str
+    password: str
+    first_name: str
+    invalid_password: str
+    customer_id: int
+    invalid_account_id: int
+    new_account_type: int
+    profile: str | None = None
+    health_check: HealthCheckSettings = field(default_factory=HealthCheckSettings)
+    http: HttpSettings = field(default_factory=HttpSettings)
+    api_cache: ApiCacheSettings = field(default_factory=ApiCacheSettings)
+    api_schemas: ApiSchemasSettings = field(default_factory=ApiSchemasSettings)
+    network_filter: NetworkFilterSettings = field(
+        default_factory=NetworkFilterSettings)
+    load_test: LoadTestSettings = field(default_factory=LoadTestSettings)
+    soak_test: SoakTestSettings = field(default_factory=SoakTestSettings)
+    stand_in: StandInSettings | None = None
+    data_pool: DataPoolSettings = field(default_factory=DataPoolSettings)
+    context_pool: ContextPoolSettings = field(
+        default_factory=ContextPoolSettings)
+    wait_policy: WaitPolicySettings = field(default_factory=WaitPolicySettings)
+
+    @property
+    def base_url(self) -> str:
+        """UI base URL (the name the UI tests use)"""
+        return self.ui_base_url
+
+    def _problems(self):
+        for name in ("ui_base_url", "api_base_url", "overview_url",
+                     "transfer_url"):
+            if not getattr(self, name).startswith(("http://", "https://")):
+                yield f"{name}: {getattr(self, name)!r} is not an http(s) URL"
+
+    def replace(self, **changes) -> "Settings":
+        return dataclasses.replace(self, **changes)
+
+    def to_json(self) -> str:
+        return json.dumps(_dump(self), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text: str) -> "Settings":
+        return build(cls, json.loads(text))
+
+
+# -------- Building and validation --------
+
+@functools.cache
+def _hints(cls) -> dict:
+    return typing.get_type_hints(cls)
+
+
+def _dump(value):
+    if dataclasses.is_dataclass(value):
+        return {f.name: _dump(getattr(value, f.name))
+                for f in dataclasses.fields(value)}
+    if isinstance(value, collections.abc.Mapping):
+        return {k: _dump(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_dump(v) for v in value]
+    return value
+
+
+def _split(text: str) -> list:
+    return [part.strip() for part in text.split(",") if part.strip()]
+
+
+def _coerce(value, hint, path: str, problems: list):
+    """value converted to the annotated type, or a problem recorded"""
+    origin, args = typing.get_origin(hint), typing.get_args(hint)
+    if origin in (typing.Union, types.UnionType):
+        if value is None or (isinstance(value, str)
+                             and value.strip().lower() in ("", "null", "none")):
+            return None
+        hint = next(arg for arg in args if arg is not type(None))
+        origin, args = typing.get_origin(hint), typing.get_args(hint)
+
+    if dataclasses.is_dataclass(hint):
+        return build(hint, value, path, problems)
+    if origin is tuple:
+        if isinstance(value, str):
+            value = _split(value)
+        if not isinstance(value, (list, tuple)):
+            problems.append(f"{path}: expected a list, got {value!r}")
+            return None
+        return tuple(_coerce(v, args[0], f"{path}[{i}]", problems)
+                     for i, v in enumerate(value))
+    if origin in (collections.abc.Mapping, dict):
+        if isinstance(value, str):
+            pairs = [part.partition("=") for part in _split(value)]
+            value = {k.strip(): v.strip() for k, _, v in pairs}
+        if not isinstance(value, collections.abc.Mapping):
+            problems.append(f"{path}: expected a mapping, got {value!r}")
+            return None
+        return types.MappingProxyType(
+            {str(k): _coerce(v, args[1], f"{path}.{k}", problems)
+             for k, v in value.items()})
+
+    if value is None:
+        problems.append(f"{path}: missing value")
+        return None
+    if hint is bool:
+        if isinstance(value, str) and value.strip().lower() in _TRUE | _FALSE:
+            return value.strip().lower() in _TRUE
+        if isinstance(value, bool):
+            return value
+    elif hint in (int, float):
+        if isinstance(value, str):
+            try:
+                value = hint(value.strip())
+            except ValueError:
+                pass
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if hint is float:
+                return float(value)
+            if float(value).is_integer():
+                return int(value)
+    elif hint is str:
+        # YAML turns an unquoted 12345 password into an int
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            return str(value)
+    problems.append(f"{path}: expected {hint.__name__}, got {value!r}")
+    return None
+
+
+def build(cls, data, path: str = "", problems: list = None):
+    """Instantiate cls from plain data; raises SettingsError unless problems
+    is given, in which case they are appended to it"""
+    collect = problems is None
+    problems = [] if collect else problems
+    start = len(problems)
+    prefix = f"{path}." if path else ""
+    if not isinstance(data, collections.abc.Mapping):
+        problems.append(f"{path or 'settings'}: expected a mapping, "
+                        f"got {data!r}")
+        data = {}
+
+    hints = _hints(cls)
+    known = {f.name: f for f in dataclasses.fields(cls)}
+    for key in data:
+        if key not in known:
+            problems.append(f"{prefix}{key}: unknown setting")
+    values = {}
+    for name, f in known.items():
+        if data.get(name) is None:
+            required = (f.default is dataclasses.MISSING
+                        and f.default_factory is dataclasses.MISSING)
+            if required:
+                problems.append(
+                    f"{prefix}{name}: required (set it in {SETTINGS_FILE} or "
+                    f"as {ENV_PREFIX}{(prefix + name).replace('.', '__').upper()})")
+            elif name in data and f.default is None:
+                values[name] = None
+            continue
+        values[name] = _coerce(data[name], hints[name], prefix + name, problems)
+
+    result = None
+    # Cross-field checks only run on a block whose values are all valid
+    if len(problems) == start:
+        result = cls(**values)
+        problems.extend(f"{prefix}{p}"
+                        for p in getattr(result, "_problems", tuple)())
+    if collect and problems:
+        raise SettingsError(problems)
+    return result
+
+
+def _merge(base: dict, overrides: dict) -> dict:
+    """base updated with overrides, merging nested blocks key by key"""
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _env_overrides(env: typing.Mapping) -> dict:
+    """Nested settings data from PARABANK_* variables"""
+    overrides = {}
+    for key, value in env.items():
+        if not key.startswith(ENV_PREFIX) or key == PROFILE_ENV:
+            continue
+        *blocks, name = key[len(ENV_PREFIX):].lower().split("__")
+        target = overrides
+        for block in blocks:
+            target = target.setdefault(block, {})
+        target[name] = value
+    return overrides
+
+
+def read_settings(path: str = SETTINGS_FILE, profile: str = None,
+                  env: typing.Mapping = None) -> Settings:
+    """Parse and validate the settings file for a profile (uncached)"""
+    import yaml
+    from dotenv import dotenv_values
+
+    with open(path) as f:
+        data = yaml.safe_load(f) or {}
+    profiles = data.pop("profiles", None) or {}
+    if profile:
+        if profile not in profiles:
+            raise SettingsError([f"unknown profile {profile!r}; available: "
+                                 f"{', '.join(profiles)}"])
+        data = _merge(data, profiles[profile] or {})
+
+    environ = {}
+    for env_file in (ENV_FILE, f"{ENV_FILE}.{profile}" if profile else None):
+        if env_file and Path(env_file).is_file():
+            environ.update(dotenv_values(env_file))
+    environ.update(os.environ if env is None else env)
+    data = _merge(data, _env_overrides(environ))
+    data["profile"] = profile
+    return build(Settings, data)
+
+
+@functools.cache
+def load_settings(profile: str = None, path: str = SETTINGS_FILE) -> Settings:
+    """Settings for a profile, parsed once per process"""
+    return read_settings(path, profile)
+
+
+__all__ = ["Settings", "SettingsError", "load_settings", "read_settings",
+           "HealthCheckSettings", "HttpSettings", "ApiCacheSettings",
+           "ApiSchemasSettings",
+           "NetworkFilterSettings", "LoadTestSettings",
+           "SoakTestSettings", "StandInSettings",
+           "DataPoolSettings", "ContextPoolSettings", "WaitPolicySettings"]
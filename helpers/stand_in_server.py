@@ -0,0 +1,617 @@
+"""In-process stand-in for the ParaBank demo server.
+
+Implements the REST endpoints ParaBankAPIClient uses (under both
+services/bank and the services_proxy/bank path the web UI calls) and minimal
+login, overview, transfer and activity pages with the ids and classes the
+POM locators target. Data lives in memory, so every server (one per xdist
+worker) starts from the same seed.
+
+Run it standalone for load tests or manual checks:
+
+    python -m helpers.stand_in_server --port 8080
+"""
+import argparse
+import json
+import re
+import secrets
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from helpers.settings import (SETTINGS_FILE, SettingsError, StandInSettings,
+                              load_settings)
+
+ACCOUNT_TYPES = ("CHECKING", "SAVINGS", "LOAN")
+NEW_ACCOUNT_DEPOSIT = Decimal("100.00")
+MONTHS = ("January", "February", "March", "April", "May", "June", "July",
+          "August", "September", "October", "November", "December")
+
+
+class BankError(Exception):
+    """Request the real server answers with HTTP 400 and a text message"""
+
+
+@dataclass
+class Customer:
+    id: int
+    username: str
+    password: str
+    first_name: str
+    last_name: str
+
+    def to_json(self) -> dict:
+        return {"id": self.id, "firstName": self.first_name,
+                "lastName": self.last_name,
+                "address": {"street": "1 Main St", "city": "Springfield",
+                            "state": "IL", "zipCode": "62701"},
+                "phoneNumber": "555-0100", "ssn": "000-00-0000"}
+
+
+@dataclass
+class Account:
+    id: int
+    customer_id: int
+    type: str
+    balance: Decimal
+
+    def to_json(self) -> dict:
+        return {"id": self.id, "customerId": self.customer_id,
+                "type": self.type, "balance": float(self.balance)}
+
+
+@dataclass
+class Transaction:
+    id: int
+    account_id: int
+    type: str
+    amount: Decimal
+    description: str
+    date: datetime
+
+    def to_json(self) -> dict:
+        return {"id": self.id, "accountId": self.account_id,
+                "type": self.type,
+                "date": int(self.date.timestamp() * 1000),
+                "amount": float(self.amount),
+                "description": self.description}
+
+
+class Bank:
+    """Thread-safe in-memory ParaBank data"""
+
+    def __init__(self, first_account_id: int = 13000):
+        self.customers = {}
+        self.accounts = {}
+        self.transactions = {}
+        self._next_account_id = first_account_id
+        self._next_transaction_id = 1
+        self._lock = threading.RLock()
+
+    def add_customer(self, customer: Customer, balances=()):
+        """Register a customer with one account per opening balance"""
+        with self._lock:
+            self.customers[customer.id] = customer
+            for i, balance in enumerate(balances):
+                account = self._open_account(
+                    customer.id, ACCOUNT_TYPES[i % 2], Decimal(balance))
+                self._record(account.id, "Credit", account.balance,
+                             "Funds Transfer Received")
+        return customer
+
+    def find_customer(self, username: str, password: str):
+        for customer in self.customers.values():
+            if customer.username == username and customer.password == password:
+                return customer
+        return None
+
+    def customer(self, customer_id: int) -> Customer:
+        try:
+            return self.customers[customer_id]
+        except KeyError:
+            raise BankError(f"Could not find customer #{customer_id}")
+
+    def account(self, account_id: int) -> Account:
+        try:
+            return self.accounts[account_id]
+        except KeyError:
+            raise BankError(f"Could not find account #{account_id}")
+
+    def accounts_of(self, customer_id: int) -> list:
+        self.customer(customer_id)
+        with self._lock:
+            return [a for a in self.accounts.values()
+                    if a.customer_id == customer_id]
+
+    def create_account(self, customer_id: int, account_type: int,
+                       from_account_id: int) -> Account:
+        with self._lock:
+            self.customer(customer_id)
+            source = self.account(from_account_id)
+            if not 0 <= account_type < len(ACCOUNT_TYPES):
+                raise BankError(f"Unknown account type {account_type}")
+            account = self._open_account(
+                customer_id, ACCOUNT_TYPES[account_type], NEW_ACCOUNT_DEPOSIT)
+            source.balance -= NEW_ACCOUNT_DEPOSIT
+            self._record(source.id, "Debit", NEW_ACCOUNT_DEPOSIT,
+                         "Funds Transfer Sent")
+            self._record(account.id, "Credit", NEW_ACCOUNT_DEPOSIT,
+                         "Funds Transfer Received")
+            return account
+
+    def transfer(self, amount: Decimal, from_account_id: int,
+                 to_account_id: int):
+        if amount <= 0:
+            raise BankError("Amount must be positive")
+        with self._lock:
+            source = self.account(from_account_id)
+            target = self.account(to_account_id)
+            source.balance -= amount
+            target.balance += amount
+            self._record(source.id, "Debit", amount, "Funds Transfer Sent")
+            self._record(target.id, "Credit", amount, "Funds Transfer Received")
+
+    def transactions_of(self, account_id: int, month: str = "All",
+                        transaction_type: str = "All") -> list:
+        self.account(account_id)
+        with self._lock:
+            rows = list(self.transactions.get(account_id, ()))
+        if month != "All":
+            rows = [t for t in rows if MONTHS[t.date.month - 1] == month]
+        if transaction_type != "All":
+            rows = [t for t in rows if t.type == transaction_type]
+        return rows
+
+    def _open_account(self, customer_id, account_type, balance) -> Account:
+        account = Account(self._next_account_id, customer_id, account_type,
+                          balance)
+        self.accounts[account.id] = account
+        self._next_account_id += 111
+        return account
+
+    def _record(self, account_id, transaction_type, amount, description):
+        transaction = Transaction(
+            self._next_transaction_id, account_id, transaction_type, amount,
+            description, datetime.now(timezone.utc))
+        self._next_transaction_id += 1
+        self.transactions.setdefault(account_id, []).append(transaction)
+
+
+# -------- HTML pages --------
+
+_PAGE = """<!DOCTYPE html>
+<html><head><title>ParaBank | {{title}}</title>
+<link rel="stylesheet" href="style.css"></head>
+<body>
+<div id="leftPanel">{{left}}</div>
+<div id="rightPanel">{{content}}</div>
+<script>
+const fmt = n => (n < 0 ? '-' : '') + '$' + Math.abs(n).toLocaleString(
+    'en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+const api = path => fetch('services_proxy/bank' + path,
+    {headers: {Accept: 'application/json'}}).then(r => r.json());
+</script>
+{{script}}
+</body></html>"""
+
+_LOGIN_FORM = """<h2>Customer Login</h2>
+<form name="login" method="post" action="login.htm">
+<div class="login"><input type="text" class="input" name="username"></div>
+<div class="login"><input type="password" class="input" name="password"></div>
+<div class="login"><input type="submit" class="button" value="Log In"></div>
+</form>"""
+
+_ACCOUNT_SERVICES = """<p class="smallText"><b>Welcome</b> {{name}}</p>
+<h2>Account Services</h2>
+<ul>
+<li><a href="overview.htm">Accounts Overview</a></li>
+<li><a href="transfer.htm">Transfer Funds</a></li>
+<li><a href="logout.htm">Log Out</a></li>
+</ul>"""
+
+_OVERVIEW = """<h1 class="title">Accounts Overview</h1>
+<table id="accountTable" class="table">
+<thead><tr><th>Account</th><th>Balance*</th><th>Available Amount</th></tr></thead>
+<tbody></tbody>
+</table>"""
+
+_OVERVIEW_JS = """<script>
+api('/customers/{{customer_id}}/accounts').then(accounts => {
+  let total = 0;
+  document.querySelector('#accountTable tbody').innerHTML = accounts.map(a => {
+    total += a.balance;
+    return `<tr><td><a href="activity.htm?id=${a.id}">${a.id}</a></td>` +
+           `<td>${fmt(a.balance)}</td><td>${fmt(Math.max(a.balance, 0))}</td></tr>`;
+  }).join('') + `<tr><td><b>Total</b></td><td><b>${fmt(total)}</b></td><td>&nbsp;</td></tr>`;
+});
+</script>"""
+
+_TRANSFER = """<div id="showForm">
+<h1 class="title">Transfer Funds</h1>
+<form id="transferForm">
+<p><b>Amount:</b> $<input id="amount" class="input" size="10"></p>
+<div>From account #<select id="fromAccountId" class="input"></select>
+to account #<select id="toAccountId" class="input"></select></div>
+<input type="submit" class="button" value="Transfer">
+</form>
+</div>
+<div id="showResult" style="display: none">
+<h1 class="title">Transfer Complete!</h1>
+<p><span id="amountResult"></span> has been transferred from account
+#<span id="fromAccountIdResult"></span> to account
+#<span id="toAccountIdResult"></span>.</p>
+</div>
+<div id="showError" style="display: none">
+<h1 class="title">Error!</h1>
+<p class="error">An internal error has occurred and has been logged.</p>
+</div>"""
+
+_TRANSFER_JS = """<script>
+const byId = id => document.getElementById(id);
+api('/customers/{{customer_id}}/accounts').then(accounts => {
+  const options = accounts.map(a => `<option value="${a.id}">${a.id}</option>`).join('');
+  byId('fromAccountId').innerHTML = options;
+  byId('toAccountId').innerHTML = options;
+});
+byId('transferForm').addEventListener('submit', event => {
+  event.preventDefault();
+  const amount = byId('amount').value;
+  const from = byId('fromAccountId').value, to = byId('toAccountId').value;
+  fetch(`services_proxy/bank/transfer?fromAccountId=${from}&toAccountId=${to}` +
+        `&amount=${encodeURIComponent(amount)}`, {method: 'POST'})
+    .then(r => {
+      if (!r.ok) throw new Error(r.status);
+      byId('amountResult').textContent = fmt(parseFloat(amount));
+      byId('fromAccountIdResult').textContent = from;
+      byId('toAccountIdResult').textContent = to;
+      byId('showForm').style.display = 'none';
+      byId('showResult').style.display = '';
+    })
+    .catch(() => { byId('showForm').style.display = 'none';
+                   byId('showError').style.display = ''; });
+});
+</script>"""
+
+_ACTIVITY = """<h1 class="title">Account Details</h1>
+<table>
+<tr><td>Account Number:</td><td id="accountId"></td></tr>
+<tr><td>Account Type:</td><td id="accountType"></td></tr>
+<tr><td>Balance:</td><td id="balance"></td></tr>
+<tr><td>Available:</td><td id="availableBalance"></td></tr>
+</table>
+<h1 class="title">Account Activity</h1>
+<form id="activityForm">
+Activity Period: <select id="month" class="input">{{month_options}}</select>
+Type: <select id="transactionType" class="input">
+<option value="All">All</option><option value="Credit">Credit</option>
+<option value="Debit">Debit</option></select>
+<input type="submit" class="button" value="Go">
+</form>
+<table id="transactionTable" class="table">
+<thead><tr><th>Date</th><th>Transaction</th><th>Debit (-)</th><th>Credit (+)</th></tr></thead>
+<tbody></tbody>
+</table>"""
+
+_ACTIVITY_JS = """<script>
+const accountId = {{account_id}};
+const pad = n => String(n).padStart(2, '0');
+api(`/accounts/${accountId}`).then(a => {
+  document.getElementById('accountId').textContent = a.id;
+  document.getElementById('accountType').textContent = a.type;
+  document.getElementById('balance').textContent = fmt(a.balance);
+  document.getElementById('availableBalance').textContent = fmt(Math.max(a.balance, 0));
+});
+function loadTransactions() {
+  const month = document.getElementById('month').value;
+  const type = document.getElementById('transactionType').value;
+  api(`/accounts/${accountId}/transactions/month/${month}/type/${type}`).then(rows => {
+    document.querySelector('#transactionTable tbody').innerHTML = rows.map(t => {
+      const d = new Date(t.date);
+      const date = `${pad(d.getMonth() + 1)}-${pad(d.getDate())}-${d.getFullYear()}`;
+      return `<tr><td>${date}</td>` +
+             `<td><a href="transaction.htm?id=${t.id}">${t.description}</a></td>` +
+             `<td>${t.type === 'Debit' ? fmt(t.amount) : ''}</td>` +
+             `<td>${t.type === 'Credit' ? fmt(t.amount) : ''}</td></tr>`;
+    }).join('');
+  });
+}
+document.getElementById('activityForm').addEventListener('submit', event => {
+  event.preventDefault();
+  loadTransactions();
+});
+loadTransactions();
+</script>"""
+
+_ERROR = """<h1 class="title">Error!</h1>
+<p class="error">{{message}}</p>"""
+
+_STYLE = "body { font-family: sans-serif; } .error { color: #c00; }\n"
+
+
+def _render(template: str, **values) -> str:
+    # Plain substitution: templates contain JS braces and "$" signs
+    for name, value in values.items():
+        template = template.replace("{{%s}}" % name, str(value))
+    return template
+
+
+# -------- HTTP handler --------
+
+_API_PREFIX = re.compile(r"^/parabank/services(?:_proxy)?/bank")
+_API_ROUTES = [
+    ("GET", re.compile(r"^/login/([^/]+)/([^/]+)$"), "api_login"),
+    ("GET", re.compile(r"^/customers/(\d+)/accounts$"), "api_customer_accounts"),
+    ("GET", re.compile(r"^/accounts/(\d+)$"), "api_account"),
+    ("GET", re.compile(r"^/accounts/(\d+)/transactions$"), "api_transactions"),
+    ("GET", re.compile(r"^/accounts/(\d+)/transactions/month/(\w+)/type/(\w+)$"),
+     "api_transactions"),
+    ("POST", re.compile(r"^/createAccount$"), "api_create_account"),
+    ("POST", re.compile(r"^/transfer$"), "api_transfer"),
+]
+_PAGE_ROUTES = {
+    ("GET", "/parabank"): "page_index",
+    ("GET", "/parabank/"): "page_index",
+    ("GET", "/parabank/index.htm"): "page_index",
+    ("POST", "/parabank/login.htm"): "page_login",
+    ("GET", "/parabank/logout.htm"): "page_logout",
+    ("GET", "/parabank/overview.htm"): "page_overview",
+    ("GET", "/parabank/transfer.htm"): "page_transfer",
+    ("GET", "/parabank/activity.htm"): "page_activity",
+    ("GET", "/parabank/style.css"): "page_style",
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ParaBankStandIn/1.0"
+    # Headers and body go out in separate writes; avoid the 40 ms delayed-ACK stall
+    disable_nagle_algorithm = True
+
+    @property
+    def bank(self) -> Bank:
+        return self.server.bank
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        self.query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        self.body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            api_match = _API_PREFIX.match(url.path)
+            if api_match:
+                path = url.path[api_match.end():]
+                for route_method, pattern, name in _API_ROUTES:
+                    match = pattern.match(path)
+                    if match and route_method == method:
+                        return getattr(self, name)(
+                            *(unquote(g) for g in match.groups()))
+            elif (method, url.path) in _PAGE_ROUTES:
+                return getattr(self, _PAGE_ROUTES[(method, url.path)])()
+            self._send(404, "text/plain", "Not Found")
+        except BankError as e:
+            self._send(400, "text/plain", str(e))
+        except (KeyError, ValueError, InvalidOperation) as e:
+            self._send(400, "text/plain", f"Invalid request: {e}")
+
+    def _send(self, status, content_type, body, headers=None):
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, payload):
+        self._send(200, "application/json", json.dumps(payload))
+
+    def _redirect(self, location, headers=None):
+        self._send(302, "text/plain", "", {"Location": location,
+                                           **(headers or {})})
+
+    # REST API
+
+    def api_login(self, username, password):
+        customer = self.bank.find_customer(username, password)
+        if customer is None:
+            raise BankError("Invalid username and/or password")
+        self._json(customer.to_json())
+
+    def api_customer_accounts(self, customer_id):
+        self._json([a.to_json() for a in self.bank.accounts_of(int(customer_id))])
+
+    def api_account(self, account_id):
+        self._json(self.bank.account(int(account_id)).to_json())
+
+    def api_transactions(self, account_id, month="All", transaction_type="All"):
+        self._json([t.to_json() for t in self.bank.transactions_of(
+            int(account_id), month, transaction_type)])
+
+    def api_create_account(self):
+        account = self.bank.create_account(
+            int(self.query["customerId"]), int(self.query["newAccountType"]),
+            int(self.query["fromAccountId"]))
+        self._json(account.to_json())
+
+    def api_transfer(self):
+        amount = Decimal(self.query["amount"])
+        from_id = int(self.query["fromAccountId"])
+        to_id = int(self.query["toAccountId"])
+        self.bank.transfer(amount, from_id, to_id)
+        self._send(200, "text/plain",
+                   f"Successfully transferred ${amount} from account "
+                   f"#{from_id} to account #{to_id}")
+
+    # Web pages
+
+    def _session_customer(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        token = cookie["JSESSIONID"].value if "JSESSIONID" in cookie else None
+        return self.server.sessions.get(token)
+
+    def _page(self, title, content, customer=None, script="", status=200,
+              headers=None):
+        if customer is None:
+            left = _LOGIN_FORM
+        else:
+            left = _render(_ACCOUNT_SERVICES, name=f"{customer.first_name} "
+                                                   f"{customer.last_name}")
+        self._send(status, "text/html; charset=utf-8",
+                   _render(_PAGE, title=title, left=left, content=content,
+                           script=script), headers)
+
+    def _logged_in_page(self, title, content, script):
+        customer = self._session_customer()
+        if customer is None:
+            return self._page("Error", _render(
+                _ERROR, message="An internal error has occurred and has been logged."))
+        self._page(title, content, customer, script)
+
+    def page_index(self):
+        self._page("Welcome | Online Banking", "<h1 class=\"title\">ParaBank</h1>",
+                   self._session_customer())
+
+    def page_login(self):
+        form = {k: v[0] for k, v in parse_qs(self.body.decode()).items()}
+        customer = self.bank.find_customer(form.get("username", ""),
+                                           form.get("password", ""))
+        if customer is None:
+            return self._page("Error", _render(
+                _ERROR, message="The username and password could not be verified."))
+        token = secrets.token_hex(16)
+        self.server.sessions[token] = customer
+        self._redirect("overview.htm", {
+            "Set-Cookie": f"JSESSIONID={token}; Path=/parabank; HttpOnly"})
+
+    def page_logout(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        if "JSESSIONID" in cookie:
+            self.server.sessions.pop(cookie["JSESSIONID"].value, None)
+        self._redirect("index.htm")
+
+    def page_overview(self):
+        customer = self._session_customer()
+        self._logged_in_page(
+            "Accounts Overview", _OVERVIEW,
+            _render(_OVERVIEW_JS, customer_id=customer.id if customer else 0))
+
+    def page_transfer(self):
+        customer = self._session_customer()
+        self._logged_in_page(
+            "Transfer Funds", _TRANSFER,
+            _render(_TRANSFER_JS, customer_id=customer.id if customer else 0))
+
+    def page_activity(self):
+        account = self.bank.account(int(self.query["id"]))
+        month_options = "".join(f'<option value="{m}">{m}</option>'
+                                for m in ("All",) + MONTHS)
+        self._logged_in_page(
+            "Account Activity",
+            _render(_ACTIVITY, month_options=month_options),
+            _render(_ACTIVITY_JS, account_id=account.id))
+
+    def page_style(self):
+        self._send(200, "text/css", _STYLE)
+
+
+# -------- Server --------
+
+class ParaBankStandIn:
+    """Threaded HTTP server serving a Bank on localhost"""
+
+    def __init__(self, bank: Bank, host: str = "127.0.0.1", port: int = 0):
+        self.bank = bank
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.bank = bank
+        self._server.sessions = {}
+        self._thread = None
+
+    @classmethod
+    def from_settings(cls, settings, **kwargs):
+        """Seed the API test customer and the UI login user from settings"""
+        stand_in = settings.stand_in or StandInSettings()
+        bank = Bank()
+        bank.add_customer(
+            Customer(settings.customer_id, "john", "demo", "John", "Smith"),
+            balances=("1000.00", "500.00"))
+        bank.add_customer(
+            Customer(stand_in.ui_customer_id, settings.username,
+                     settings.password, settings.first_name, "User"),
+            balances=("1000.00", "500.00"))
+        kwargs.setdefault("port", stand_in.port)
+        return cls(bank, **kwargs)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def settings_overrides(self) -> dict:
+        """URL settings pointing the suite at this server"""
+        base = f"{self.url}/parabank"
+        return {"ui_base_url": base,
+                "api_base_url": f"{base}/services/bank",
+                "overview_url": f"{base}/overview.htm",
+                "transfer_url": f"{base}/transfer.htm"}
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="parabank-stand-in",
+            daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve on the calling thread until interrupted"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--settings", default=SETTINGS_FILE)
+    args = parser.parse_args(argv)
+
+    try:
+        settings = load_settings(path=args.settings)
+    except SettingsError as e:
+        parser.error(str(e))
+    server = ParaBankStandIn.from_settings(settings, host=args.host,
+                                           port=args.port)
+    for name, url in server.settings_overrides().items():
+        print(f"{name}: {url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Append-only segment sink for Allure results.
+
+With `--allure-segments`, results, containers and attachments are not
+written as one small file each. Every process (each xdist worker, or the
+single pytest process) buffers them and appends batches to one segment file,
+ALLUREDIR/segments/<worker>-<pid>.seg. Attachments are stored once per
+content hash, so a repeated attachment costs one reference record.
+
+A segment is a sequence of records, each a JSON header line followed by
+`len` bytes of payload:
+
+    {"kind": "item", "name": "<uuid>-result.json", "len": 812}
+    {"kind": "blob", "hash": "<sha1>", "suffix": ".txt", "len": 96}
+    {"kind": "attach", "name": "<uuid>-attachment.txt", "hash": "<sha1>", "len": 0}
+
+A torn record at the end of a segment (killed worker) is ignored.
+Convert the segments into a standard allure-results directory in one pass
+per segment before `allure generate`:
+
+    python -m plugins.allure_segments convert allure-results
+
+Identical attachments become one file that every result references.
+"""
+import argparse
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+
+import allure_commons
+import pytest
+from allure_commons.logger import AllureFileLogger
+from attr import asdict
+
+SEGMENT_DIR = "segments"
+
+
+class SegmentWriter:
+    """Buffered appender of framed records to one segment file"""
+
+    def __init__(self, path: Path, batch_bytes: int = 1 << 20):
+        self.path = Path(path)
+        self.batch_bytes = batch_bytes
+        self._buffer = []
+        self._buffered = 0
+        self._hashes = set()
+
+    def _append(self, header: dict, payload: bytes = b""):
+        header["len"] = len(payload)
+        self._buffer.append(json.dumps(header, separators=(",", ":")).encode()
+                            + b"\n" + payload)
+        self._buffered += len(payload) + 64
+        if self._buffered >= self.batch_bytes:
+            self.flush()
+
+    def item(self, name: str, data: dict):
+        self._append({"kind": "item", "name": name},
+                     json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    def attachment(self, name: str, body: bytes):
+        digest = hashlib.sha1(body).hexdigest()
+        if digest not in self._hashes:
+            self._hashes.add(digest)
+            suffix = name.rsplit("-attachment", 1)[-1]
+            self._append({"kind": "blob", "hash": digest, "suffix": suffix},
+                         body)
+        self._append({"kind": "attach", "name": name, "hash": digest})
+
+    def flush(self):
+        if not self._buffer:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One write per batch; O_APPEND keeps each batch contiguous
+        with open(self.path, "ab") as f:
+            f.write(b"".join(self._buffer))
+        self._buffer.clear()
+        self._buffered = 0
+
+
+def read_segment(path: Path):
+    """Yield (header, payload) records; stops at a torn trailing record"""
+    with open(path, "rb") as f:
+        while True:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                return
+            try:
+                header = json.loads(line)
+            except ValueError:
+                return
+            payload = f.read(header["len"])
+            if len(payload) < header["len"]:
+                return
+            yield header, payload
+
+
+class AllureSegmentLogger:
+    """allure_commons reporter plugin writing to a SegmentWriter"""
+
+    def __init__(self, writer: SegmentWriter):
+        self.writer = writer
+
+    def _report_item(self, item):
+        name = item.file_pattern.format(prefix=uuid.uuid4())
+        self.writer.item(name, asdict(item, filter=lambda _, v: v or v is False))
+
+    @allure_commons.hookimpl
+    def report_result(self, result):
+        self._report_item(result)
+
+    @allure_commons.hookimpl
+    def report_container(self, container):
+        self._report_item(container)
+
+    @allure_commons.hookimpl
+    def report_globals(self, globals_item):
+        self._report_item(globals_item)
+
+    @allure_commons.hookimpl
+    def report_attached_file(self, source, file_name):
+        self.writer.attachment(file_name, Path(source).read_bytes())
+
+    @allure_commons.hookimpl
+    def report_attached_data(self, body, file_name):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.writer.attachment(file_name, body)
+
+
+def _rewrite_sources(node, names: dict):
+    """Point attachment sources of a result (and its steps) at deduped files"""
+    if isinstance(node, dict):
+        for attachment in node.get("attachments", ()):
+            attachment["source"] = names.get(attachment.get("source"),
+                                             attachment.get("source"))
+        for value in node.values():
+            if isinstance(value, (list, dict)):
+                _rewrite_sources(value, names)
+    elif isinstance(node, list):
+        for value in node:
+            _rewrite_sources(value, names)
+
+
+def convert_segment(segment: Path, out_dir: Path) -> dict:
+    """Write one segment as standard Allure files in a single pass.
+
+    Attachments are named by content hash, so a blob shared by several
+    results or segments is written once.
+    """
+    counts = {"items": 0, "attachments": 0, "files": 0}
+    blob_names = {}
+    names = {}
+    for header, payload in read_segment(segment):
+        kind = header["kind"]
+        if kind == "blob":
+            name = f"{header['hash']}-attachment{header['suffix']}"
+            blob_names[header["hash"]] = name
+            target = out_dir / name
+            if not target.exists():
+                target.write_bytes(payload)
+                counts["files"] += 1
+        elif kind == "attach":
+            counts["attachments"] += 1
+            names[header["name"]] = blob_names[header["hash"]]
+        elif kind == "item":
+            counts["items"] += 1
+            data = json.loads(payload)
+            _rewrite_sources(data, names)
+            (out_dir / header["name"]).write_text(
+                json.dumps(data, ensure_ascii=False), encoding="utf-8")
+            counts["files"] += 1
+    return counts
+
+
+def convert(results_dir: Path, out_dir: Path = None, keep: bool = False) -> dict:
+    """Convert every segment under results_dir into out_dir (default: same)"""
+    results_dir = Path(results_dir)
+    out_dir = Path(out_dir or results_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    totals = {"segments": 0, "items": 0, "attachments": 0, "files": 0}
+    for segment in sorted((results_dir / SEGMENT_DIR).glob("*.seg")):
+        counts = convert_segment(segment, out_dir)
+        totals["segments"] += 1
+        for key, value in counts.items():
+            totals[key] += value
+        if not keep:
+            segment.unlink()
+    return totals
+
+
+def pytest_addoption(parser):
+    parser.getgroup("reporting").addoption(
+        "--allure-segments", action="store_true", default=False,
+        help="write Allure results to append-only segment files under "
+             "--alluredir (convert with python -m plugins.allure_segments)")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    if config.getoption("allure_segments") and hasattr(config, "workerinput"):
+        # Only the controller cleans the results dir; a worker starting late
+        # would otherwise delete segments other workers already wrote
+        config.option.clean_alluredir = False
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionstart(session):
+    config = session.config
+    report_dir = config.option.allure_report_dir
+    if not (config.getoption("allure_segments") and report_dir):
+        return
+    # Swap allure-pytest's one-file-per-result logger for the segment sink
+    file_loggers = [p for p in allure_commons.plugin_manager.get_plugins()
+                    if isinstance(p, AllureFileLogger)]
+    for plugin in file_loggers:
+        allure_commons.plugin_manager.unregister(plugin)
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    writer = SegmentWriter(Path(report_dir).absolute() / SEGMENT_DIR
+                           / f"{worker}-{os.getpid()}.seg")
+    logger = AllureSegmentLogger(writer)
+    allure_commons.plugin_manager.register(logger)
+
+    def close():
+        writer.flush()
+        allure_commons.plugin_manager.unregister(logger)
+        # allure-pytest's own cleanup unregisters its logger by name
+        for plugin in file_loggers:
+            allure_commons.plugin_manager.register(plugin)
+    config.add_cleanup(close)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m plugins.allure_segments",
+        description="Convert Allure segment files to standard results")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("convert", help="segments -> allure-results files")
+    cmd.add_argument("results_dir", help="the --alluredir of the runs")
+    cmd.add_argument("--out", help="output directory (default: results_dir)")
+    cmd.add_argument("--keep", action="store_true",
+                     help="keep the segment files after converting")
+    args = parser.parse_args(argv)
+
+    totals = convert(args.results_dir, args.out, args.keep)
+    print(f"{totals['segments']} segments: {totals['items']} results and "
+          f"containers, {totals['attachments']} attachments, "
+          f"{totals['files']} files written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""Duration-aware xdist scheduling.
+
+    pytest -n 4 --dist-durations
+
+The default `load` scheduler hands out tests in collection order, so one
+slow transfer test picked up late leaves the other workers idle at the
+tail. This plugin keeps per-test durations and per-fixture setup costs in
+the pytest cache and plans the whole run up front with
+longest-processing-time-first packing: each test, longest first, goes to
+the worker where it would finish earliest, counting the setup of any
+session fixture (`browser`, `api_client`, `authenticated_session`, ...)
+that worker has not built yet. Tests sharing expensive session fixtures
+therefore stay together unless splitting them shortens the run.
+
+Workers measure session fixture setup and report it on the setup report;
+the controller stores the history and prints the predicted and actual
+makespan in the terminal summary. Tests without history are assumed to
+take the median known duration.
+"""
+import statistics
+import time
+
+import pytest
+
+try:
+    from xdist.scheduler import LoadScheduling
+except ImportError:  # xdist not installed: the option has nothing to drive
+    LoadScheduling = object
+
+HISTORY_KEY = "parabank/durations"
+DEFAULT_DURATION = 1.0
+# Weight of the newest observation in the moving averages
+SMOOTHING = 0.3
+
+
+def plan(tests: list, workers: int, fixture_costs: dict) -> tuple:
+    """Longest-processing-time-first assignment with fixture affinity.
+
+    tests is a list of (key, duration, fixtures). Returns (assignment,
+    loads): one list of keys and one predicted busy time per worker.
+    """
+    assignment = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    built = [set() for _ in range(workers)]
+    for key, duration, fixtures in sorted(tests, key=lambda t: -t[1]):
+        finish = [loads[w] + duration + sum(fixture_costs.get(f, 0.0)
+                                            for f in fixtures - built[w])
+                  for w in range(workers)]
+        best = min(range(workers), key=finish.__getitem__)
+        assignment[best].append(key)
+        loads[best] = finish[best]
+        built[best] |= fixtures
+    return assignment, loads
+
+
+def _average(old, new: float) -> float:
+    return new if old is None else old * (1 - SMOOTHING) + new * SMOOTHING
+
+
+class DurationScheduling(LoadScheduling):
+    """Sends every worker its planned share of the run at once"""
+
+    def __init__(self, config, log=None):
+        super().__init__(config, log)
+        self.predicted = {}
+        self.started = None
+        self.finished = {}
+
+    def schedule(self):
+        assert self.collection_is_completed
+        if self.collection is not None:
+            # A replacement worker joined: fall back to load balancing
+            for node in self.nodes:
+                self.check_schedule(node)
+            return
+        if not self._check_nodes_have_same_collection():
+            self.log("**Different tests collected, aborting run**")
+            return
+
+        self.collection = next(iter(self.node2collection.values()))
+        if not self.collection:
+            return
+        history = self.config.cache.get(HISTORY_KEY, {})
+        known = history.get("tests", {})
+        fallback = statistics.median(
+            [t["duration"] for t in known.values()] or [DEFAULT_DURATION])
+        tests = []
+        for index, nodeid in enumerate(self.collection):
+            entry = known.get(nodeid, {})
+            tests.append((index, entry.get("duration", fallback),
+                          frozenset(entry.get("fixtures", ()))))
+
+        nodes = self.nodes
+        assignment, loads = plan(tests, len(nodes),
+                                 history.get("fixtures", {}))
+        self.pending[:] = []
+        self.started = time.monotonic()
+        for node, indices, load in zip(nodes, assignment, loads):
+            # Collection order within a worker keeps pytest's fixture reuse
+            indices.sort()
+            self.predicted[node.gateway.id] = load
+            if indices:
+                self.node2pending[node].extend(indices)
+                node.send_runtest_some(indices)
+        for node in nodes:
+            node.shutdown()
+
+    def mark_test_complete(self, node, item_index, duration=0):
+        self.finished[node.gateway.id] = time.monotonic()
+        super().mark_test_complete(node, item_index, duration)
+
+    def summary_lines(self) -> list:
+        if self.started is None or not self.predicted:
+            return []
+        actual = {worker: end - self.started
+                  for worker, end in self.finished.items()}
+        lines = [f"predicted makespan {max(self.predicted.values()):.1f} s, "
+                 f"actual {max(actual.values(), default=0.0):.1f} s"]
+        for worker in sorted(self.predicted):
+            lines.append(f"  {worker}: predicted {self.predicted[worker]:.1f} s,"
+                         f" actual {actual.get(worker, 0.0):.1f} s")
+        return lines
+
+
+class FixtureSetupTimer:
+    """Worker side: times session fixture setup, excluding nested fixtures"""
+
+    def __init__(self):
+        self.costs = {}
+        self._stack = []
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        yield
+        elapsed = time.perf_counter() - start
+        nested = self._stack.pop()
+        if self._stack:
+            self._stack[-1] += elapsed
+        if fixturedef.scope == "session":
+            self.costs[fixturedef.argname] = elapsed - nested
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when == "setup":
+            report = outcome.get_result()
+            # Extra report attributes survive xdist serialization
+            report.session_fixture_setup = self.costs
+            report.session_fixtures = sorted(
+                name for name, defs in item._fixtureinfo.name2fixturedefs.items()
+                if defs and defs[-1].scope == "session")
+            self.costs = {}
+
+
+class DurationHistory:
+    """Controller side: records durations and plugs in the scheduler"""
+
+    def __init__(self, config):
+        self.config = config
+        self.history = config.cache.get(HISTORY_KEY, {})
+        self.history.setdefault("tests", {})
+        self.history.setdefault("fixtures", {})
+        self.scheduler = None
+        self._running = {}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if config.getoption("dist_durations"):
+            self.scheduler = DurationScheduling(config, log)
+            return self.scheduler
+        return None
+
+    def pytest_runtest_logreport(self, report):
+        setup_costs = getattr(report, "session_fixture_setup", {})
+        fixtures = self.history["fixtures"]
+        for name, cost in setup_costs.items():
+            fixtures[name] = _average(fixtures.get(name), cost)
+
+        entry = self._running.setdefault(report.nodeid, {"duration": 0.0})
+        # Setup time spent building session fixtures is accounted above
+        entry["duration"] += max(0.0, report.duration
+                                 - sum(setup_costs.values()))
+        if hasattr(report, "session_fixtures"):
+            entry["fixtures"] = report.session_fixtures
+        if report.when == "teardown":
+            entry = self._running.pop(report.nodeid)
+            tests = self.history["tests"]
+            old = tests.get(report.nodeid, {})
+            tests[report.nodeid] = {
+                "duration": round(_average(old.get("duration"),
+                                           entry["duration"]), 3),
+                "fixtures": entry.get("fixtures", old.get("fixtures", []))}
+
+    def pytest_sessionfinish(self, session):
+        self.config.cache.set(HISTORY_KEY, self.history)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        lines = self.scheduler.summary_lines() if self.scheduler else []
+        if lines:
+            terminalreporter.write_sep("-", "duration scheduling")
+            for line in lines:
+                terminalreporter.write_line(line)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--dist-durations", action="store_true", default=False,
+        help="with -n, plan the run from recorded test durations "
+             "(longest first, grouped by session fixtures)")
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(FixtureSetupTimer(), "fixture_setup_timer")
+    # History lives in the controller; single-process runs record it too,
+    # for the next parallel run. Nothing to keep it in with -p no:cacheprovider
+    if not hasattr(config, "workerinput") and hasattr(config, "cache"):
+        config.pluginmanager.register(DurationHistory(config),
+                                      "duration_history")
@@ -0,0 +1,337 @@
+"""Test impact selection: run only tests affected by changes since a git ref.
+
+    pytest --impacted-since origin/master
+
+Every collected test gets a dependency record built from static analysis:
+- files: the test module, the files of the project fixtures it uses, and
+  everything those import within the repo (transitively);
+- names: every project function/class name reachable from the test body
+  and its fixtures through a name-level call graph.
+
+A changed Python file selects a test when the test depends on the file and
+the diff touches module-level code or a def/class whose name the test can
+reach (e.g. only tests reaching ParaBankAPIClient.transfer_funds run when
+that method changes). Any other non-documentation change selects the whole
+suite. The map is stored in the pytest cache for other tools, and selected
+tests are ordered by historical failure rate, then duration, so likely
+failures report first.
+"""
+import ast
+import re
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+MAP_KEY = "parabank/impact/map"
+HISTORY_KEY = "parabank/impact/history"
+# Not .txt: requirements.txt changes must select everything
+DOC_SUFFIXES = {".md", ".rst"}
+_HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@", re.M)
+
+
+class SourceIndex:
+    """Per-file AST facts: imports and the names each def references"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._files = {}
+
+    def info(self, path: Path) -> dict:
+        path = Path(path).resolve()
+        if path not in self._files:
+            self._files[path] = self._analyse(path)
+        return self._files[path]
+
+    def _analyse(self, path: Path) -> dict:
+        try:
+            tree = ast.parse(path.read_text(), str(path))
+        except (OSError, SyntaxError):
+            return {"imports": set(), "defs": {}}
+        defs = {}
+        self._collect_defs(tree, "", defs)
+        return {"imports": self._imports(tree, path), "defs": defs}
+
+    def _collect_defs(self, node, prefix, defs):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef,
+                                  ast.ClassDef)):
+                qualname = f"{prefix}{child.name}"
+                start = min([child.lineno] + [d.lineno for d in
+                                              child.decorator_list])
+                defs[qualname] = {"lines": (start, child.end_lineno),
+                                  "refs": _referenced_names(child)}
+                if isinstance(child, ast.ClassDef):
+                    # Using a class reaches its body, not every method;
+                    # methods are reached by attribute name
+                    body = [n for n in child.body if not isinstance(
+                        n, (ast.FunctionDef, ast.AsyncFunctionDef))]
+                    defs[qualname]["refs"] = set().union(*(
+                        _referenced_names(n)
+                        for n in body + child.bases + child.decorator_list))
+                self._collect_defs(child, qualname + ".", defs)
+
+    def _imports(self, tree, path: Path) -> set:
+        files = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    files |= self._module_files(alias.name.split("."))
+            elif isinstance(node, ast.ImportFrom):
+                if node.level:
+                    base = path.parent
+                    for _ in range(node.level - 1):
+                        base = base.parent
+                    parts = list(base.relative_to(self.root).parts)
+                else:
+                    parts = []
+                parts += node.module.split(".") if node.module else []
+                files |= self._module_files(parts)
+                # "from pkg import module" imports a submodule
+                for alias in node.names:
+                    files |= self._module_files(parts + [alias.name])
+        return files
+
+    def _module_files(self, parts) -> set:
+        if not parts:
+            return set()
+        base = self.root.joinpath(*parts)
+        found = set()
+        for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+            if candidate.is_file():
+                found.add(candidate.resolve())
+        return found
+
+    def import_closure(self, files) -> set:
+        seen, todo = set(), [Path(f).resolve() for f in files]
+        while todo:
+            path = todo.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            todo.extend(self.info(path)["imports"] - seen)
+        return seen
+
+    def def_at(self, path: Path, qualname: str):
+        return self.info(path)["defs"].get(qualname)
+
+    def enclosing_def(self, path: Path, line: int):
+        """Innermost def/class containing line, or None for module level"""
+        best = None
+        for qualname, d in self.info(path)["defs"].items():
+            start, end = d["lines"]
+            if start <= line <= end and (best is None or
+                                          qualname.count(".") > best.count(".")):
+                best = qualname
+        return best
+
+
+def _referenced_names(node) -> set:
+    names = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name):
+            names.add(child.id)
+        elif isinstance(child, ast.Attribute):
+            names.add(child.attr)
+    return names
+
+
+def _git(root: Path, *args) -> str:
+    return subprocess.run(["git", *args], cwd=root, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def changed_files(root: Path, ref: str) -> list:
+    """Files changed since ref, including uncommitted and untracked sources.
+
+    Untracked files other than .py are left out: they are mostly run
+    artifacts (reports, results of an earlier step) and would otherwise
+    select the whole suite.
+    """
+    names = _git(root, "diff", "--name-only", ref).split()
+    names += [name for name in
+              _git(root, "ls-files", "--others", "--exclude-standard").split()
+              if name.endswith(".py")]
+    return sorted(set(names))
+
+
+def changed_lines(root: Path, ref: str, name: str) -> list:
+    """Line numbers in the current file touched by the diff against ref"""
+    lines = []
+    for start, count in _HUNK.findall(_git(root, "diff", "-U0", ref, "--", name)):
+        start, count = int(start), int(count or 1)
+        # Pure deletions (count 0) are attributed to the line they follow
+        lines.extend(range(start, start + count) if count else [max(start, 1)])
+    return lines
+
+
+class ImpactSelector:
+    def __init__(self, config, ref: str):
+        self.config = config
+        self.ref = ref
+        self.root = Path(str(config.rootpath)).resolve()
+        self.index = SourceIndex(self.root)
+
+    def _project_file(self, filename) -> Path:
+        path = Path(filename).resolve()
+        try:
+            relative = path.relative_to(self.root)
+        except ValueError:
+            return None
+        return None if relative.parts[0].startswith(".") else path
+
+    def dependencies(self, item) -> dict:
+        files, names = set(), set()
+        test_file = self._project_file(item.path)
+        if test_file:
+            files.add(test_file)
+        function = getattr(item, "function", None)
+        if function is not None and test_file:
+            d = self.index.def_at(test_file, function.__qualname__)
+            names |= d["refs"] if d else set()
+
+        fixtureinfo = getattr(item, "_fixtureinfo", None)
+        for name in getattr(item, "fixturenames", ()):
+            defs = fixtureinfo.name2fixturedefs.get(name) if fixtureinfo else None
+            if not defs:
+                continue
+            func = defs[-1].func
+            path = self._project_file(func.__code__.co_filename)
+            if path:
+                files.add(path)
+                d = self.index.def_at(path, func.__qualname__)
+                names |= (d["refs"] if d else set()) | {func.__name__}
+
+        files = self.index.import_closure(files)
+        return {"files": sorted(str(f) for f in files),
+                "names": sorted(self._name_closure(names, files)),
+                "fixtures": sorted(getattr(item, "fixturenames", ()))}
+
+    def _name_closure(self, names: set, files: set) -> set:
+        # Short name -> names referenced by every project def of that name
+        graph = defaultdict(set)
+        for path in files:
+            for qualname, d in self.index.info(path)["defs"].items():
+                parts = qualname.split(".")
+                # A constructor runs wherever its class is used
+                key = parts[-2] if parts[-1] == "__init__" and len(parts) > 1 \
+                    else parts[-1]
+                graph[key] |= d["refs"]
+        seen, todo = set(), list(names)
+        while todo:
+            name = todo.pop()
+            if name not in seen:
+                seen.add(name)
+                todo.extend(graph.get(name, ()))
+        return seen
+
+    def changes(self):
+        """(run_everything, {file: set of changed qualnames or None})"""
+        changed = {}
+        for name in changed_files(self.root, self.ref):
+            path = self.root / name
+            if path.suffix in DOC_SUFFIXES:
+                continue
+            if path.suffix != ".py":
+                return True, {}
+            if not path.exists():
+                return True, {}
+            symbols = set()
+            for line in changed_lines(self.root, self.ref, name) or [0]:
+                symbols.add(self.index.enclosing_def(path, line))
+            changed[path.resolve()] = symbols
+        return False, changed
+
+    @staticmethod
+    def is_affected(deps: dict, changed: dict) -> bool:
+        files, names = set(deps["files"]), set(deps["names"])
+        for path, symbols in changed.items():
+            if str(path) not in files:
+                continue
+            for symbol in symbols:
+                if symbol is None:
+                    return True
+                parts = symbol.split(".")
+                if parts[-1] in names:
+                    return True
+                # Constructor or class body changes hit users of the class
+                if len(parts) > 1 and parts[-1] == "__init__" \
+                        and parts[-2] in names:
+                    return True
+        return False
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("impact", "test impact selection")
+    group.addoption(
+        "--impacted-since", metavar="REF", default=None,
+        help="only run tests affected by files changed since git REF, "
+             "likely failures first")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(session, config, items):
+    ref = config.getoption("impacted_since")
+    selector = ImpactSelector(config, ref) if ref else None
+    if selector is None:
+        return
+
+    dependency_map = {item.nodeid: selector.dependencies(item)
+                      for item in items}
+    cache = getattr(config, "cache", None)
+    if cache is not None:
+        cache.set(MAP_KEY, dependency_map)
+
+    run_everything, changed = selector.changes()
+    if run_everything:
+        selected, deselected = list(items), []
+    else:
+        selected, deselected = [], []
+        for item in items:
+            (selected if selector.is_affected(dependency_map[item.nodeid],
+                                              changed)
+             else deselected).append(item)
+
+    history = cache.get(HISTORY_KEY, {}) if cache is not None else {}
+
+    def likely_failure_first(item):
+        h = history.get(item.nodeid, {})
+        failure_rate = h.get("failures", 0) / max(h.get("runs", 0), 1)
+        return (-failure_rate, h.get("duration", 0.0))
+
+    selected.sort(key=likely_failure_first)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+    items[:] = selected
+
+
+def pytest_configure(config):
+    # Record outcomes in the main process only; xdist workers forward reports
+    if not hasattr(config, "workerinput") and hasattr(config, "cache"):
+        config.pluginmanager.register(_HistoryRecorder(config),
+                                      "impact_history")
+
+
+class _HistoryRecorder:
+    def __init__(self, config):
+        self.config = config
+        self.history = None
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "call" and not (report.when == "setup"
+                                           and report.failed):
+            return
+        if self.history is None:
+            self.history = self.config.cache.get(HISTORY_KEY, {})
+        h = self.history.setdefault(report.nodeid, {"runs": 0, "failures": 0,
+                                                    "duration": 0.0})
+        h["runs"] += 1
+        h["failures"] += int(report.failed)
+        # Exponential moving average keeps recent durations weighted
+        h["duration"] = round(h["duration"] * 0.7 + report.duration * 0.3, 3) \
+            if h["runs"] > 1 else round(report.duration, 3)
+
+    def pytest_sessionfinish(self, session):
+        if self.history is not None:
+            self.config.cache.set(HISTORY_KEY, self.history)
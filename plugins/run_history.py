@@ -0,0 +1,364 @@
+"""Run history in SQLite, flake rates, adaptive reruns and quarantine.
+
+    pytest ui/ --adaptive-reruns 2 --adaptive-reruns-delay 1 --quarantine
+
+Every run appends one row per test to an indexed SQLite database
+(.pytest_cache/d/parabank/run-history.sqlite3 unless --run-history is
+given): final outcome, rerun count, duration of the final attempt, wall time
+spent on the attempts that were rerun (including the rerun delay) and a
+failure signature, the exception line with numbers and addresses
+normalized, so the same intermittent error groups across runs.
+
+A test's flake rate is computed over its last WINDOW recorded runs as
+
+    (runs that passed only after a rerun + failures the next run passed)
+    / runs
+
+so a test that keeps failing is broken, not flaky. Instead of rerunning
+every failure (`--reruns 2`), --adaptive-reruns N gives only tests with a
+flaky event in the window a pytest-rerunfailures `flaky(reruns=N)` marker;
+a new failure fails on its first attempt. With --quarantine, chronic flakes
+(at least QUARANTINE_MIN_RUNS runs and a rate of QUARANTINE_RATE or more)
+still run but are marked xfail(strict=False), so they stop failing the
+build while their history keeps accumulating; a test leaves quarantine when
+its rate drops below the threshold.
+
+The terminal summary lists this run's reruns and the wall time they cost;
+the history report covers the recorded window:
+
+    python -m plugins.run_history report --last 50
+"""
+import argparse
+import os
+import re
+import sqlite3
+import subprocess
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import pytest
+
+WINDOW = 20
+QUARANTINE_RATE = 0.3
+QUARANTINE_MIN_RUNS = 5
+QUARANTINE_REASON = "quarantined"
+DEFAULT_DB = Path(".pytest_cache", "d", "parabank", "run-history.sqlite3")
+
+FLAKY = "flaky"
+QUARANTINED = "quarantined"
+
+states_key = pytest.StashKey[dict]()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    revision TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    reruns INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    rerun_time REAL NOT NULL,
+    signature TEXT,
+    quarantined INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results(nodeid, session_id);
+CREATE INDEX IF NOT EXISTS results_by_session ON results(session_id);
+"""
+_NUMBERS = re.compile(r"0x[0-9a-fA-F]+|\d+(?:\.\d+)?")
+
+
+def failure_signature(report) -> str:
+    """Exception line of a failed report, numbers and addresses normalized"""
+    crash = getattr(report.longrepr, "reprcrash", None)
+    message = crash.message if crash is not None else str(report.longrepr)
+    first = message.strip().splitlines()[0] if message.strip() else ""
+    return _NUMBERS.sub("N", first)[:200]
+
+
+def flake_stats(runs: list) -> dict:
+    """Flake rate of (outcome, reruns) pairs, oldest first"""
+    events = 0
+    for i, (outcome, reruns) in enumerate(runs):
+        if outcome == "passed" and reruns:
+            events += 1
+        elif (outcome == "failed" and i + 1 < len(runs)
+              and runs[i + 1][0] == "passed"):
+            events += 1
+    return {"runs": len(runs), "events": events,
+            "rate": events / len(runs) if runs else 0.0}
+
+
+class RunHistory:
+    """The SQLite store: sessions and one result row per test and session"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def record(self, started: float, revision, results: list) -> int:
+        """Store one session's results in a single transaction"""
+        with self.db:
+            session_id = self.db.execute(
+                "INSERT INTO sessions (started, revision) VALUES (?, ?)",
+                (started, revision)).lastrowid
+            self.db.executemany(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(session_id, r["nodeid"], r["outcome"], r["reruns"],
+                  r["duration"], r["rerun_time"], r["signature"],
+                  int(r["quarantined"])) for r in results])
+        return session_id
+
+    def recent(self, window: int = WINDOW) -> dict:
+        """nodeid -> its last `window` (outcome, reruns), oldest first"""
+        rows = self.db.execute(
+            "SELECT nodeid, outcome, reruns FROM ("
+            "  SELECT nodeid, outcome, reruns, session_id, ROW_NUMBER() OVER"
+            "    (PARTITION BY nodeid ORDER BY session_id DESC) AS n"
+            "  FROM results WHERE outcome IN ('passed', 'failed'))"
+            " WHERE n <= ? ORDER BY nodeid, session_id", (window,))
+        runs = defaultdict(list)
+        for nodeid, outcome, reruns in rows:
+            runs[nodeid].append((outcome, reruns))
+        return runs
+
+    def flake_rates(self, window: int = WINDOW) -> dict:
+        """nodeid -> flake_stats() for tests with at least one flaky event"""
+        stats = {nodeid: flake_stats(runs)
+                 for nodeid, runs in self.recent(window).items()}
+        return {nodeid: s for nodeid, s in stats.items() if s["events"]}
+
+    def states(self, window: int = WINDOW) -> dict:
+        """nodeid -> (FLAKY or QUARANTINED, flake rate)"""
+        states = {}
+        for nodeid, s in self.flake_rates(window).items():
+            chronic = (s["runs"] >= QUARANTINE_MIN_RUNS
+                       and s["rate"] >= QUARANTINE_RATE)
+            states[nodeid] = (QUARANTINED if chronic else FLAKY, s["rate"])
+        return states
+
+    def waste(self, sessions: int = WINDOW) -> list:
+        """(nodeid, reruns, rerun seconds, last signature) over the last sessions"""
+        return self.db.execute(
+            "SELECT nodeid, SUM(reruns), SUM(rerun_time), MAX(signature)"
+            " FROM results WHERE reruns > 0 AND session_id IN"
+            "  (SELECT id FROM sessions ORDER BY id DESC LIMIT ?)"
+            " GROUP BY nodeid ORDER BY SUM(rerun_time) DESC",
+            (sessions,)).fetchall()
+
+
+def _revision():
+    if os.environ.get("GITHUB_SHA"):
+        return os.environ["GITHUB_SHA"]
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class _TestRun:
+    """Reports of one test across its attempts, as seen by the controller"""
+
+    def __init__(self):
+        self.starts = []
+        self.attempts = defaultdict(list)
+
+    def result(self, nodeid: str) -> dict:
+        final = max(self.attempts)
+        reports = self.attempts[final]
+        quarantined = any(getattr(r, "wasxfail", "").startswith(QUARANTINE_REASON)
+                          for r in reports)
+        if any(r.failed for r in reports) or (
+                quarantined and any(r.skipped for r in reports)):
+            outcome = "failed"  # a quarantined failure reports as xfailed
+        elif any(r.skipped for r in reports):
+            outcome = "skipped"
+        else:
+            outcome = "passed"
+        failures = [r for attempt in sorted(self.attempts)
+                    for r in self.attempts[attempt]
+                    if r.outcome in ("failed", "rerun") or (
+                        quarantined and r.when == "call" and r.skipped)]
+        if len(self.starts) > final:
+            # Wall clock, so the rerun delay counts as waste too
+            rerun_time = self.starts[final] - self.starts[0]
+        else:
+            rerun_time = sum(r.duration for attempt, rs in self.attempts.items()
+                             if attempt < final for r in rs)
+        return {"nodeid": nodeid, "outcome": outcome, "reruns": final,
+                "duration": round(sum(r.duration for r in reports), 3),
+                "rerun_time": round(rerun_time, 3),
+                "signature": failure_signature(failures[-1]) if failures else None,
+                "quarantined": quarantined}
+
+
+class HistoryRecorder:
+    """Controller side: collects the session's reports and stores them"""
+
+    def __init__(self, config, history: RunHistory, states: dict):
+        self.config = config
+        self.history = history
+        self.states = states
+        self.started = time.time()
+        self.tests = defaultdict(_TestRun)
+        self.results = []
+
+    def pytest_runtest_logstart(self, nodeid):
+        self.tests[nodeid].starts.append(time.monotonic())
+
+    def pytest_runtest_logreport(self, report):
+        # pytest-rerunfailures numbers the attempts; absent without reruns
+        self.tests[report.nodeid].attempts[getattr(report, "rerun", 0)] \
+            .append(report)
+
+    def pytest_sessionfinish(self, session):
+        self.results = [run.result(nodeid) for nodeid, run in self.tests.items()
+                        if run.attempts]
+        if self.results:
+            self.history.record(self.started, _revision(), self.results)
+        self.history.close()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        rerun = sorted((r for r in self.results if r["reruns"]),
+                       key=lambda r: -r["rerun_time"])
+        quarantined = [r for r in self.results if r["quarantined"]]
+        if not rerun and not quarantined:
+            return
+        terminalreporter.write_sep("-", "run history")
+        if rerun:
+            wasted = sum(r["rerun_time"] for r in rerun)
+            recovered = sum(r["outcome"] == "passed" for r in rerun)
+            terminalreporter.write_line(
+                f"{len(rerun)} test(s) rerun, {recovered} passed on a rerun, "
+                f"{wasted:.1f} s of wall time spent on reruns")
+            for r in rerun[:10]:
+                terminalreporter.write_line(
+                    f"  {r['rerun_time']:7.1f} s  {r['reruns']}x  "
+                    f"{r['outcome']:<7} {r['nodeid']}")
+        for r in quarantined:
+            rate = self.states.get(r["nodeid"], (None, 0.0))[1]
+            terminalreporter.write_line(
+                f"quarantined ({rate:.0%} flaky): {r['outcome']:<7} "
+                f"{r['nodeid']}")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("run history", "run history and flaky tests")
+    group.addoption(
+        "--run-history", metavar="PATH", default=None,
+        help=f"SQLite run history (default: {DEFAULT_DB.as_posix()})")
+    group.addoption(
+        "--adaptive-reruns", metavar="N", type=int, default=0,
+        help="rerun failures up to N times, only for tests with a flaky "
+             f"history in their last {WINDOW} runs")
+    group.addoption(
+        "--adaptive-reruns-delay", metavar="SECONDS", type=float, default=0.0,
+        help="delay between adaptive reruns")
+    group.addoption(
+        "--quarantine", action="store_true", default=False,
+        help=f"run chronically flaky tests (flake rate >= "
+             f"{QUARANTINE_RATE:.0%}) as non-strict xfail")
+
+
+def pytest_configure(config):
+    states = getattr(config, "workerinput", {}).get("run_history_states")
+    if states is not None:
+        config.stash[states_key] = {k: tuple(v) for k, v in states.items()}
+        return
+    path = config.getoption("run_history")
+    if path is None:
+        # Nothing to keep it in with -p no:cacheprovider
+        if not hasattr(config, "cache"):
+            config.stash[states_key] = {}
+            return
+        path = config.cache.mkdir("parabank") / DEFAULT_DB.name
+    if config.getoption("adaptive_reruns") and \
+            not config.pluginmanager.hasplugin("rerunfailures"):
+        raise pytest.UsageError(
+            "--adaptive-reruns needs pytest-rerunfailures")
+    history = RunHistory(path)
+    states = history.states() if (config.getoption("adaptive_reruns")
+                                  or config.getoption("quarantine")) else {}
+    config.stash[states_key] = states
+    config.pluginmanager.register(HistoryRecorder(config, history, states),
+                                  "run_history_recorder")
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """Workers mark tests from the controller's view of the history"""
+    node.workerinput["run_history_states"] = node.config.stash[states_key]
+
+
+def pytest_collection_modifyitems(config, items):
+    states = config.stash[states_key]
+    if not states:
+        return
+    reruns = config.getoption("adaptive_reruns")
+    quarantine = config.getoption("quarantine")
+    for item in items:
+        state, rate = states.get(item.nodeid, (None, 0.0))
+        if state == QUARANTINED and quarantine:
+            item.add_marker(pytest.mark.xfail(
+                strict=False, reason=f"{QUARANTINE_REASON}: {rate:.0%} of its "
+                                     f"last {WINDOW} runs were flaky"))
+        elif state is not None and reruns and \
+                item.get_closest_marker("flaky") is None:
+            item.add_marker(pytest.mark.flaky(
+                reruns=reruns,
+                reruns_delay=config.getoption("adaptive_reruns_delay")))
+
+
+def report(history: RunHistory, window: int) -> str:
+    lines = [f"flaky tests over the last {window} runs:"]
+    states = history.states(window)
+    rates = history.flake_rates(window)
+    for nodeid, s in sorted(rates.items(), key=lambda kv: -kv[1]["rate"]):
+        lines.append(f"  {s['rate']:5.0%}  {s['events']}/{s['runs']} runs  "
+                     f"{states[nodeid][0]:<11} {nodeid}")
+    if not rates:
+        lines.append("  none")
+    waste = history.waste(window)
+    total = sum(seconds for _, _, seconds, _ in waste)
+    lines.append(f"rerun wall time over the last {window} sessions: "
+                 f"{total:.1f} s in {sum(n for _, n, _, _ in waste)} reruns")
+    for nodeid, reruns, seconds, signature in waste:
+        lines.append(f"  {seconds:7.1f} s  {reruns}x  {nodeid}")
+        if signature:
+            lines.append(f"             {signature}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m plugins.run_history",
+        description="Flake rates and rerun cost from the run history")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmd = sub.add_parser("report", help="flaky tests and rerun wall time")
+    cmd.add_argument("--db", default=DEFAULT_DB,
+                     help=f"history database (default: {DEFAULT_DB.as_posix()})")
+    cmd.add_argument("--last", type=int, default=WINDOW,
+                     help=f"runs per test / sessions to cover (default: {WINDOW})")
+    args = parser.parse_args(argv)
+
+    if not Path(args.db).exists():
+        parser.error(f"no run history at {args.db}")
+    history = RunHistory(args.db)
+    try:
+        print(report(history, args.last))
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""Per-step timing for allure steps, POM methods and API calls.
+
+Enable with `--step-timings DIR`. Every allure.step, public POM method and
+ParaBankAPIClient call is timed with a monotonic clock (generator methods
+such as iter_transactions until exhausted) and appended as one
+JSON line per record to DIR/<run id>-<worker>.jsonl. Each test also gets a
+"Step timings" attachment in the Allure report.
+
+Aggregate p50/p95/p99 per step across any number of runs with:
+
+    python -m plugins.step_timing report DIR [--kind step] [--top 30]
+"""
+import argparse
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+import allure
+import allure_commons
+import pytest
+
+# (module, class) pairs, instrumented after collection if the collected
+# tests imported them, so the plugin never pulls Playwright into API-only runs
+INSTRUMENTED = {
+    "pom": (("ui.pages.login_page", "LoginPage"),
+            ("ui.pages.accounts_page", "AccountsOverviewPage"),
+            ("ui.pages.account_details_page", "AccountDetailsPage"),
+            ("ui.pages.transfer_page", "TransferFundsPage")),
+    "api": (("api.api_client", "ParaBankAPIClient"),),
+}
+
+
+class StepTimer:
+    """Collects timing records for the running test and writes them out"""
+
+    def __init__(self, out_file: Path, run_id: str, worker: str):
+        self.out_file = Path(out_file)
+        self.run_id = run_id
+        self.worker = worker
+        self.test_id = None
+        self.records = []
+        self._open_steps = {}
+        self._lock = threading.Lock()
+
+    def add(self, kind: str, name: str, seconds: float):
+        with self._lock:
+            self.records.append({
+                "run": self.run_id, "worker": self.worker,
+                "test": self.test_id, "kind": kind, "name": name,
+                "ms": round(seconds * 1000, 3)})
+
+    # allure_commons hooks: allure.step enter/exit
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self._open_steps[uuid] = (title, time.perf_counter())
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        title, start = self._open_steps.pop(uuid, (None, None))
+        if title is not None:
+            self.add("step", title, time.perf_counter() - start)
+
+    def test_records(self, test_id: str) -> list:
+        return [r for r in self.records if r["test"] == test_id]
+
+    def flush(self):
+        """Append buffered records to the run file"""
+        with self._lock:
+            records, self.records = self.records, []
+        if not records:
+            return
+        self.out_file.parent.mkdir(parents=True, exist_ok=True)
+        with self.out_file.open("a") as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+def _timed(timer: StepTimer, kind: str, name: str, func):
+    if inspect.isgeneratorfunction(func):
+        # Creating a generator does no work: time it until it is exhausted
+        # or closed (this includes the consumer's time between items)
+        @functools.wraps(func)
+        def generator_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return (yield from func(*args, **kwargs))
+            finally:
+                timer.add(kind, name, time.perf_counter() - start)
+        return generator_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timer.add(kind, name, time.perf_counter() - start)
+    return wrapper
+
+
+def instrument(timer: StepTimer) -> list:
+    """Wrap public methods of the imported POM classes and the API client.
+
+    Returns (class, name, original) tuples for uninstrument().
+    """
+    patched = []
+    for kind, classes in INSTRUMENTED.items():
+        for module, class_name in classes:
+            if module not in sys.modules:
+                continue
+            cls = getattr(sys.modules[module], class_name)
+            for name, func in inspect.getmembers(cls, inspect.isfunction):
+                if name.startswith("_"):
+                    continue
+                setattr(cls, name,
+                        _timed(timer, kind, f"{cls.__name__}.{name}", func))
+                patched.append((cls, name, func))
+    return patched
+
+
+def uninstrument(patched: list):
+    for cls, name, func in patched:
+        setattr(cls, name, func)
+
+
+def format_summary(records: list) -> str:
+    """Text table of one test's records, slowest first"""
+    lines = [f"{'ms':>10}  {'kind':<5} name"]
+    for r in sorted(records, key=lambda r: r["ms"], reverse=True):
+        lines.append(f"{r['ms']:>10.1f}  {r['kind']:<5} {r['name']}")
+    return "\n".join(lines)
+
+
+class StepTimingPlugin:
+    def __init__(self, timer: StepTimer):
+        self.timer = timer
+        self._patched = []
+
+    def pytest_sessionstart(self, session):
+        allure_commons.plugin_manager.register(self.timer)
+
+    def pytest_collection_finish(self, session):
+        self._patched = instrument(self.timer)
+
+    def pytest_sessionfinish(self, session):
+        uninstrument(self._patched)
+        allure_commons.plugin_manager.unregister(self.timer)
+        self.timer.flush()
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self.timer.test_id = item.nodeid
+
+    def pytest_runtest_makereport(self, item, call):
+        if call.when != "teardown":
+            return
+        records = self.timer.test_records(item.nodeid)
+        if records:
+            # The Allure test result is still open until logfinish
+            allure.attach(format_summary(records), name="Step timings",
+                          attachment_type=allure.attachment_type.TEXT)
+        self.timer.flush()
+        self.timer.test_id = None
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--step-timings", metavar="DIR", default=None,
+        help="record per-step durations as JSON Lines under DIR")
+
+
+def pytest_configure(config):
+    out_dir = config.getoption("step_timings")
+    if not out_dir:
+        return
+    # xdist hands every worker the same run id; single-process runs make one
+    run_id = os.environ.get("PYTEST_XDIST_TESTRUNUID") or uuid.uuid4().hex
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    timer = StepTimer(Path(out_dir) / f"{run_id[:12]}-{worker}.jsonl",
+                      run_id, worker)
+    config.pluginmanager.register(StepTimingPlugin(timer), "step_timing")
+
+
+# -------- report CLI --------
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def load_records(paths):
+    for path in paths:
+        path = Path(path)
+        files = sorted(path.glob("*.jsonl")) if path.is_dir() else [path]
+        for file in files:
+            with file.open() as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+
+def aggregate(records, kind: str = None) -> list:
+    """(kind, name, count, p50, p95, p99, total) rows, by total time"""
+    durations = defaultdict(list)
+    for r in records:
+        if kind is None or r["kind"] == kind:
+            durations[(r["kind"], r["name"])].append(r["ms"])
+    rows = []
+    for (k, name), values in durations.items():
+        values.sort()
+        rows.append((k, name, len(values), percentile(values, 50),
+                     percentile(values, 95), percentile(values, 99),
+                     sum(values)))
+    return sorted(rows, key=lambda row: row[-1], reverse=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m plugins.step_timing",
+        description="Aggregate recorded step timings")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="p50/p95/p99 per step")
+    report.add_argument("paths", nargs="+",
+                        help="timing files or directories of *.jsonl")
+    report.add_argument("--kind", choices=("step", "pom", "api"))
+    report.add_argument("--top", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    rows = aggregate(load_records(args.paths), args.kind)
+    print(f"{'kind':<5} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'total s':>9}  name")
+    for kind, name, count, p50, p95, p99, total in rows[:args.top]:
+        print(f"{kind:<5} {count:>6} {p50:>9.1f} {p95:>9.1f} {p99:>9.1f} "
+              f"{total / 1000:>9.2f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
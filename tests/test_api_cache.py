@@ -0,0 +1,105 @@
+import time
+
+import requests
+
+from api.api_client import ParaBankAPIClient
+from api.cache import ResponseCache
+
+
+def _response(status: int = 200, body: bytes = b"[]", etag: str = None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body
+    if etag:
+        response.headers["ETag"] = etag
+    return response
+
+
+class _Session:
+    """Stands in for requests.Session; on_post / on_get run mid-request"""
+
+    def __init__(self):
+        self.balance = 100
+        self.on_post = None
+        self.on_get = None
+        self.etag = None
+
+    def request(self, method, url, **kwargs):
+        if method == "POST":
+            if self.on_post is not None:
+                self.on_post()
+            self.balance -= 10
+            return _response()
+        if self.etag and kwargs["headers"].get("If-None-Match") == self.etag:
+            response = _response(304, b"")
+        else:
+            response = _response(body=str(self.balance).encode(),
+                                 etag=self.etag)
+        # Runs after the server answered, before the client has the response
+        if self.on_get is not None:
+            self.on_get()
+        return response
+
+
+class TestResponseCache:
+    """TTL expiry and write invalidation"""
+
+    def test_expired_entry_without_etag_is_dropped_on_lookup(self):
+        cache = ResponseCache(ttl=0)
+        cache.put("/accounts/1", _response())
+        time.sleep(0.001)
+        assert cache.lookup("/accounts/1") is None
+        assert cache.stats()["entries"] == 0
+
+    def test_expired_entry_with_etag_is_kept_for_revalidation(self):
+        cache = ResponseCache(ttl=0)
+        cache.put("/accounts/1", _response(etag='"v1"'))
+        time.sleep(0.001)
+        entry = cache.lookup("/accounts/1")
+        assert entry is not None and not entry.fresh
+        assert entry.etag == '"v1"'
+
+    def test_get_during_transfer_does_not_leave_stale_balance(self):
+        session = _Session()
+        client = ParaBankAPIClient("http://sut", session=session,
+                                   cache=ResponseCache(ttl=60))
+        # A concurrent reader caches the balance while the POST is in flight
+        session.on_post = lambda: client.get_account_details(1)
+
+        client.transfer_funds(10, 1, 2)
+        session.on_post = None
+        assert client.get_account_details(1).text == "90"
+
+    def test_get_started_before_write_is_not_cached(self):
+        cache = ResponseCache(ttl=60)
+        generation = cache.generation()
+        cache.invalidate("/accounts/1")
+        cache.put("/accounts/1", _response(), generation)
+        cache.invalidate_prefix("/customers/")
+        cache.put("/customers/7/accounts", _response(), generation)
+        assert cache.stats()["entries"] == 0
+
+        cache.put("/accounts/1", _response(), cache.generation())
+        assert cache.stats()["entries"] == 1
+
+    def test_slow_get_finishing_after_transfer_is_not_cached(self):
+        session = _Session()
+        client = ParaBankAPIClient("http://sut", session=session,
+                                   cache=ResponseCache(ttl=60))
+        # The GET reads the old balance, then the transfer runs and returns
+        # before the GET's response is stored
+        session.on_get = lambda: (setattr(session, "on_get", None),
+                                  client.transfer_funds(10, 1, 2))
+        assert client.get_account_details(1).text == "100"
+        assert client.get_account_details(1).text == "90"
+
+    def test_not_modified_after_concurrent_invalidation(self):
+        session = _Session()
+        session.etag = '"v1"'
+        client = ParaBankAPIClient("http://sut", session=session,
+                                   cache=ResponseCache(ttl=0))
+        client.get_account_details(1)
+        time.sleep(0.001)
+        # A write drops the entry while the revalidating GET is in flight
+        session.on_get = lambda: client.cache.invalidate("/accounts/1")
+        assert client.get_account_details(1).text == "100"
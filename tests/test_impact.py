@@ -0,0 +1,71 @@
+import subprocess
+from types import SimpleNamespace
+
+from plugins.impact import ImpactSelector, changed_files
+
+
+def _git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True)
+
+
+class TestImpactChanges:
+    """Which changes since a ref make --impacted-since select everything"""
+
+    def _repo(self, tmp_path):
+        _git(tmp_path, "init", "-q")
+        _git(tmp_path, "config", "user.email", "ci@example.com")
+        _git(tmp_path, "config", "user.name", "ci")
+        (tmp_path / "client.py").write_text(
+            "def transfer_funds():\n    return 1\n\n\n"
+            "def login():\n    return 2\n")
+        _git(tmp_path, "add", "client.py")
+        _git(tmp_path, "commit", "-q", "-m", "base")
+        return tmp_path
+
+    def test_untracked_artifacts_do_not_force_full_run(self, tmp_path):
+        root = self._repo(tmp_path)
+        (root / "client.py").write_text(
+            "def transfer_funds():\n    return 3\n\n\n"
+            "def login():\n    return 2\n")
+        (root / "allure-results").mkdir()
+        (root / "allure-results" / "1-result.json").write_text("{}")
+        (root / "reports").mkdir()
+        (root / "reports" / "ui-report.html").write_text("<html/>")
+
+        assert changed_files(root, "HEAD") == ["client.py"]
+        selector = ImpactSelector(SimpleNamespace(rootpath=root), "HEAD")
+        run_everything, changed = selector.changes()
+        assert not run_everything
+        assert changed == {(root / "client.py").resolve(): {"transfer_funds"}}
+
+    def test_untracked_source_counts_as_changed(self, tmp_path):
+        root = self._repo(tmp_path)
+        (root / "helper.py").write_text("def new():\n    pass\n")
+
+        assert changed_files(root, "HEAD") == ["helper.py"]
+
+    def test_tracked_non_python_change_runs_everything(self, tmp_path):
+        root = self._repo(tmp_path)
+        (root / "settings.yaml").write_text("a: 1\n")
+        _git(root, "add", "settings.yaml")
+
+        selector = ImpactSelector(SimpleNamespace(rootpath=root), "HEAD")
+        assert selector.changes() == (True, {})
+
+    def test_dependency_bump_runs_everything(self, tmp_path):
+        root = self._repo(tmp_path)
+        (root / "requirements.txt").write_text("requests\n")
+        _git(root, "add", "requirements.txt")
+        _git(root, "commit", "-q", "-m", "deps")
+        (root / "requirements.txt").write_text("requests==2.32.0\n")
+
+        selector = ImpactSelector(SimpleNamespace(rootpath=root), "HEAD")
+        assert selector.changes() == (True, {})
+
+    def test_docs_change_selects_nothing(self, tmp_path):
+        root = self._repo(tmp_path)
+        (root / "README.md").write_text("# docs\n")
+        _git(root, "add", "README.md")
+
+        selector = ImpactSelector(SimpleNamespace(rootpath=root), "HEAD")
+        assert selector.changes() == (False, {})
@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+import pytest
+
+from helpers.convert_currency import to_amount
+from helpers.money import parse_amounts, to_decimal
+
+
+class TestMoneyParsing:
+    """Amount strings as ParaBank renders them"""
+
+    @pytest.mark.parametrize("text, expected", [
+        (".50", Decimal("0.50")),
+        ("$.50", Decimal("0.50")),
+        ("-$.50", Decimal("-0.50")),
+        ("($.50)", Decimal("-0.50")),
+        ("$1,234.56", Decimal("1234.56")),
+        ("+5", Decimal("5")),
+        ("+$5.00", Decimal("5.00")),
+    ])
+    def test_to_decimal(self, text, expected):
+        assert to_decimal(text) == expected
+
+    def test_to_amount_accepts_leading_dot(self):
+        assert to_amount(".50") == 0.5
+        assert to_amount("$.50") == 0.5
+
+    @pytest.mark.parametrize("text, expected", [
+        ("$1,234.56\n", 1234.56),
+        (" $1,234.56\xa0", 1234.56),
+        ("+5", 5.0),
+    ])
+    def test_to_amount_accepts_what_float_parsing_did(self, text, expected):
+        assert to_amount(text) == expected
+
+    def test_parse_amounts_accepts_leading_dot(self):
+        assert parse_amounts(["$.50", "-$1.00"]) == [Decimal("0.50"),
+                                                   Decimal("-1.00")]
+
+    @pytest.mark.parametrize("text", [".", "$.", "$", "1.2.3", "1,23",
+                                      "+-5", "-$+5"])
+    def test_rejects_non_amounts(self, text):
+        with pytest.raises(ValueError):
+            to_decimal(text)
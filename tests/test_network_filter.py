@@ -0,0 +1,74 @@
+import json
+import time
+
+from helpers.network_filter import NetworkFilter
+
+
+class _Response:
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self._body = body
+        self.headers = headers or {}
+
+    def body(self):
+        return self._body
+
+
+class _Request:
+    url = "https://sut/parabank/style.css"
+    method = "GET"
+    resource_type = "stylesheet"
+    headers = {"accept": "text/css"}
+
+
+class _Route:
+    """Stands in for a Playwright Route; server() answers route.fetch()"""
+
+    def __init__(self, server):
+        self.request = _Request()
+        self.server = server
+        self.fetched_with = None
+        self.fulfilled = None
+
+    def fetch(self, headers=None):
+        self.fetched_with = headers
+        return self.server(headers)
+
+    def fulfill(self, status, headers, body):
+        self.fulfilled = (status, body)
+
+
+def _css(version):
+    return lambda headers: (
+        _Response(304) if headers.get("if-none-match") == f'"{version}"'
+        else _Response(200, f"/* {version} */".encode(),
+                       {"etag": f'"{version}"'}))
+
+
+class TestStylesheetCache:
+    """Cached stylesheets expire and are revalidated"""
+
+    def test_fresh_entry_is_served_without_a_request(self, tmp_path):
+        nf = NetworkFilter({"stylesheet": "cache"}, cache_dir=tmp_path)
+        nf._serve_from_cache(_Route(_css("v1")))
+        route = _Route(_css("v2"))
+        nf._serve_from_cache(route)
+        assert route.fetched_with is None
+        assert route.fulfilled == (200, b"/* v1 */")
+
+    def test_stale_entry_is_revalidated(self, tmp_path):
+        nf = NetworkFilter({"stylesheet": "cache"}, cache_dir=tmp_path,
+                           cache_ttl=0)
+        nf._serve_from_cache(_Route(_css("v1")))
+
+        unchanged = _Route(_css("v1"))
+        nf._serve_from_cache(unchanged)
+        assert unchanged.fetched_with["if-none-match"] == '"v1"'
+        assert unchanged.fulfilled == (200, b"/* v1 */")
+
+        deployed = _Route(_css("v2"))
+        nf._serve_from_cache(deployed)
+        assert deployed.fulfilled == (200, b"/* v2 */")
+        meta = json.loads(next(tmp_path.glob("*.json")).read_text())
+        assert meta["headers"]["etag"] == '"v2"'
+        assert time.time() - meta["fetched_at"] < 60
@@ -0,0 +1,33 @@
+import time
+
+from plugins.step_timing import StepTimer, _timed
+
+
+class TestTimedGenerators:
+    """Streaming steps are timed while they are consumed"""
+
+    def test_generator_is_timed_until_exhausted(self, tmp_path):
+        timer = StepTimer(tmp_path / "t.jsonl", "run", "w0")
+
+        def rows():
+            for i in range(3):
+                time.sleep(0.01)
+                yield i
+
+        timed = _timed(timer, "api", "Client.rows", rows)
+        generator = timed()
+        assert timer.records == []
+        assert list(generator) == [0, 1, 2]
+        assert len(timer.records) == 1
+        assert timer.records[0]["ms"] >= 30
+
+    def test_closed_generator_is_recorded(self, tmp_path):
+        timer = StepTimer(tmp_path / "t.jsonl", "run", "w0")
+
+        def rows():
+            yield from range(10)
+
+        generator = _timed(timer, "api", "Client.rows", rows)()
+        next(generator)
+        generator.close()
+        assert [r["name"] for r in timer.records] == ["Client.rows"]
@@ -0,0 +1,31 @@
+import json
+
+from ui.pages.wait_policy import AdaptiveTimeouts
+
+
+class TestAdaptiveTimeoutHistory:
+    """Learned waits are kept apart per SUT"""
+
+    def test_history_is_keyed_by_sut(self, tmp_path):
+        path = tmp_path / "wait_timings.json"
+        fast = AdaptiveTimeouts(min_samples=1)
+        fast.record("overview", 5.0)
+        fast.save(path, "http://127.0.0.1:8123/parabank")
+
+        live = AdaptiveTimeouts(min_samples=1).load(
+            path, "https://parabank.parasoft.com/parabank")
+        assert live.timeout("overview") == live.default_ms
+
+        local = AdaptiveTimeouts(min_samples=1).load(
+            path, "http://127.0.0.1:8123/parabank")
+        assert local.timeout("overview") == local.min_ms
+
+    def test_old_unkeyed_file_is_ignored(self, tmp_path):
+        path = tmp_path / "wait_timings.json"
+        path.write_text(json.dumps({"overview": [5.0] * 30}))
+        timeouts = AdaptiveTimeouts().load(path, "https://sut")
+        assert timeouts.timeout("overview") == timeouts.default_ms
+        timeouts.record("overview", 900.0)
+        timeouts.save(path, "https://sut")
+        assert json.loads(path.read_text()) == {
+            "https://sut": {"overview": [900.0]}}
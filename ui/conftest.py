@@ -0,0 +1,320 @@
+"""UI fixtures: POMs, browser contexts, login state and the SUT health check.
+
+Loaded only when tests under ui/ are collected, so API-only runs never
+import Playwright. Settings and the API fixtures come from the root
+conftest.py.
+"""
+import os
+
+import pytest
+import requests
+
+from ui.pages import (LoginPage, AccountsOverviewPage,
+                      AccountDetailsPage, TransferFundsPage)
+from ui.pages import wait_policy
+from helpers.health_check import SUTHealthChecker
+from helpers.auth_state import AuthenticatedSession
+from helpers.context_pool import ContextPool
+from helpers.account_state import ApiAccountState, UiAccountState
+from helpers.network_filter import NetworkFilter
+from helpers.har_archive import HarArchive
+
+health_checker_key = pytest.StashKey[SUTHealthChecker]()
+network_filter_key = pytest.StashKey[NetworkFilter]()
+
+
+@pytest.fixture
+def login_page(ui_page):
+    """Fixture for LoginPage"""
+    return LoginPage(ui_page)
+
+
+@pytest.fixture
+def accounts_page(ui_page):
+    """Fixture for AccountsOverviewPage"""
+    return AccountsOverviewPage(ui_page)
+
+
+@pytest.fixture
+def account_details_page(ui_page):
+    """Fixture for AccountDetailsPage"""
+    return AccountDetailsPage(ui_page)
+
+
+@pytest.fixture
+def transfer_page(ui_page):
+    """Fixture for TransferFundsPage"""
+    return TransferFundsPage(ui_page)
+
+
+@pytest.fixture(scope="session")
+def config(settings):
+    """Configuration for UI tests: the typed settings (config.base_url, ...)"""
+    return settings
+
+
+@pytest.fixture(scope="session")
+def sut_health_checker(request, settings, http_session, tmp_path_factory):
+    """Session-wide SUT health checker.
+
+    The verdict is cached in a file shared by all xdist workers of the run,
+    so the SUT is probed once per TTL instead of once per test.
+    """
+    health = settings.health_check
+    cache_dir = tmp_path_factory.getbasetemp()
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        # Workers get their own basetemp under a common per-run parent
+        cache_dir = cache_dir.parent
+
+    checker = SUTHealthChecker(
+        settings.ui_base_url, settings.username, settings.password,
+        cache_dir=cache_dir,
+        ttl=health.ttl_seconds,
+        timeout=health.timeout_seconds,
+        session=http_session)
+    request.config.stash[health_checker_key] = checker
+    return checker
+
+
+@pytest.fixture(autouse=True)
+def check_sut_health(request, har_archive):
+    """Automatically check if SUT is accessible and login works before running UI tests.
+    Skips test if either check fails.
+    """
+    if har_archive is not None and har_archive.replaying:
+        return  # replays never reach the SUT
+    verdict = request.getfixturevalue("sut_health_checker").verdict()
+    if not verdict.healthy:
+        pytest.skip(verdict.reason)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def wait_timeouts(request, settings):
+    """Load learned POM wait timeouts and store this run's samples after it"""
+    policy = settings.wait_policy
+    history_file = policy.history_file
+    timeouts = wait_policy.timeouts
+    for option in ("default_ms", "min_ms", "max_ms", "factor", "min_samples"):
+        setattr(timeouts, option, getattr(policy, option))
+    # Waits learned on one site say nothing about another
+    timeouts.load(history_file, settings.ui_base_url)
+    yield timeouts
+    # Replayed and in-process stand-in responses arrive almost instantly and
+    # would shrink the learned waits
+    if request.config.getoption("har") != "replay" and settings.stand_in is None:
+        timeouts.save(history_file, settings.ui_base_url)
+
+
+@pytest.fixture(scope="session")
+def network_filter(request, settings):
+    """Per-worker request filter for images, fonts and other unused assets.
+
+    None when network_filter.enabled is false in settings.yaml.
+    """
+    network_filter = NetworkFilter.from_settings(settings)
+    if network_filter is not None:
+        request.config.stash[network_filter_key] = network_filter
+    return network_filter
+
+
+@pytest.fixture(scope="session")
+def har_archive(request):
+    """HAR recorder/replayer for --har record|replay; None otherwise"""
+    mode = request.config.getoption("har")
+    if mode is None:
+        return None
+    return HarArchive(request.config.getoption("har_dir"), mode)
+
+
+@pytest.fixture(autouse=True)
+def har_recording(request, har_archive):
+    """Point the HAR archive at the current test"""
+    if har_archive is None:
+        yield
+        return
+    if not har_archive.start(request.node.nodeid):
+        pytest.skip(f"no HAR recording under {har_archive.test_dir} "
+                    f"(record it with --har record)")
+    if "authenticated_session" in request.fixturenames:
+        # Log in inside every test, so the login is part of its recording
+        request.getfixturevalue("authenticated_session").logout()
+    yield
+    har_archive.finish()
+
+
+@pytest.fixture(scope="session")
+def context_setup(network_filter, har_archive):
+    """Called with every new browser context: network filter, then HAR routes"""
+    steps = [part.install for part in (network_filter, har_archive)
+             if part is not None]
+    if not steps:
+        return None
+
+    def setup(context):
+        for step in steps:
+            step(context)
+    return setup
+
+
+@pytest.fixture
+def context(context, context_setup):
+    """pytest-playwright context with the network filter (and HAR) installed"""
+    if context_setup is not None:
+        context_setup(context)
+    return context
+
+
+@pytest.fixture(autouse=True)
+def full_resources_opt_out(request):
+    """Let tests marked full_resources load every resource"""
+    network_filter = request.getfixturevalue("network_filter")
+    if network_filter is not None:
+        network_filter.enabled = not request.node.get_closest_marker(
+            "full_resources")
+    yield
+    if network_filter is not None:
+        network_filter.enabled = True
+
+
+@pytest.fixture(scope="session")
+def context_pool(browser, browser_context_args, settings, context_setup,
+                 har_archive):
+    """Warm browser contexts reused by this worker's tests.
+
+    None when context_pool.enabled is false or in HAR mode (a HAR is written
+    when its context closes, so every test needs its own); tests then get
+    pytest-playwright's per-test context (with its tracing/video/screenshot
+    options).
+    """
+    pool_settings = settings.context_pool
+    if not pool_settings.enabled or har_archive is not None:
+        yield None
+        return
+    pool = ContextPool(
+        browser, browser_context_args,
+        size=pool_settings.size,
+        recycle_after=pool_settings.recycle_after,
+        context_setup=context_setup)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def ui_page(request, context_pool):
+    """Page behind the POM fixtures: pooled if enabled, else pytest-playwright's"""
+    if context_pool is None:
+        yield request.getfixturevalue("page")
+        return
+    page = context_pool.acquire()
+    yield page
+    context_pool.release(page)
+
+
+@pytest.fixture(scope="session")
+def authenticated_session(browser, browser_context_args, settings,
+                          sut_health_checker, context_setup, context_pool,
+                          har_archive, tmp_path_factory):
+    """Log in once per worker and reuse the saved storage state"""
+    if har_archive is None or not har_archive.replaying:
+        verdict = sut_health_checker.verdict()
+        if not verdict.healthy:
+            pytest.skip(verdict.reason)
+
+    # basetemp is per xdist worker, so each worker keeps its own session
+    state_file = tmp_path_factory.getbasetemp() / "auth" / "storage_state.json"
+    return AuthenticatedSession(
+        browser, browser_context_args, state_file,
+        base_url=settings.ui_base_url,
+        overview_url=settings.overview_url,
+        username=settings.username,
+        password=settings.password,
+        context_setup=context_setup,
+        pool=context_pool)
+
+
+@pytest.fixture
+def authenticated_page(authenticated_session):
+    """Logged-in page that starts on the accounts overview"""
+    page = authenticated_session.new_page()
+    yield page
+    authenticated_session.release(page)
+
+
+@pytest.fixture
+def logged_in_accounts_page(authenticated_page):
+    """AccountsOverviewPage for a logged-in user, skipping the login form"""
+    return AccountsOverviewPage(authenticated_page)
+
+
+@pytest.fixture
+def account_state(request, authenticated_session, settings, har_archive):
+    """Balances and navigation for UI tests.
+
+    Tests marked api_setup read balances through the API and open the browser
+    straight on the page under test; others scrape the Accounts Overview.
+    In HAR mode balances always come from the page, since only browser
+    traffic is recorded.
+    """
+    if request.node.get_closest_marker("api_setup") and har_archive is None:
+        state = ApiAccountState(
+            # Uncached: the transfer happens in the browser, not via this client
+            request.getfixturevalue("api_client"),
+            request.getfixturevalue("ui_customer_id"),
+            authenticated_session, settings.transfer_url)
+    else:
+        state = UiAccountState(authenticated_session, settings.overview_url)
+    yield state
+    state.close()
+
+
+@pytest.fixture
+def ui_account_pair(request, har_archive) -> tuple:
+    """Two worker-private account numbers of the UI user, as shown in the UI.
+
+    HAR replays reuse the pair the test was recorded with.
+    """
+    def lease():
+        source, target = request.getfixturevalue("ui_account_pool").lease(2)
+        return [str(source), str(target)]
+
+    if har_archive is None:
+        return tuple(lease())
+    return tuple(har_archive.fixture_value("ui_account_pair", lease))
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Drop the cached health verdict when a test fails on a network error"""
+    outcome = yield
+    report = outcome.get_result()
+    checker = item.config.stash.get(health_checker_key, None)
+    if checker is None or report.when != "call" or not report.failed:
+        return
+    if _is_network_failure(call.excinfo.value):
+        checker.invalidate()
+
+
+def _is_network_failure(exc) -> bool:
+    """Failures that suggest the SUT went down rather than a product bug"""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    # Only Playwright's network errors; its locator/expect timeouts are as
+    # likely product bugs. Matched by module to keep this hook import-light
+    return (type(exc).__module__.startswith("playwright")
+            and "net::ERR_" in str(exc))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    network_filter = config.stash.get(network_filter_key, None)
+    if network_filter is not None:
+        terminalreporter.write_line(
+            f"Network filter: {network_filter.stats.describe()}")
+
+    checker = config.stash.get(health_checker_key, None)
+    verdict = checker.last_verdict if checker else None
+    if verdict is None:
+        return
+    state = "healthy" if verdict.healthy else f"unhealthy ({verdict.reason})"
+    terminalreporter.write_line(
+        f"SUT health: {state}; probes this process: {checker.probe_count}; "
+        f"latency: {verdict.describe_latency() or 'n/a'}")
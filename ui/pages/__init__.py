@@ -1,13 +1,31 @@
-"""POM package for UI automation"""
-
-from .login_page import LoginPage
-from .accounts_page import AccountsOverviewPage
-from .account_details_page import AccountDetailsPage
-from .transfer_page import TransferFundsPage
-
-__all__ = [
-    'LoginPage',
-    'AccountsOverviewPage',
-    'AccountDetailsPage',
-    'TransferFundsPage'
-]
+"""POM package for UI automation.
+
+Page classes are imported on first attribute access, so importing the
+package (or a helper that only needs one page) does not load every page
+module and Playwright up front.
+"""
+import importlib
+
+_EXPORTS = {
+    'LoginPage': '.login_page',
+    'AccountsOverviewPage': '.accounts_page',
+    'AccountRow': '.accounts_page',
+    'AccountsTable': '.accounts_page',
+    'AccountDetailsPage': '.account_details_page',
+    'TransactionRow': '.account_details_page',
+    'TransferFundsPage': '.transfer_page',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
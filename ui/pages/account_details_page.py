@@ -1,5 +1,60 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+
 from playwright.sync_api import Page, expect
 
+from helpers.money import parse_amounts
+from .wait_policy import Condition, expect_all, ready
+
+# Runs in the browser: reads rows [start, start + size) of the activity
+# table, so each chunk is one round-trip and the DOM is never copied whole.
+# Rows without four cells ("No transactions found") are skipped.
+_READ_CHUNK_JS = """
+([start, size]) => {
+    const rows = document.querySelectorAll('#transactionTable tbody tr');
+    const chunk = [];
+    for (let i = start; i < Math.min(start + size, rows.length); i++) {
+        const cells = rows[i].querySelectorAll('td');
+        if (cells.length < 4) continue;
+        const link = cells[1].querySelector('a');
+        const id = link ? new URLSearchParams(
+            link.getAttribute('href').split('?')[1] || '').get('id') : '';
+        chunk.push([id || '', cells[0].textContent.trim(),
+                    cells[1].textContent.trim(), cells[2].textContent.trim(),
+                    cells[3].textContent.trim()]);
+    }
+    return {total: rows.length, rows: chunk};
+}
+"""
+
+
+@dataclass(frozen=True)
+class TransactionRow:
+    """One row of the Account Activity table"""
+    transaction_id: str
+    date: date
+    description: str
+    debit: Decimal = None
+    credit: Decimal = None
+
+    @property
+    def amount(self) -> Decimal:
+        """Signed amount: credits positive, debits negative"""
+        return (self.credit or 0) - (self.debit or 0)
+
+
+def _parse_chunk(raw_rows: list) -> list:
+    # Every non-empty money cell of the chunk parsed in one batch
+    amounts = iter(parse_amounts([cell for row in raw_rows
+                                  for cell in row[3:] if cell]))
+    return [TransactionRow(
+        transaction_id, datetime.strptime(day, "%m-%d-%Y").date(),
+        description,
+        debit=next(amounts) if debit else None,
+        credit=next(amounts) if credit else None)
+        for transaction_id, day, description, debit, credit in raw_rows]
+
 
 class AccountDetailsPage:
 
@@ -11,12 +66,32 @@ class AccountDetailsPage:
         self.balance_element = page.locator("#balance")
         self.account_type_element = page.locator("#accountType")
         self.transactions_table = page.locator("#transactionTable")
+        self.month_select = page.locator("#month")
+        self.transaction_type_select = page.locator("#transactionType")
+        self.go_button = page.locator("#activityForm input[type='submit']")
+
+    def navigate(self, activity_url: str):
+        """Open an account's activity page and wait for its transactions"""
+        with ready(self.page, "activity"):
+            self.page.goto(activity_url)
+        return self
 
     def verify_account_number(self, expected_account_number: str):
         """Verify account number matches expected value"""
         expect(self.account_id_element).to_have_text(expected_account_number)
         return self
 
+    def verify_account_details(self, expected_account_number: str):
+        """Verify account number, balance, type and transactions in one poll"""
+        expect_all(
+            self.page,
+            Condition.has_text("#accountId", expected_account_number),
+            Condition.visible("#balance"),
+            Condition.visible("#accountType"),
+            Condition.visible("#transactionTable"),
+            name="activity.details")
+        return self
+
     def verify_balance_visible(self):
         """Verify balance is displayed"""
         expect(self.balance_element).to_be_visible()
@@ -45,3 +120,32 @@ class AccountDetailsPage:
         """Verify transactions table is displayed"""
         expect(self.transactions_table).to_be_visible()
         return self
+
+    def filter_activity(self, month: str = "All", transaction_type: str = "All"):
+        """Apply the Activity Period / Type filters and wait for the reload"""
+        self.month_select.select_option(month)
+        self.transaction_type_select.select_option(transaction_type)
+        with ready(self.page, "activity"):
+            self.go_button.click()
+        return self
+
+    def iter_transactions(self, chunk_size: int = 500, month: str = None,
+                          transaction_type: str = None):
+        """Yield TransactionRows, reading chunk_size table rows per evaluate.
+
+        With month or transaction_type the page filters are applied first;
+        otherwise the table as currently loaded is read.
+        """
+        if month or transaction_type:
+            self.filter_activity(month or "All", transaction_type or "All")
+        start, total = 0, None
+        while total is None or start < total:
+            chunk = self.page.evaluate(_READ_CHUNK_JS, [start, chunk_size])
+            total = chunk["total"]
+            start += chunk_size
+            yield from _parse_chunk(chunk["rows"])
+
+    def net_activity(self, chunk_size: int = 500, **filters) -> Decimal:
+        """Sum of the signed amounts of all (filtered) transactions, streamed"""
+        return sum((row.amount for row in self.iter_transactions(
+            chunk_size, **filters)), Decimal(0))
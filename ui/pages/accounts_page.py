@@ -1,5 +1,56 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
 from playwright.sync_api import Page, expect
 
+from helpers.money import parse_amounts
+from .wait_policy import Condition, expect_all, ready
+
+# Runs in the browser: one pass over all rows, skipping the "Total" row
+# which has no account link
+_READ_ROWS_JS = """
+rows => rows.flatMap(row => {
+    const link = row.querySelector('td:first-child a');
+    if (!link) return [];
+    const cells = row.querySelectorAll('td');
+    const text = i => cells[i] ? cells[i].textContent.trim() : '';
+    return [[link.textContent.trim(), text(1), text(2)]];
+})
+"""
+
+
+@dataclass(frozen=True)
+class AccountRow:
+    """One account row of the Accounts Overview table"""
+    account_id: str
+    balance: Decimal
+    available: Decimal
+
+
+class AccountsTable:
+    """Accounts Overview rows with lookup by index or account id"""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self._by_id = {row.account_id: row for row in self.rows}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __getitem__(self, index: int) -> AccountRow:
+        return self.rows[index]
+
+    @property
+    def account_ids(self) -> list:
+        return [row.account_id for row in self.rows]
+
+    def by_id(self, account_id) -> AccountRow:
+        """Get the row for an account id, raising KeyError if missing"""
+        return self._by_id[str(account_id)]
+
 
 class AccountsOverviewPage:
 
@@ -10,6 +61,8 @@ class AccountsOverviewPage:
         self.welcome_message = page.locator(".smallText")
         self.accounts_table = page.locator("#accountTable")
         self.account_rows = page.locator("#accountTable tbody tr")
+        self.account_links = page.locator(
+            "#accountTable tbody tr td:first-child a")
         self.accounts_overview_heading = page.locator(
             'h1:has-text("Accounts Overview")')
         self.transfer_funds_link = page.locator("a[href='transfer.htm']")
@@ -21,11 +74,11 @@ class AccountsOverviewPage:
 
     def verify_welcome_message(self, first_name: str):
         """Verify welcome message contains customer name"""
-        expect(self.welcome_message).to_be_visible()
-        expect(
-            self.welcome_message).to_contain_text(
-            first_name,
-            ignore_case=True)
+        expect_all(
+            self.page,
+            Condition.visible(".smallText"),
+            Condition.contains_text(".smallText", first_name, ignore_case=True),
+            name="overview.welcome")
         return self
 
     def verify_accounts_table_visible(self):
@@ -43,6 +96,20 @@ class AccountsOverviewPage:
         expect(self.accounts_overview_heading).not_to_be_visible()
         return self
 
+    def read_accounts_table(self) -> AccountsTable:
+        """Read all account rows in a single browser round-trip"""
+        # The table is filled by AJAX; wait once for the first account link
+        expect(self.account_links.first).to_be_visible()
+        raw_rows = self.account_rows.evaluate_all(_READ_ROWS_JS)
+        # Both money columns parsed in one batch
+        amounts = parse_amounts([row[1] for row in raw_rows]
+                                + [row[2] for row in raw_rows])
+        balances, available = amounts[:len(raw_rows)], amounts[len(raw_rows):]
+        return AccountsTable(
+            AccountRow(row[0], balance, available_amount)
+            for row, balance, available_amount
+            in zip(raw_rows, balances, available))
+
     def get_first_account_number(self) -> str:
         """Get the account number of the first account"""
         first_account_link = self.page.locator(
@@ -73,7 +140,9 @@ class AccountsOverviewPage:
         """Click the first account link to open account details"""
         first_account_link = self.page.locator(
             "#accountTable tbody tr:first-child td:first-child a")
-        first_account_link.click()
+        # Ready once the transactions XHR that fills #transactionTable answered
+        with ready(self.page, "activity"):
+            first_account_link.click()
         from .account_details_page import AccountDetailsPage
         return AccountDetailsPage(self.page)
 
@@ -85,5 +154,7 @@ class AccountsOverviewPage:
 
     def navigate(self, overview_url: str):
         """Navigate directly to accounts overview page"""
-        self.page.goto(overview_url)
+        # Ready once the accounts XHR that fills #accountTable has answered
+        with ready(self.page, "overview"):
+            self.page.goto(overview_url)
         return self
@@ -1,4 +1,5 @@
 from .accounts_page import AccountsOverviewPage
+from .wait_policy import ready
 from playwright.sync_api import Page, expect
 
 
@@ -33,8 +34,9 @@ class LoginPage:
         return self
 
     def click_login(self):
-        # Click the login button
-        self.login_button.click()
+        # Click the login button and wait for the overview's accounts XHR
+        with ready(self.page, "overview"):
+            self.login_button.click()
 
         return AccountsOverviewPage(self.page)
 
@@ -60,6 +62,10 @@ class LoginPage:
             ignore_case=True)
         return self
 
+    def is_login_form_visible(self) -> bool:
+        # Check if the login form is shown, i.e. there is no active session
+        return self.username_field.is_visible()
+
     def is_error_visible(self) -> bool:
         # Check if error message is visible
         return self.error_message.is_visible()
@@ -1,5 +1,7 @@
 from playwright.sync_api import Page, expect
 
+from .wait_policy import Condition, expect_all, ready
+
 
 class TransferFundsPage:
     """Page Object Model for ParaBank Transfer Funds Page"""
@@ -30,8 +32,9 @@ class TransferFundsPage:
         return self
 
     def click_transfer(self):
-        """Click transfer button"""
-        self.transfer_button.click()
+        """Click transfer button and wait for the transfer XHR"""
+        with ready(self.page, "transfer"):
+            self.transfer_button.click()
         return self
 
     def transfer(self, amount: float, from_account: str, to_account: str):
@@ -44,11 +47,12 @@ class TransferFundsPage:
 
     def verify_transfer_complete(self):
         """Verify transfer completion message is displayed"""
-        expect(self.confirmation_message).to_be_visible()
-        expect(
-            self.confirmation_message).to_contain_text(
-            "Transfer Complete",
-            ignore_case=True)
+        expect_all(
+            self.page,
+            Condition.visible("#showResult"),
+            Condition.contains_text("#showResult", "Transfer Complete",
+                                    ignore_case=True),
+            name="transfer.complete")
         return self
 
     def get_confirmation_message(self) -> str:
@@ -0,0 +1,186 @@
+"""Central wait policy for the POMs.
+
+- Readiness signals: the AJAX-driven pages are ready when a specific
+  services_proxy/bank/... response arrives, so POM actions wait for that
+  response instead of for whichever element renders last.
+- Adaptive timeouts: observed wait durations are kept in a history file,
+  per SUT base URL, and each signal's timeout is derived from its p95,
+  clamped to sane bounds.
+- expect_all: several element conditions checked together in one
+  browser-side poll loop instead of chained expect() calls.
+"""
+import json
+import re
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
+from filelock import FileLock
+from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
+
+# XHRs that fill the AJAX-driven pages
+READINESS_SIGNALS = {
+    "overview": re.compile(r"services_proxy/bank/customers/\d+/accounts"),
+    "transfer": re.compile(r"services_proxy/bank/transfer\?"),
+    "activity": re.compile(r"services_proxy/bank/accounts/\d+/transactions"),
+}
+
+
+class AdaptiveTimeouts:
+    """Per-signal timeouts learned from historical wait durations"""
+
+    def __init__(self, default_ms: float = 5000, min_ms: float = 1000,
+                 max_ms: float = 15000, factor: float = 2.0,
+                 min_samples: int = 20, max_samples: int = 200):
+        self.default_ms = default_ms
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.factor = factor
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.history = defaultdict(list)
+        self._new_samples = defaultdict(list)
+
+    def timeout(self, name: str) -> float:
+        """p95 of past waits times factor, or the default without history"""
+        samples = sorted(self.history.get(name, ()))
+        if len(samples) < self.min_samples:
+            return self.default_ms
+        p95 = samples[int(len(samples) * 0.95) - 1]
+        return min(self.max_ms, max(self.min_ms, p95 * self.factor))
+
+    def record(self, name: str, ms: float):
+        self.history[name].append(ms)
+        self._new_samples[name].append(ms)
+
+    def load(self, path: Path, sut: str):
+        """Samples recorded against sut (a base URL) only"""
+        path = Path(path)
+        if path.exists():
+            stored = json.loads(path.read_text()).get(sut, {})
+            # A list at the top level is the old, unkeyed format
+            for name, samples in (stored.items() if isinstance(stored, dict)
+                                  else ()):
+                self.history[name] = samples[-self.max_samples:]
+        return self
+
+    def save(self, path: Path, sut: str):
+        """Merge this process's samples into sut's history in the file.
+
+        Locked so parallel workers append rather than overwrite each other.
+        """
+        if not self._new_samples:
+            return
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(str(path) + ".lock"):
+            stored = json.loads(path.read_text()) if path.exists() else {}
+            # Drops the old, unkeyed samples: their SUT is unknown
+            stored = {key: value for key, value in stored.items()
+                      if isinstance(value, dict)}
+            history = stored.setdefault(sut, {})
+            for name, samples in self._new_samples.items():
+                merged = history.get(name, []) + samples
+                history[name] = merged[-self.max_samples:]
+            path.write_text(json.dumps(stored))
+        self._new_samples.clear()
+
+
+timeouts = AdaptiveTimeouts()
+
+
+@contextmanager
+def ready(page: Page, signal: str):
+    """Wait for a page's readiness XHR triggered inside the block.
+
+    Best effort: if the response does not arrive in time the block still
+    completes and the POM's own assertions report what is missing.
+    """
+    pattern = READINESS_SIGNALS[signal]
+    start = time.perf_counter()
+    block_done = False
+    try:
+        with page.expect_response(lambda r: bool(pattern.search(r.url)),
+                                  timeout=timeouts.timeout(signal)):
+            yield
+            block_done = True
+    except PlaywrightTimeoutError:
+        # Only swallow the missing response, never a timeout from the block
+        if not block_done:
+            raise
+        return
+    timeouts.record(signal, (time.perf_counter() - start) * 1000)
+
+
+@dataclass(frozen=True)
+class Condition:
+    """One element check for expect_all"""
+    kind: str
+    selector: str
+    text: str = ""
+    ignore_case: bool = False
+
+    @classmethod
+    def visible(cls, selector: str):
+        return cls("visible", selector)
+
+    @classmethod
+    def contains_text(cls, selector: str, text: str, ignore_case=False):
+        return cls("contains", selector, str(text), ignore_case)
+
+    @classmethod
+    def has_text(cls, selector: str, text: str):
+        return cls("equals", selector, str(text))
+
+    def describe(self) -> str:
+        if self.kind == "visible":
+            return f"{self.selector} is visible"
+        verb = "contains" if self.kind == "contains" else "has text"
+        return f"{self.selector} {verb} {self.text!r}"
+
+    def to_js(self) -> dict:
+        return {"kind": self.kind, "selector": self.selector,
+                "text": self.text, "ignoreCase": self.ignore_case}
+
+
+# Evaluated in the browser: one bool per condition
+_CHECK_JS = """
+conds => conds.map(c => {
+    const el = document.querySelector(c.selector);
+    if (!el) return false;
+    const style = getComputedStyle(el);
+    const visible = style.visibility !== 'hidden' &&
+        !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    if (c.kind === 'visible') return visible;
+    const norm = s => s.replace(/\\s+/g, ' ').trim();
+    let text = norm(el.textContent), want = norm(c.text);
+    if (c.ignoreCase) { text = text.toLowerCase(); want = want.toLowerCase(); }
+    if (c.kind === 'contains') return visible && text.includes(want);
+    return text === want;
+})
+"""
+
+
+def expect_all(page: Page, *conditions: Condition, name: str = None,
+               timeout: float = None):
+    """Assert that all conditions hold, polling them together in the browser.
+
+    name keys the adaptive timeout; on timeout, every failing condition is
+    listed in the AssertionError.
+    """
+    specs = [c.to_js() for c in conditions]
+    timeout = timeout or timeouts.timeout(name or "expect_all")
+    start = time.perf_counter()
+    try:
+        page.wait_for_function(f"conds => ({_CHECK_JS})(conds).every(Boolean)",
+                               arg=specs, timeout=timeout)
+    except PlaywrightTimeoutError:
+        results = page.evaluate(_CHECK_JS, specs)
+        failed = [c.describe() for c, ok in zip(conditions, results) if not ok]
+        raise AssertionError(
+            f"Timed out after {timeout:.0f} ms waiting for: "
+            + "; ".join(failed or ["conditions to hold together"])) from None
+    if name:
+        timeouts.record(name, (time.perf_counter() - start) * 1000)
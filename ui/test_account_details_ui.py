@@ -1,5 +1,5 @@
 import allure
-from ui.pages import LoginPage
+from ui.pages import AccountsOverviewPage
 
 
 # TC_UI_03 - View Details of the First Account
@@ -7,10 +7,10 @@ from ui.pages import LoginPage
 @allure.story("TC_UI_03")
 @allure.title("View details of the first account")
 @allure.severity(allure.severity_level.NORMAL)
-def test_view_account_details(login_page: LoginPage, config):
-    with allure.step("Navigate and login"):
-        login_page.navigate(config.base_url)
-        accounts_page = login_page.login(config.username, config.password)
+def test_view_account_details(
+        logged_in_accounts_page: AccountsOverviewPage, config):
+    with allure.step("Open Accounts Overview with saved login state"):
+        accounts_page = logged_in_accounts_page
 
     with allure.step("Verify Accounts Overview page"):
         accounts_page.verify_url(config.overview_url)
@@ -21,8 +21,5 @@ def test_view_account_details(login_page: LoginPage, config):
         account_details_page = accounts_page.open_first_account()
 
     with allure.step("Verify account details page"):
-        account_details_page.verify_account_number(account_number)
-        account_details_page.verify_balance_visible()
+        account_details_page.verify_account_details(account_number)
         account_details_page.verify_balance_format()
-        account_details_page.verify_account_type_visible()
-        account_details_page.verify_transactions_table_visible()
@@ -1,32 +1,28 @@
 import allure
-from ui.pages import LoginPage
-from helpers.convert_currency import to_amount
+import pytest
+
+from helpers.money import assert_balance_deltas
 
 
 # TC_UI_04 - Transfer Funds Between Two Own Accounts
+# Balances are read through the API (api_setup); only the transfer itself
+# goes through the browser. Drop the marker to scrape them from the UI.
+# The two accounts come from this worker's pool, so parallel runs never
+# touch the same balances.
 @allure.feature("Transfer")
 @allure.story("TC_UI_04")
 @allure.title("Transfer funds between two own accounts")
 @allure.severity(allure.severity_level.CRITICAL)
-def test_transfer_funds(login_page: LoginPage, config):
+@pytest.mark.api_setup
+def test_transfer_funds(account_state, ui_account_pair, config):
     transfer_amount = 10
+    source_account, target_account = ui_account_pair
 
-    with allure.step("Navigate and login"):
-        login_page.navigate(config.base_url)
-        accounts_page = login_page.login(config.username, config.password)
-
-    with allure.step("Verify Accounts Overview page"):
-        accounts_page.verify_url(config.overview_url)
-        accounts_page.verify_accounts_table_visible()
-
-    with allure.step("Get account numbers and balances before transfer"):
-        source_account = accounts_page.get_first_account_number()
-        source_balance_before = accounts_page.get_first_account_balance()
-        target_account = accounts_page.get_second_account_number()
-        target_balance_before = accounts_page.get_second_account_balance()
+    with allure.step("Get balances before transfer"):
+        balances_before = account_state.balances()
 
     with allure.step("Navigate to Transfer Funds page"):
-        transfer_page = accounts_page.navigate_to_transfer_funds()
+        transfer_page = account_state.open_transfer_page()
 
     with allure.step(f"Perform transfer of ${transfer_amount}"):
         transfer_page.transfer(transfer_amount, source_account, target_account)
@@ -34,25 +30,12 @@ def test_transfer_funds(login_page: LoginPage, config):
     with allure.step("Verify transfer completion"):
         transfer_page.verify_transfer_complete()
 
-    with allure.step("Return to Accounts Overview to verify balances"):
-        accounts_page.navigate(config.overview_url)
-        accounts_page.verify_accounts_table_visible()
-
     with allure.step("Get updated balances after transfer"):
-        source_balance_after = accounts_page.get_first_account_balance()
-        target_balance_after = accounts_page.get_second_account_balance()
+        balances_after = account_state.balances()
 
     with allure.step("Verify balance changes are correct"):
-        # Convert balances to float for comparison
-        source_before = to_amount(source_balance_before)
-        source_after = to_amount(source_balance_after)
-        target_before = to_amount(target_balance_before)
-        target_after = to_amount(target_balance_after)
-
-        # Verify balance changes
-        assert source_after == source_before - transfer_amount, (
-            f"Source balance should be "
-            f"{source_before - transfer_amount}, but got {source_after}")
-        assert target_after == target_before + transfer_amount, (
-            f"Target balance should be "
-            f"{target_before + transfer_amount}, but got {target_after}")
+        # Exact Decimal comparison for both accounts, mismatches reported together
+        assert_balance_deltas(balances_before, balances_after, {
+            source_account: -transfer_amount,
+            target_account: transfer_amount,
+        })